@@ -0,0 +1,97 @@
+"""Klasifikasi ABC (Pareto) produk langsung dari kubus transaksi
+
+Kelas dihitung dengan satu sort + cumsum atas total revenue per produk:
+A = cum_revenue_pct <= batas A, B = <= batas B, sisanya C (default 80% / 95%,
+sama dengan produk_kelas_*.csv). Total per produk bisa dibatasi ke rentang
+bulan atau brand tertentu, dan diperbarui dari delta batch tanpa membaca
+ulang histori transaksi.
+"""
+import numpy as np
+import pandas as pd
+
+ABC_THRESHOLDS = (80.0, 95.0)
+ABC_CLASSES = ['A', 'B', 'C']
+ABC_COLUMNS = ['nama_barang', 'total_value', 'revenue_pct', 'cum_revenue_pct', 'ABC_class']
+
+
+def product_revenue(cube, brands=None, months=None):
+    """Total revenue per produk dari kubus, opsional dibatasi brand dan rentang bulan (start, end)"""
+    if cube.empty:
+        return pd.DataFrame(columns=['nama_barang', 'total_value', 'brand', 'cat_norm'])
+    mask = np.ones(len(cube), dtype=bool)
+    if brands is not None:
+        mask &= cube['brand'].isin(brands).to_numpy()
+    if months is not None:
+        start, end = (pd.Timestamp(month).to_period('M').to_timestamp() for month in months)
+        mask &= ((cube['month_start'] >= start) & (cube['month_start'] <= end)).to_numpy()
+    scoped = cube[mask] if not mask.all() else cube
+    return scoped.groupby('nama_barang', observed=True, sort=False).agg(
+        total_value=('total_value', 'sum'),
+        brand=('brand', 'first'),
+        cat_norm=('cat_norm', 'first')
+    ).reset_index()
+
+
+def classify_products(totals, thresholds=ABC_THRESHOLDS):
+    """Total revenue per produk -> tabel kelas ABC (kolom produk_kelas_*.csv + kolom lain dari totals)
+
+    Revenue sama diurutkan menurut nama produk supaya kelas di batas threshold
+    stabil antar pembaruan. Produk dengan revenue 0 atau negatif masuk kelas C.
+    """
+    columns = ABC_COLUMNS + [col for col in totals.columns if col not in ABC_COLUMNS]
+    if totals.empty:
+        return pd.DataFrame(columns=columns)
+
+    values = totals['total_value'].to_numpy(dtype='float64')
+    order = np.lexsort((totals['nama_barang'].astype(str).to_numpy(), -values))
+    ranked = totals.iloc[order].reset_index(drop=True)
+
+    grand_total = values.sum()
+    revenue_pct = values[order] / grand_total * 100 if grand_total else np.zeros(len(order))
+    cum_revenue_pct = np.cumsum(revenue_pct)
+    class_codes = np.searchsorted(np.asarray(thresholds, dtype='float64'), cum_revenue_pct, side='left')
+
+    ranked['revenue_pct'] = revenue_pct
+    ranked['cum_revenue_pct'] = cum_revenue_pct
+    ranked['ABC_class'] = pd.Categorical.from_codes(np.minimum(class_codes, len(ABC_CLASSES) - 1), ABC_CLASSES)
+    return ranked[columns]
+
+
+def update_classes(classes, delta_totals, thresholds=ABC_THRESHOLDS):
+    """Tambahkan delta revenue per produk (mis. dari batch baru) lalu klasifikasi ulang
+
+    Biayanya sebanding dengan jumlah produk, bukan jumlah transaksi.
+    """
+    if classes is None or classes.empty:
+        return classify_products(delta_totals, thresholds)
+    keys = ['nama_barang', 'total_value', 'brand', 'cat_norm']
+    merged = pd.concat([classes[[col for col in keys if col in classes.columns]],
+                        delta_totals[[col for col in keys if col in delta_totals.columns]]], ignore_index=True)
+    for col in ['nama_barang', 'brand', 'cat_norm']:
+        if col in merged.columns:
+            merged[col] = merged[col].astype(str)
+    agg = {col: 'first' for col in ['brand', 'cat_norm'] if col in merged.columns}
+    merged = merged.groupby('nama_barang', as_index=False, sort=False).agg({'total_value': 'sum', **agg})
+    for col in ['nama_barang', 'brand', 'cat_norm']:
+        if col in merged.columns:
+            merged[col] = merged[col].astype('category')
+    return classify_products(merged, thresholds)
+
+
+def split_classes(classes):
+    """Pisahkan tabel kelas menjadi dict {'A': df, 'B': df, 'C': df} (urut revenue)"""
+    return {
+        abc_class: classes[classes['ABC_class'] == abc_class].reset_index(drop=True)
+        for abc_class in ABC_CLASSES
+    }
+
+
+def class_summary(classes):
+    """Jumlah produk, revenue dan porsi revenue per kelas"""
+    summary = classes.groupby('ABC_class', observed=False).agg(
+        products=('nama_barang', 'size'),
+        total_value=('total_value', 'sum')
+    ).reindex(ABC_CLASSES, fill_value=0)
+    grand_total = summary['total_value'].sum()
+    summary['revenue_pct'] = summary['total_value'] / grand_total * 100 if grand_total else 0.0
+    return summary
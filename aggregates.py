@@ -0,0 +1,338 @@
+"""Kubus agregat brand x kategori x produk x bulan untuk dashboard EraPhone"""
+import numpy as np
+import pandas as pd
+
+from sketches import HLL_PRECISION, empty_registers, hash_values, hll_count, hll_update
+
+# Kolom flag ikut jadi dimensi supaya filter global bisa dijawab langsung dari kubus
+FILTER_DIMENSIONS = ['transaction_type', 'is_return', 'is_shopping_bag']
+CUBE_DIMENSIONS = ['brand', 'cat_norm', 'nama_barang', 'month_start'] + FILTER_DIMENSIONS
+CUBE_MEASURES = ['total_value', 'quantity', 'transactions']
+
+
+def empty_cube():
+    """Kubus kosong dengan kolom yang lengkap"""
+    return pd.DataFrame(columns=CUBE_DIMENSIONS + CUBE_MEASURES)
+
+
+def build_cube(transactions_df):
+    """Agregasi transaksi ke level brand x kategori x produk x bulan
+
+    Jumlah produk/brand unik tetap bisa dihitung tepat dari kubus karena
+    produk dan brand adalah dimensi kubus.
+    """
+    required = {'brand', 'cat_norm', 'nama_barang', 'tanggal_order', 'total_value', 'quantity'}
+    if transactions_df.empty or not required.issubset(transactions_df.columns):
+        return empty_cube()
+
+    month_start = pd.to_datetime(transactions_df['tanggal_order']).dt.to_period('M').dt.to_timestamp()
+    flags = [transactions_df[col] for col in FILTER_DIMENSIONS if col in transactions_df.columns]
+    cube = transactions_df.groupby(
+        [transactions_df['brand'], transactions_df['cat_norm'], transactions_df['nama_barang'],
+         month_start.rename('month_start')] + flags,
+        observed=True,
+        sort=False
+    ).agg(
+        total_value=('total_value', 'sum'),
+        quantity=('quantity', 'sum'),
+        transactions=('total_value', 'size')
+    ).reset_index()
+    return cube.sort_values('month_start', kind='stable').reset_index(drop=True)
+
+
+def has_cube_schema(cube):
+    """Kubus (mis. dari cache turunan versi lama) memuat semua dimensi dan ukuran terbaru"""
+    return set(CUBE_DIMENSIONS + CUBE_MEASURES).issubset(cube.columns)
+
+
+def merge_cube(cube, delta):
+    """Gabungkan kubus lama dengan kubus dari batch transaksi baru
+
+    Biayanya sebanding dengan ukuran kubus dan batch, bukan seluruh histori.
+    """
+    if cube.empty:
+        return delta
+    if delta.empty:
+        return cube
+    merged = pd.concat([cube, delta], ignore_index=True)
+    for col in ['brand', 'cat_norm', 'nama_barang', 'transaction_type']:
+        if col in merged.columns:
+            merged[col] = merged[col].astype(str).astype('category')
+    dimensions = [col for col in CUBE_DIMENSIONS if col in merged.columns]
+    merged = merged.groupby(dimensions, observed=True, sort=False)[CUBE_MEASURES].sum().reset_index()
+    return merged.sort_values('month_start', kind='stable').reset_index(drop=True)
+
+
+# ==================== RINGKASAN DARI KUBUS ====================
+def summary_metrics(cube):
+    """Metrik Executive Summary: revenue, transaksi, produk dan brand"""
+    if cube.empty:
+        return {'total_revenue': 0, 'total_transactions': 0, 'total_products': 0, 'total_brands': 0}
+    return {
+        'total_revenue': cube['total_value'].sum(),
+        'total_transactions': int(cube['transactions'].sum()),
+        'total_products': cube['nama_barang'].nunique(),
+        'total_brands': cube['brand'].nunique()
+    }
+
+
+def _by_revenue(df, column):
+    """Urut total_value menurun, seri diurutkan menurut nama (sama dengan ORDER BY di sql_backend)"""
+    return df.sort_values(
+        ['total_value', column], ascending=[False, True],
+        key=lambda values: values.astype(str) if values.name == column else values
+    )
+
+
+def brand_summary(cube):
+    """Revenue, quantity dan produk unik per brand (urut revenue)"""
+    if cube.empty:
+        return pd.DataFrame(columns=['brand', 'total_value', 'quantity', 'nama_barang'])
+    brands = cube.groupby('brand', observed=True).agg({
+        'total_value': 'sum',
+        'quantity': 'sum',
+        'nama_barang': 'nunique'
+    }).reset_index()
+    return _by_revenue(brands, 'brand')
+
+
+def product_summary(cube, brands=None):
+    """Revenue dan quantity per produk beserta brand dan kategorinya"""
+    if cube.empty:
+        return pd.DataFrame(columns=['nama_barang', 'total_value', 'quantity', 'brand', 'cat_norm', 'transactions'])
+    if brands is not None:
+        cube = cube[cube['brand'].isin(brands)]
+    products = cube.groupby('nama_barang', observed=True).agg({
+        'total_value': 'sum',
+        'quantity': 'sum',
+        'brand': 'first',
+        'cat_norm': 'first',
+        'transactions': 'sum'
+    }).reset_index()
+    return _by_revenue(products, 'nama_barang')
+
+
+def category_summary(cube, brands=None):
+    """Revenue, quantity, produk unik dan brand unik per kategori"""
+    if cube.empty:
+        return pd.DataFrame(columns=['cat_norm', 'total_value', 'quantity', 'nama_barang', 'brand'])
+    if brands is not None:
+        cube = cube[cube['brand'].isin(brands)]
+    categories = cube.groupby('cat_norm', observed=True).agg({
+        'total_value': 'sum',
+        'quantity': 'sum',
+        'nama_barang': 'nunique',
+        'brand': 'nunique'
+    }).reset_index()
+    return _by_revenue(categories, 'cat_norm')
+
+
+def brand_category_pivot(cube):
+    """Pivot revenue brand x kategori untuk heatmap"""
+    if cube.empty:
+        return pd.DataFrame()
+    return cube.pivot_table(
+        index='brand',
+        columns='cat_norm',
+        values='total_value',
+        aggfunc='sum',
+        fill_value=0,
+        observed=True
+    )
+
+
+def monthly_revenue(cube):
+    """Deret revenue bulanan dari kubus"""
+    if cube.empty:
+        return pd.DataFrame(columns=['month_start', 'total_value', 'quantity'])
+    return cube.groupby('month_start').agg({
+        'total_value': 'sum',
+        'quantity': 'sum'
+    }).reset_index()
+
+
+# ==================== QUERY BERHALAMAN ====================
+def product_table(cube):
+    """Tabel produk teragregasi (urut revenue) dengan harga rata-rata"""
+    products = product_summary(cube).reset_index(drop=True)
+    products['Avg Price'] = (products['total_value'] / products['quantity']).round(0)
+    return products
+
+
+def query_products(products, brands=None, min_revenue=None, sort_by='total_value',
+                   ascending=False, page=1, page_size=20):
+    """Filter, urutkan lalu ambil satu halaman dari tabel produk teragregasi
+
+    Filter brand dan minimum revenue diterapkan sebelum paging. Untuk kolom
+    numerik hanya baris sampai akhir halaman yang diurutkan (nlargest/nsmallest),
+    jadi biaya per halaman tidak bergantung pada jumlah produk yang ditampilkan.
+
+    Returns (page_df, total_rows, total_pages)
+    """
+    mask = pd.Series(True, index=products.index)
+    if brands is not None:
+        mask &= products['brand'].isin(brands)
+    if min_revenue is not None:
+        mask &= products['total_value'] >= min_revenue
+    filtered = products[mask] if not mask.all() else products
+
+    total_rows = len(filtered)
+    total_pages = max(1, -(-total_rows // page_size))
+    page = min(max(1, int(page)), total_pages)
+    start, end = (page - 1) * page_size, page * page_size
+
+    if pd.api.types.is_numeric_dtype(filtered[sort_by]):
+        top = filtered.nsmallest(end, sort_by) if ascending else filtered.nlargest(end, sort_by)
+    else:
+        top = filtered.sort_values(sort_by, ascending=ascending, kind='stable')
+    return top.iloc[start:end].copy(), total_rows, total_pages
+
+
+# ==================== BUCKET WAKTU ====================
+# Label granularity -> satuan periode untuk judul/metrik drill-down
+GRANULARITY_UNITS = {
+    'Daily': 'Day',
+    'Weekly': 'Week',
+    'Monthly': 'Month',
+    'Quarterly': 'Quarter',
+    'Yearly': 'Year'
+}
+
+
+def time_bucket_keys(dates):
+    """Kunci awal periode harian/mingguan/bulanan/kuartalan/tahunan (vektor)
+
+    Minggu dimulai hari Senin, sama dengan to_period('W').start_time.
+    """
+    day = pd.to_datetime(dates).dt.normalize()
+    days = day.to_numpy(dtype='datetime64[D]')
+    months = days.astype('datetime64[M]')
+    month_index = months.astype('int64')  # bulan sejak 1970-01
+    return pd.DataFrame({
+        'Daily': day,
+        'Weekly': day - pd.to_timedelta(day.dt.dayofweek, unit='D'),
+        'Monthly': pd.to_datetime(months),
+        'Quarterly': pd.to_datetime((month_index - month_index % 3).astype('datetime64[M]')),
+        'Yearly': pd.to_datetime(days.astype('datetime64[Y]'))
+    }, index=dates.index)
+
+
+def build_time_series(transactions_df, ma_window=7):
+    """Deret revenue, quantity dan produk unik untuk semua granularity sekaligus
+
+    Dihitung sekali per versi data; ganti granularity cukup lookup dict.
+    Frame transaksi tidak dimodifikasi.
+    """
+    if transactions_df.empty or 'tanggal_order' not in transactions_df.columns:
+        return {}
+
+    keys = time_bucket_keys(transactions_df['tanggal_order'])
+    products = transactions_df['nama_barang']
+    series = {}
+    for granularity in GRANULARITY_UNITS:
+        grouped = pd.DataFrame({
+            'Period': keys[granularity],
+            'Revenue': transactions_df['total_value'],
+            'Quantity': transactions_df['quantity'],
+            'Unique Products': products.cat.codes if hasattr(products, 'cat') else products
+        }).groupby('Period', sort=True).agg({
+            'Revenue': 'sum',
+            'Quantity': 'sum',
+            'Unique Products': 'nunique'
+        }).reset_index()
+        grouped['MA_7'] = grouped['Revenue'].rolling(window=min(ma_window, len(grouped)), min_periods=1).mean()
+        series[granularity] = grouped
+    return series
+
+
+# ==================== AGREGASI OUT-OF-CORE ====================
+# File transaksi dibaca per chunk; setiap chunk diringkas menjadi partial
+# (kubus + revenue/quantity harian + sketch HyperLogLog produk unik per hari)
+# lalu dilipat ke partial sebelumnya. Kubus dan deret semua granularity
+# diturunkan dari partial, jadi memori tidak bergantung pada jumlah baris.
+def daily_partials(transactions_df, precision=HLL_PRECISION):
+    """Revenue dan quantity per hari + sketch produk unik per hari dari satu chunk"""
+    days = pd.to_datetime(transactions_df['tanggal_order']).dt.normalize()
+    daily = pd.DataFrame({
+        'Revenue': transactions_df['total_value'],
+        'Quantity': transactions_df['quantity'].astype('int64')
+    }).groupby(days.rename('Period'), sort=True).sum()
+
+    # Pasangan (hari, produk) unik dulu, baru di-hash per kategori produk
+    products = transactions_df['nama_barang'].astype('category')
+    n_products = max(len(products.cat.categories), 1)
+    pairs = pd.unique(daily.index.get_indexer(days).astype(np.int64) * n_products + products.cat.codes.to_numpy())
+    sketches = empty_registers(len(daily), precision)
+    hll_update(sketches, pairs // n_products, hash_values(products.cat.categories)[pairs % n_products], precision)
+    return {'daily': daily, 'sketches': sketches}
+
+
+def fold_daily(partial, delta):
+    """Gabungkan dua partial harian: jumlah ditambahkan, sketch hari yang sama diambil maksimumnya"""
+    if partial is None:
+        return delta
+    days = partial['daily'].index.union(delta['daily'].index)
+    daily = partial['daily'].reindex(days, fill_value=0) + delta['daily'].reindex(days, fill_value=0)
+    sketches = np.zeros((len(days), partial['sketches'].shape[1]), dtype=np.uint8)
+    sketches[days.get_indexer(partial['daily'].index)] = partial['sketches']
+    rows = days.get_indexer(delta['daily'].index)
+    sketches[rows] = np.maximum(sketches[rows], delta['sketches'])
+    return {'daily': daily, 'sketches': sketches}
+
+
+def _empty_partial():
+    """Partial harian tanpa hari"""
+    return {'daily': pd.DataFrame(columns=['Revenue', 'Quantity']), 'sketches': empty_registers(0)}
+
+
+def daily_from_chunks(chunks):
+    """Lipat chunk transaksi menjadi partial harian saja (tanpa kubus), mis. slice terfilter file besar"""
+    partial = None
+    for chunk in chunks:
+        if not chunk.empty:
+            partial = fold_daily(partial, daily_partials(chunk))
+    return partial if partial is not None else _empty_partial()
+
+
+def aggregate_chunks(chunks):
+    """Lipat chunk transaksi (mis. data_loader.iter_dataset) menjadi kubus dan partial harian
+
+    Memori puncak = satu chunk + kubus + satu sketch per hari, berapa pun panjang file.
+    Returns {'cube', 'daily', 'sketches', 'rows'}
+    """
+    cube, partial, rows = empty_cube(), None, 0
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        cube = merge_cube(cube, build_cube(chunk))
+        partial = fold_daily(partial, daily_partials(chunk))
+        rows += len(chunk)
+    if partial is None:
+        partial = _empty_partial()
+    return {'cube': cube, **partial, 'rows': rows}
+
+
+def time_series_from_daily(partial, ma_window=7):
+    """Deret semua granularity seperti build_time_series, dihitung dari partial harian
+
+    Revenue dan quantity tepat; Unique Products adalah perkiraan HyperLogLog
+    (sketch harian digabung per periode).
+    """
+    daily = partial['daily']
+    if daily.empty:
+        return {}
+    keys = time_bucket_keys(pd.Series(daily.index, index=pd.RangeIndex(len(daily))))
+    series = {}
+    for granularity in GRANULARITY_UNITS:
+        periods = keys[granularity]
+        # Hari terurut -> periode terurut, jadi setiap periode adalah satu rentang baris
+        starts = np.flatnonzero(np.r_[True, periods.to_numpy()[1:] != periods.to_numpy()[:-1]])
+        grouped = pd.DataFrame({
+            'Period': periods.iloc[starts].to_numpy(),
+            'Revenue': np.add.reduceat(daily['Revenue'].to_numpy(), starts),
+            'Quantity': np.add.reduceat(daily['Quantity'].to_numpy(), starts),
+            'Unique Products': np.round(hll_count(np.maximum.reduceat(partial['sketches'], starts, axis=0))).astype('int64')
+        })
+        grouped['MA_7'] = grouped['Revenue'].rolling(window=min(ma_window, len(grouped)), min_periods=1).mean()
+        series[granularity] = grouped
+    return series
@@ -1,9 +1,29 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime
+from formatting import format_currency, format_currency_series
+from figure_cache import get_figure, cache_stats
+from charts import create_forecast_chart, create_product_bar_chart, create_revenue_pie_chart
+from profiling import (
+    export_jsonl, figure_label, finish_run, label_figure, payload_bytes, profiled_fragment, start_run, summarize, timed
+)
+from data_loader import (
+    CACHE_DIR, FILE_MAPPING, data_version, is_large, iter_dataset, load_dataset, memory_footprint,
+    memory_report, read_derived, write_derived
+)
+from aggregates import (
+    build_cube, summary_metrics, brand_summary,
+    category_summary, brand_category_pivot, product_table, query_products,
+    GRANULARITY_UNITS, build_time_series, has_cube_schema, aggregate_chunks, daily_from_chunks, time_series_from_daily
+)
+from rule_index import RANK_METRICS, build_rule_index, indexed_products, rules_for_basket, rules_for_product
+from rule_mining import split_decisions
+from rule_pruning import prune_rules
+from abc_analysis import ABC_THRESHOLDS, classify_products, product_revenue, split_classes
+from filters import describe_filters, filter_cube, filter_transactions, iter_filtered_transactions, make_filters
+from forecasting import forecast_segments, segment_series, series_forecast, series_history
+import sql_backend
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -171,311 +191,28 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# ==================== FUNGSI UTILITAS ====================
-def format_currency(value):
-    """Format nilai mata uang dengan satuan yang sesuai"""
-    if pd.isna(value):
-        return "Rp 0"
-    
-    value = float(value)
-    if value >= 1_000_000_000:
-        return f"Rp {value/1_000_000_000:,.2f} M"
-    elif value >= 1_000_000:
-        return f"Rp {value/1_000_000:,.1f} Jt"
-    elif value >= 1_000:
-        return f"Rp {value/1_000:,.0f} K"
-    else:
-        return f"Rp {value:,.0f}"
-
-def create_product_bar_chart(products_df, title, color):
-    """Membuat bar chart untuk produk"""
-    if products_df.empty or len(products_df) == 0:
-        return None
-    
-    # Ambil top 10 produk
-    top_products = products_df.head(10).copy()
-    
-    # Buat nama pendek untuk label
-    top_products['short_name'] = top_products['nama_barang'].apply(
-        lambda x: (x[:20] + "...") if len(x) > 20 else x
-    )
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
-        x=top_products['short_name'],
-        y=top_products['total_value'],
-        name='Revenue',
-        marker_color=color,
-        text=top_products['total_value'].apply(lambda x: format_currency(x)),
-        textposition='outside',
-        hovertemplate='<b>%{x}</b><br>Revenue: Rp %{y:,.0f}<extra></extra>'
-    ))
-    
-    fig.update_layout(
-        title=f'🏆 {title} - Top 10 Products',
-        height=500,
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color='#111111', size=12),
-        xaxis=dict(
-            tickangle=45,
-            tickfont=dict(color='#333333'),
-            title_font=dict(color='#333333')
-        ),
-        yaxis=dict(
-            title="Revenue (Rp)",
-            tickformat=',.0f',
-            tickfont=dict(color='#333333'),
-            title_font=dict(color='#333333'),
-            gridcolor='rgba(0,0,0,0.05)'
-        ),
-        margin=dict(t=50, b=100, l=80, r=40)
-    )
-    
-    return fig
-
-def create_revenue_pie_chart(products_df, title):
-    """Membuat pie chart yang lebih compact untuk dashboard"""
-    if products_df.empty or len(products_df) == 0:
-        return None
-    
-    # Ambil maksimal 5 item untuk readability
-    if len(products_df) > 5:
-        display_df = products_df.head(4).copy()
-        other_revenue = products_df.iloc[4:]['total_value'].sum()
-        other_row = pd.DataFrame({
-            'nama_barang': ['Other'],
-            'total_value': [other_revenue],
-            'revenue_pct': [100 - display_df['revenue_pct'].sum() if 'revenue_pct' in display_df.columns else 0]
-        })
-        display_df = pd.concat([display_df, other_row], ignore_index=True)
-    else:
-        display_df = products_df.copy()
-    
-    # Buat label sangat pendek
-    display_df['short_name'] = display_df['nama_barang'].apply(
-        lambda x: x[:10] + "..." if len(x) > 10 else x
-    )
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Pie(
-        labels=display_df['short_name'],
-        values=display_df['total_value'],
-        textinfo='percent',  # HANYA PERSENTASE di chart
-        textposition='inside',
-        textfont=dict(color='white', size=9, family='Arial'),
-        hovertemplate='<b>%{full_label}</b><br>Revenue: Rp %{value:,.0f}<br>Share: %{percent}<extra></extra>',
-        marker=dict(colors=['#E30613', '#FF6B6B', '#FF9800', '#4CAF50', '#2196F3'][:len(display_df)]),
-        hole=0.5,  # DONUT CHART - lebih hemat space
-        rotation=90
-    ))
-    
-    # Custom data untuk hover
-    full_labels = display_df['nama_barang'].tolist()
-    for i, trace in enumerate(fig.data):
-        trace.customdata = [[full_labels[i]] for i in range(len(full_labels))]
-        trace.hovertemplate = '<b>%{customdata[0]}</b><br>Revenue: Rp %{value:,.0f}<br>Share: %{percent}<extra></extra>'
-    
-    fig.update_layout(
-        title={
-            'text': f'{title} Revenue',
-            'font': {'size': 14, 'color': '#111111', 'family': 'Arial'},
-            'y': 0.95
-        },
-        height=350,  # LEBIH PENDEK! (dari 500)
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color='#111111', size=9, family='Arial'),
-        margin=dict(t=40, b=10, l=10, r=10),  # MARGIN SANGAT KECIL
-        showlegend=True,
-        legend=dict(
-            font=dict(color='#333333', size=8),
-            orientation="v",
-            yanchor="middle",
-            y=0.5,
-            xanchor="left",
-            x=1.05,  # LEGEND DI LUAR
-            bgcolor='rgba(255,255,255,0.8)',
-            bordercolor='#CCCCCC',
-            borderwidth=1
-        ),
-        uniformtext=dict(
-            minsize=8,
-            mode='hide'
-        )
-    )
-    
-    return fig
-
-def create_forecast_chart(history_df, forecast_df):
-    """Membuat chart forecasting yang sudah DIPERBAIKI"""
-    
-    fig = go.Figure()
-    
-    # ===== 1. PLOT HISTORY DATA =====
-    if not history_df.empty and 'revenue' in history_df.columns:
-        try:
-            # Cari kolom tanggal yang benar
-            date_col_history = None
-            for col in ['date', 'tanggal_order', 'tanggal', 'ds']:
-                if col in history_df.columns:
-                    date_col_history = col
-                    break
-            
-            if date_col_history:
-                # Konversi tanggal
-                history_df[date_col_history] = pd.to_datetime(history_df[date_col_history])
-                history_df = history_df.sort_values(date_col_history)
-                
-                # Plot garis history
-                fig.add_trace(go.Scatter(
-                    x=history_df[date_col_history],
-                    y=history_df['revenue'],
-                    name='Actual Revenue',
-                    mode='lines+markers',
-                    line=dict(color='#E30613', width=4),
-                    marker=dict(size=8, color='#E30613'),
-                    hovertemplate='<b>%{x|%b %Y}</b><br>Actual: Rp %{y:,.0f}<extra></extra>'
-                ))
-                
-                # Plot moving average jika ada
-                if 'ma_3' in history_df.columns:
-                    ma_data = history_df[~history_df['ma_3'].isna()]
-                    if not ma_data.empty:
-                        fig.add_trace(go.Scatter(
-                            x=ma_data[date_col_history],
-                            y=ma_data['ma_3'],
-                            name='3-Month MA',
-                            mode='lines',
-                            line=dict(color='#FF6B6B', width=2.5, dash='dot'),
-                            opacity=0.8
-                        ))
-                        
-        except Exception as e:
-            st.sidebar.warning(f"History plot error: {str(e)[:50]}")
-    
-    # ===== 2. PLOT FORECAST DATA =====
-    if not forecast_df.empty and 'forecast_revenue' in forecast_df.columns:
-        try:
-            # Cari kolom tanggal yang benar
-            date_col_forecast = None
-            for col in ['date', 'tanggal', 'ds']:
-                if col in forecast_df.columns:
-                    date_col_forecast = col
-                    break
-            
-            if date_col_forecast:
-                # Konversi tanggal
-                forecast_df[date_col_forecast] = pd.to_datetime(forecast_df[date_col_forecast])
-                forecast_df = forecast_df.sort_values(date_col_forecast)
-                
-                # Plot confidence interval jika ada
-                if 'lower_ci' in forecast_df.columns and 'upper_ci' in forecast_df.columns:
-                    # Buat area confidence interval
-                    x_ci = pd.concat([forecast_df[date_col_forecast], forecast_df[date_col_forecast][::-1]])
-                    y_ci = pd.concat([forecast_df['upper_ci'], forecast_df['lower_ci'][::-1]])
-                    
-                    fig.add_trace(go.Scatter(
-                        x=x_ci,
-                        y=y_ci,
-                        fill='toself',
-                        fillcolor='rgba(78, 205, 196, 0.2)',
-                        line=dict(color='rgba(255,255,255,0)'),
-                        name='95% Confidence Interval',
-                        hoverinfo='skip',
-                        showlegend=True
-                    ))
-                
-                # Plot garis forecast
-                fig.add_trace(go.Scatter(
-                    x=forecast_df[date_col_forecast],
-                    y=forecast_df['forecast_revenue'],
-                    name='Revenue Forecast',
-                    mode='lines+markers',
-                    line=dict(color='#4ECDC4', width=4, dash='dash'),
-                    marker=dict(
-                        size=10, 
-                        color='#4ECDC4', 
-                        symbol='diamond',
-                        line=dict(width=1, color='white')
-                    ),
-                    hovertemplate='<b>%{x|%b %Y}</b><br>Forecast: Rp %{y:,.0f}<extra></extra>'
-                ))
-                
-        except Exception as e:
-            st.sidebar.warning(f"Forecast plot error: {str(e)[:50]}")
-    
-    # ===== 3. KONFIGURASI GRAFIK =====
-    fig.update_layout(
-        title={
-            'text': '📈 Revenue Trend Analysis & Forecast',
-            'font': {'size': 24, 'color': '#111111', 'family': 'Arial, sans-serif'},
-            'y': 0.95
-        },
-        height=550,
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color='#333333', size=12, family='Segoe UI, Arial'),
-        xaxis=dict(
-            title='',
-            tickfont=dict(color='#555555', size=11),
-            gridcolor='rgba(0,0,0,0.07)',
-            showgrid=True,
-            tickformat='%b %Y',
-            tickangle=0
-        ),
-        yaxis=dict(
-            title='Revenue (Rupiah)',
-            tickformat=',.0f',
-            tickfont=dict(color='#555555', size=11),
-            title_font=dict(color='#555555', size=13),
-            gridcolor='rgba(0,0,0,0.07)',
-            zerolinecolor='rgba(0,0,0,0.1)'
-        ),
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1,
-            font=dict(color='#333333', size=11),
-            bgcolor='rgba(255,255,255,0.9)',
-            bordercolor='rgba(0,0,0,0.1)',
-            borderwidth=1
-        ),
-        hovermode='x unified',
-        margin=dict(t=80, b=80, l=80, r=40)
-    )
-    
-    return fig
-
 # ==================== LOAD DATA - VERSI DIPERBAIKI ====================
 @st.cache_data
-def load_data():
-    """Load dan proses data - VERSI SIMPLIFIED"""
+def load_data(version):
+    """Load dan proses data - VERSI SIMPLIFIED (version = tanda versi CSV sumber)"""
     try:
         data = {}
         
         # ===== 1. LOAD SEMUA FILE DENGAN TRY-EXCEPT =====
-        file_mapping = {
-            'transactions': 'df_analysis.csv',
-            'top_products': 'produk_kelas_A.csv',
-            'mid_products': 'produk_kelas_B.csv', 
-            'low_products': 'produk_kelas_C.csv',
-            'bundles': 'decision_bundling.csv',
-            'cross_sell': 'decision_cross_selling.csv',
-            'priority_actions': 'decision_priority_action.csv',  # ✅ TAMBAH INI
-            'sales_history': 'time_series_revenue_actual.csv',
-            'sales_forecast': 'time_series_revenue_forecast.csv'
-        }
+        # Skema (category, tanggal, downcast numerik) ada di data_loader.DATASET_SCHEMAS
+        # CSV hanya diparse ulang jika berubah, selebihnya dibaca dari cache Feather (.cache/)
+        file_mapping = FILE_MAPPING
         
         for key, filename in file_mapping.items():
             try:
-                df = pd.read_csv(filename)
+                if key == 'transactions' and is_large(key, filename):
+                    # Terlalu besar untuk dibaca utuh: dipakai lewat load_stream_aggregates
+                    data[key] = pd.DataFrame()
+                    print(f"✓ Streaming: {filename} (out-of-core, dibaca per chunk)")
+                    continue
+                df = load_dataset(key, filename)
                 data[key] = df
-                print(f"✓ Success: {filename} ({len(df)} rows)")
+                print(f"✓ Success: {filename} ({len(df)} rows, {memory_footprint(df):.2f} MB)")
             except Exception as e:
                 print(f"✗ Failed: {filename} - {str(e)[:50]}")
                 data[key] = pd.DataFrame()  # DataFrame kosong
@@ -484,7 +221,61 @@ def load_data():
         
     except Exception as e:
         st.error(f"Fatal error loading data: {str(e)[:100]}")
-        return {key: pd.DataFrame() for key in file_mapping.keys()}
+        return {key: pd.DataFrame() for key in FILE_MAPPING.keys()}
+
+@st.cache_data
+def load_stream_aggregates(version):
+    """Kubus + revenue/quantity/sketch produk unik harian dari file transaksi besar, dibaca per chunk"""
+    return aggregate_chunks(iter_dataset('transactions'))
+
+@st.cache_resource
+def load_sql_engine(version):
+    """Koneksi DuckDB (file di .cache/) yang tabelnya sudah sinkron dengan CSV versi ini; None jika tidak tersedia"""
+    if sql_backend.duckdb is None:
+        return None
+    try:
+        return sql_backend.connect(CACHE_DIR)
+    except Exception as e:
+        print(f"✗ Failed: SQL engine - {str(e)[:50]}")
+        return None
+
+@st.cache_data
+def load_cube(version):
+    """Kubus agregat brand x kategori x produk x bulan, dibangun sekali per versi data"""
+    # Kubus yang sudah diperbarui oleh ingestion.py dipakai langsung
+    cube = read_derived('cube')
+    if cube is not None and has_cube_schema(cube):
+        return cube
+    
+    if is_large('transactions'):
+        cube = load_stream_aggregates(version)['cube']
+    else:
+        cube = build_cube(load_data(version).get('transactions', pd.DataFrame()))
+    try:
+        write_derived('cube', cube)
+    except Exception as e:
+        print(f"✗ Cube cache write failed - {str(e)[:50]}")
+    return cube
+
+@st.cache_data
+def load_filtered_cube(version, filters):
+    """Kubus sesuai filter global; bulan penuh dari kubus, bulan parsial dari partisi transaksinya"""
+    return filter_cube(load_cube(version), filters)
+
+def scoped_cube(version, filters=None):
+    """Kubus penuh, atau kubus terfilter jika ada filter global aktif"""
+    return load_filtered_cube(version, filters) if filters else load_cube(version)
+
+@st.cache_data
+def load_date_bounds(version):
+    """Tanggal transaksi pertama dan terakhir (batas filter tanggal)"""
+    if is_large('transactions'):
+        days = load_stream_aggregates(version)['daily'].index
+        return (days[0].date(), days[-1].date()) if len(days) else None
+    transactions = load_data(version).get('transactions', pd.DataFrame())
+    if transactions.empty:
+        return None
+    return transactions['tanggal_order'].min().date(), transactions['tanggal_order'].max().date()
 
 # ==================== HEADER & BRANDING ERAPHONE ====================
 # ==================== HEADER & BRANDING ERAPHONE ====================
@@ -518,7 +309,89 @@ st.markdown("""
 
 
 # ==================== LOAD DATA ====================
-data = load_data()
+version = data_version()
+start_run(st.session_state, data_version=version)
+# Ukuran payload hanya diukur jika diaktifkan di panel Performance (serialisasi ulang)
+measure_payload = st.session_state.get('profile_payload', False)
+
+with timed(st.session_state, 'load_data', 'load') as load_event:
+    data = load_data(version)
+    load_event['rows'] = len(data.get('transactions', pd.DataFrame()))
+with timed(st.session_state, 'load_cube', 'load') as load_event:
+    full_cube = load_cube(version)
+    load_event['rows'] = len(full_cube)
+
+# Mesin query section: SQL DuckDB (opsional, default untuk file transaksi besar) atau kubus pandas.
+# Pilihannya ada di panel Performance.
+engine = 'pandas'
+if st.session_state.get('sql_engine', sql_backend.duckdb is not None and is_large('transactions')):
+    with timed(st.session_state, 'sql_engine', 'load'):
+        engine = 'sql' if load_sql_engine(version) is not None else 'pandas'
+
+# ==================== FILTER GLOBAL ====================
+# Predikat didorong ke kubus/partisi transaksi; semua section membaca kubus terfilter
+with st.sidebar.expander("🔎 Global Filters", expanded=False):
+    date_bounds = load_date_bounds(version)
+    date_range = None
+    if date_bounds is not None:
+        picked_dates = st.date_input(
+            "Date range",
+            value=date_bounds,
+            min_value=date_bounds[0],
+            max_value=date_bounds[1],
+            key="filter_dates"
+        )
+        # Saat memilih rentang, widget sempat mengembalikan satu tanggal saja
+        if isinstance(picked_dates, (list, tuple)) and len(picked_dates) == 2:
+            date_range = tuple(picked_dates)
+
+    def filter_options(column):
+        if full_cube.empty or column not in full_cube.columns:
+            return []
+        return sorted(full_cube[column].astype(str).unique())
+
+    picked_types = st.multiselect("Transaction type", options=filter_options('transaction_type'), key="filter_transaction_type")
+    picked_categories = st.multiselect("Category", options=filter_options('cat_norm'), key="filter_cat_norm")
+    flag_choices = {"All": None, "Exclude": False, "Only": True}
+    picked_returns = st.selectbox("Returns", options=list(flag_choices), key="filter_is_return")
+    picked_bags = st.selectbox("Shopping bags", options=list(flag_choices), key="filter_is_shopping_bag")
+
+    filters = make_filters(
+        date_range,
+        bounds=date_bounds,
+        transaction_type=picked_types,
+        cat_norm=picked_categories,
+        is_return=flag_choices[picked_returns],
+        is_shopping_bag=flag_choices[picked_bags]
+    )
+    st.caption(describe_filters(filters))
+
+with timed(st.session_state, 'filter_cube', 'load') as load_event:
+    cube = scoped_cube(version, filters)
+    load_event['rows'] = len(cube)
+
+def cached_figure(name, builder, *deps):
+    """Ambil figure dari cache sesi; dibangun ulang hanya jika versi data, filter global atau input chart berubah"""
+    misses = cache_stats(st.session_state)['misses']
+    with timed(st.session_state, name, 'chart_build') as event:
+        fig = get_figure(st.session_state, name, builder, (version, filters) + deps)
+    event['cached'] = cache_stats(st.session_state)['misses'] == misses
+    label_figure(st.session_state, fig, name)
+    return fig
+
+def plotly_chart(fig, **kwargs):
+    """st.plotly_chart dengan pencatatan waktu serialisasi/kirim (dan ukuran payload jika diaktifkan)"""
+    with timed(st.session_state, figure_label(st.session_state, fig), 'chart_render') as event:
+        st.plotly_chart(fig, **kwargs)
+    if measure_payload:
+        event['bytes'] = payload_bytes(fig)
+
+def show_table(name, df, **kwargs):
+    """st.dataframe dengan pencatatan waktu, jumlah baris (dan ukuran payload jika diaktifkan)"""
+    with timed(st.session_state, name, 'table', rows=len(df)) as event:
+        st.dataframe(df, **kwargs)
+    if measure_payload:
+        event['bytes'] = payload_bytes(df)
 
 # ==================== DEBUG INFO ====================
 with st.sidebar.expander("🔍 Data Status", expanded=False):
@@ -537,278 +410,302 @@ with st.sidebar.expander("🔍 Data Status", expanded=False):
         st.success(f"✓ Loaded: {len(data['sales_history'])} rows")
     else:
         st.error("✗ No history data loaded")
+    
+    st.write("---")
+    
+    st.write("**Memory Footprint:**")
+    st.dataframe(memory_report(data), use_container_width=True, hide_index=True)
 
-# ==================== EXECUTIVE SUMMARY ====================
-st.markdown('<h2 class="modern-header">📊 Executive Summary</h2>', unsafe_allow_html=True)
+# Panel Performance diisi di akhir script, setelah semua section tercatat
+perf_panel = st.sidebar.container()
 
 transactions_df = data.get('transactions', pd.DataFrame())
-top_products = data.get('top_products', pd.DataFrame())
-mid_products = data.get('mid_products', pd.DataFrame())
-low_products = data.get('low_products', pd.DataFrame())
-
-# ===== HITUNG DATA TAMBAHAN =====
-# Hitung top brand
-top_brand_name = "N/A"
-top_brand_revenue = 0
-if not transactions_df.empty and 'brand' in transactions_df.columns:
-    brand_revenue = transactions_df.groupby('brand')['total_value'].sum().reset_index()
-    if not brand_revenue.empty:
-        top_brand = brand_revenue.sort_values('total_value', ascending=False).iloc[0]
+
+@st.cache_data
+def load_product_table(version, filters=None, engine='pandas'):
+    """Tabel produk teragregasi dari kubus (terfilter) atau SQL, basis query berhalaman"""
+    if engine == 'sql':
+        return sql_backend.product_table(load_sql_engine(version), filters)
+    return product_table(scoped_cube(version, filters))
+
+@st.cache_data
+def load_brand_ranking(version, filters=None, engine='pandas'):
+    """Ranking brand dari kubus atau SQL, dipakai Executive Summary dan Top Performers"""
+    if engine == 'sql':
+        return sql_backend.brand_summary(load_sql_engine(version), filters)
+    return brand_summary(scoped_cube(version, filters))
+
+@st.cache_data
+def load_category_table(version, filters=None, engine='pandas'):
+    """Ringkasan per kategori dari kubus atau SQL"""
+    if engine == 'sql':
+        return sql_backend.category_summary(load_sql_engine(version), filters)
+    return category_summary(scoped_cube(version, filters))
+
+@st.cache_data
+def load_brand_category_pivot(version, filters=None, engine='pandas'):
+    """Pivot revenue brand x kategori (heatmap) dari kubus atau SQL"""
+    if engine == 'sql':
+        return sql_backend.brand_category_pivot(load_sql_engine(version), filters)
+    return brand_category_pivot(scoped_cube(version, filters))
+
+@st.cache_data
+def load_time_series(version, filters=None, engine='pandas'):
+    """Deret waktu semua granularity untuk drill-down, dihitung sekali per versi data dan filter"""
+    if engine == 'sql':
+        return sql_backend.time_series(load_sql_engine(version), filters)
+    if not filters:
+        if is_large('transactions'):
+            # Produk unik per periode dari sketch HyperLogLog harian (perkiraan)
+            return time_series_from_daily(load_stream_aggregates(version))
+        return build_time_series(load_data(version).get('transactions', pd.DataFrame()))
+    # Hanya partisi bulan dalam rentang filter yang dibaca
+    months = load_cube(version)['month_start'].unique()
+    if is_large('transactions'):
+        # Slice terfilter file besar dilipat per batch partisi, tidak dimuat utuh
+        return time_series_from_daily(daily_from_chunks(iter_filtered_transactions(filters, months=months)))
+    return build_time_series(filter_transactions(filters, months=months))
+
+@st.cache_data
+def load_abc_classes(version, thresholds=ABC_THRESHOLDS, brands=None, months=None, filters=None, engine='pandas'):
+    """Kelas ABC dari kubus transaksi atau SQL (bukan produk_kelas_*.csv); kelas default ikut diperbarui ingestion.py"""
+    if engine == 'sql':
+        return split_classes(sql_backend.abc_classes(load_sql_engine(version), thresholds, brands, months, filters))
+    default_scope = tuple(thresholds) == ABC_THRESHOLDS and brands is None and months is None and not filters
+    if default_scope:
+        classes = read_derived('abc_classes')
+        if classes is not None:
+            return split_classes(classes)
+
+    cube = scoped_cube(version, filters)
+    if cube.empty and not filters:
+        # Tanpa transaksi, kembali ke file kelas hasil offline
+        version_data = load_data(version)
+        return {
+            'A': version_data.get('top_products', pd.DataFrame()),
+            'B': version_data.get('mid_products', pd.DataFrame()),
+            'C': version_data.get('low_products', pd.DataFrame())
+        }
+
+    classes = classify_products(product_revenue(cube, brands, months), thresholds)
+    if default_scope:
+        try:
+            write_derived('abc_classes', classes)
+        except Exception as e:
+            print(f"✗ ABC cache write failed - {str(e)[:50]}")
+    return split_classes(classes)
+
+@st.cache_data
+def load_forecasts(version):
+    """Deret revenue bulanan + forecast total, per brand dan per cat_norm (satu batch per versi data)
+
+    Model di-cache per deret, jadi setelah data berubah hanya deret yang historinya berubah yang di-fit ulang.
+    """
+    bounds = load_date_bounds(version)
+    if bounds is None:
+        return {'series': pd.DataFrame(), 'forecasts': pd.DataFrame(), 'fit_paths': {}}
+    cube = load_cube(version)
+    last_date = pd.Timestamp(bounds[1])
+    try:
+        forecasts = forecast_segments(cube, last_date, cache_dir=CACHE_DIR)
+    except Exception as e:
+        print(f"✗ Failed: forecasting - {str(e)[:50]}")
+        forecasts = pd.DataFrame()
+    return {
+        'series': segment_series(cube, last_date)[0],
+        'forecasts': forecasts,
+        'fit_paths': forecasts.attrs.get('fit_paths', {})
+    }
+
+@st.cache_data
+def load_decision_rules(version, engine='pandas'):
+    """Rule bundling & cross-selling setelah pruning redundansi (cermin, parent, non-closed)"""
+    if engine == 'sql':
+        con = load_sql_engine(version)
+        sources = [sql_backend.read_table(con, 'bundles'), sql_backend.read_table(con, 'cross_sell')]
+    else:
+        version_data = load_data(version)
+        sources = [version_data.get('bundles', pd.DataFrame()), version_data.get('cross_sell', pd.DataFrame())]
+    rules = pd.concat(sources, ignore_index=True)
+    if rules.empty or 'business_strategy' not in rules.columns:
+        return {'bundles': pd.DataFrame(), 'cross_sell': pd.DataFrame()}
+    catalog = load_product_table(version, engine=engine)['nama_barang'].astype(str)
+    decisions = split_decisions(prune_rules(rules, catalog=catalog))
+    return {'bundles': decisions['bundles'], 'cross_sell': decisions['cross_sell']}
+
+@st.cache_resource
+def load_rule_index(version, engine='pandas'):
+    """Index rule bundling + cross-selling per produk (read-only, dipakai bersama tanpa disalin)"""
+    decision_rules = load_decision_rules(version, engine)
+    rules = pd.concat([decision_rules['bundles'], decision_rules['cross_sell']], ignore_index=True)
+    if rules.empty:
+        return None
+    return build_rule_index(rules, catalog=load_product_table(version, engine=engine)['nama_barang'].astype(str))
+
+# ==================== EXECUTIVE SUMMARY ====================
+def render_executive_summary():
+    """Section Executive Summary: metrik utama dan kartu ringkasan"""
+    st.markdown('<h2 class="modern-header">📊 Executive Summary</h2>', unsafe_allow_html=True)
+
+    # ===== HITUNG DATA TAMBAHAN =====
+    # Semua angka ringkasan dibaca dari kubus agregat, bukan dari transaksi mentah
+    summary = summary_metrics(cube)
+    brand_ranking = load_brand_ranking(version, filters, engine)
+
+    # Hitung top brand
+    top_brand_name = "N/A"
+    top_brand_revenue = 0
+    if not brand_ranking.empty:
+        top_brand = brand_ranking.iloc[0]
         top_brand_name = top_brand['brand']
         top_brand_revenue = top_brand['total_value']
         if len(top_brand_name) > 15:
             top_brand_name = top_brand_name[:15] + "..."
 
-# Hitung total brands
-total_brands = transactions_df['brand'].nunique() if not transactions_df.empty and 'brand' in transactions_df.columns else 0
+    # Hitung total brands
+    total_brands = summary['total_brands']
+
+    # Hitung average revenue per transaction
+    total_revenue = summary['total_revenue']
+    total_transactions = summary['total_transactions']
+    avg_revenue_per_tx = total_revenue / total_transactions if total_transactions > 0 else 0
 
-# Hitung average revenue per transaction
-total_revenue = transactions_df['total_value'].sum() if not transactions_df.empty else 0
-total_transactions = len(transactions_df) if not transactions_df.empty else 0
-avg_revenue_per_tx = total_revenue / total_transactions if total_transactions > 0 else 0
+    abc_classes = load_abc_classes(version, filters=filters, engine=engine)
+    top_products = abc_classes['A']
+    mid_products = abc_classes['B']
+    low_products = abc_classes['C']
 
-# Top product info
-top_product_name = "N/A"
-top_product_revenue = 0
-if not top_products.empty and 'nama_barang' in top_products.columns:
-    top_product_name = top_products.iloc[0]['nama_barang']
-    top_product_revenue = top_products.iloc[0]['total_value'] if 'total_value' in top_products.columns else 0
-    if len(top_product_name) > 18:
-        top_product_name = top_product_name[:18] + "..."
+    # Top product info
+    top_product_name = "N/A"
+    top_product_revenue = 0
+    if not top_products.empty and 'nama_barang' in top_products.columns:
+        top_product_name = top_products.iloc[0]['nama_barang']
+        top_product_revenue = top_products.iloc[0]['total_value'] if 'total_value' in top_products.columns else 0
+        if len(top_product_name) > 18:
+            top_product_name = top_product_name[:18] + "..."
 
 
 
-# Metrics Row 1 - VERSI DENGAN "TOTAL PRODUCTS"
+    # Metrics Row 1 - VERSI DENGAN "TOTAL PRODUCTS"
 
-# Metrics Row 1 - VERSI DIPERBAIKI
-col1, col2, col3, col4, col5 = st.columns(5)
+    # Metrics Row 1 - VERSI DIPERBAIKI
+    col1, col2, col3, col4, col5 = st.columns(5)
 
-with col1:
-    total_revenue = transactions_df['total_value'].sum() if not transactions_df.empty else 0
-    st.metric("💰 Total Revenue", format_currency(total_revenue))
+    with col1:
+        st.metric("💰 Total Revenue", format_currency(total_revenue))
 
-with col2:
-    total_transactions = len(transactions_df) if not transactions_df.empty else 0
-    st.metric("🧾 Total Transactions", f"{total_transactions:,}")
+    with col2:
+        st.metric("🧾 Total Transactions", f"{total_transactions:,}")
 
-with col3:
-    # AMBIL LANGSUNG DARI df_analysis.csv
-    transactions_data = data.get('transactions', pd.DataFrame())
-    
-    # HITUNG nama_barang unik
-    total_produk = transactions_data['nama_barang'].nunique() if not transactions_data.empty and 'nama_barang' in transactions_data.columns else 0
-    
-    # TAMPILKAN
-    st.metric("📦 Total Products", f"{total_produk:,}")
+    with col3:
+        # HITUNG nama_barang unik (dari kubus agregat df_analysis.csv)
+        total_produk = summary['total_products']
 
-with col4:
-    # AVERAGE REVENUE PER TRANSACTION
-    avg_revenue_per_tx = total_revenue / total_transactions if total_transactions > 0 else 0
-    st.metric("📈 Avg. per Transaction", format_currency(avg_revenue_per_tx))
-
-with col5:
-    total_brands = transactions_df['brand'].nunique() if not transactions_df.empty and 'brand' in transactions_df.columns else 0
-    st.metric("🏷️ Total Brands", f"{total_brands:,}")
-
-# Metrics Row 2 - INFORMASI BARU
-col6, col7, col8, col9 = st.columns(4)
-
-with col6:
-    # TOP PRODUCT
-    st.markdown(f"""
-    <div style="background: white; padding: 1rem; border-radius: 10px; border-left: 4px solid #E30613; box-shadow: 0 2px 6px rgba(0,0,0,0.05); height: 100%;">
-        <div style="font-size: 0.85rem; color: #666666; margin-bottom: 0.4rem;">🏆 TOP PRODUCT</div>
-        <div style="font-size: 1rem; font-weight: 600; color: #111111; line-height: 1.2; margin-bottom: 0.5rem;">{top_product_name}</div>
-        <div style="font-size: 0.95rem; color: #E30613; font-weight: 700;">{format_currency(top_product_revenue)}</div>
-    </div>
-    """, unsafe_allow_html=True)
+        # TAMPILKAN
+        st.metric("📦 Total Products", f"{total_produk:,}")
 
-with col7:
-    # TOP BRAND  
-    st.markdown(f"""
-    <div style="background: white; padding: 1rem; border-radius: 10px; border-left: 4px solid #4CAF50; box-shadow: 0 2px 6px rgba(0,0,0,0.05); height: 100%;">
-        <div style="font-size: 0.85rem; color: #666666; margin-bottom: 0.4rem;">👑 TOP BRAND</div>
-        <div style="font-size: 1rem; font-weight: 600; color: #111111; line-height: 1.2; margin-bottom: 0.5rem;">{top_brand_name}</div>
-        <div style="font-size: 0.95rem; color: #4CAF50; font-weight: 700;">{format_currency(top_brand_revenue)}</div>
-    </div>
-    """, unsafe_allow_html=True)
+    with col4:
+        # AVERAGE REVENUE PER TRANSACTION
+        st.metric("📈 Avg. per Transaction", format_currency(avg_revenue_per_tx))
+
+    with col5:
+        st.metric("🏷️ Total Brands", f"{total_brands:,}")
 
-with col8:
-    # CLASS A REVENUE
-    class_a_revenue = top_products['total_value'].sum() if not top_products.empty else 0
-    st.markdown(f"""
-    <div style="background: white; padding: 1rem; border-radius: 10px; border-left: 4px solid #FF9800; box-shadow: 0 2px 6px rgba(0,0,0,0.05); height: 100%;">
-        <div style="font-size: 0.85rem; color: #666666; margin-bottom: 0.4rem;">⭐ CLASS A REVENUE</div>
-        <div style="font-size: 1.1rem; color: #111111; font-weight: 700; margin-bottom: 0.2rem;">{format_currency(class_a_revenue)}</div>
-        <div style="font-size: 0.8rem; color: #666666;">
-            {len(top_products)} products
+    # Metrics Row 2 - INFORMASI BARU
+    col6, col7, col8, col9 = st.columns(4)
+
+    with col6:
+        # TOP PRODUCT
+        st.markdown(f"""
+        <div style="background: white; padding: 1rem; border-radius: 10px; border-left: 4px solid #E30613; box-shadow: 0 2px 6px rgba(0,0,0,0.05); height: 100%;">
+            <div style="font-size: 0.85rem; color: #666666; margin-bottom: 0.4rem;">🏆 TOP PRODUCT</div>
+            <div style="font-size: 1rem; font-weight: 600; color: #111111; line-height: 1.2; margin-bottom: 0.5rem;">{top_product_name}</div>
+            <div style="font-size: 0.95rem; color: #E30613; font-weight: 700;">{format_currency(top_product_revenue)}</div>
         </div>
-    </div>
-    """, unsafe_allow_html=True)
+        """, unsafe_allow_html=True)
 
-with col9:
-    # CLASS B+C REVENUE
-    class_b_revenue = mid_products['total_value'].sum() if not mid_products.empty else 0
-    class_c_revenue = low_products['total_value'].sum() if not low_products.empty else 0
-    total_bc_revenue = class_b_revenue + class_c_revenue
-    total_bc_products = len(mid_products) + len(low_products)
-    
-    st.markdown(f"""
-    <div style="background: white; padding: 1rem; border-radius: 10px; border-left: 4px solid #2196F3; box-shadow: 0 2px 6px rgba(0,0,0,0.05); height: 100%;">
-        <div style="font-size: 0.85rem; color: #666666; margin-bottom: 0.4rem;">📊 CLASS B + C REVENUE</div>
-        <div style="font-size: 1.1rem; color: #111111; font-weight: 700; margin-bottom: 0.2rem;">{format_currency(total_bc_revenue)}</div>
-        <div style="font-size: 0.8rem; color: #666666;">
-            {total_bc_products} products
+    with col7:
+        # TOP BRAND  
+        st.markdown(f"""
+        <div style="background: white; padding: 1rem; border-radius: 10px; border-left: 4px solid #4CAF50; box-shadow: 0 2px 6px rgba(0,0,0,0.05); height: 100%;">
+            <div style="font-size: 0.85rem; color: #666666; margin-bottom: 0.4rem;">👑 TOP BRAND</div>
+            <div style="font-size: 1rem; font-weight: 600; color: #111111; line-height: 1.2; margin-bottom: 0.5rem;">{top_brand_name}</div>
+            <div style="font-size: 0.95rem; color: #4CAF50; font-weight: 700;">{format_currency(top_brand_revenue)}</div>
         </div>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    
+        """, unsafe_allow_html=True)
 
-# ==================== TOP PERFORMERS ANALYSIS ====================
-st.markdown('<h2 class="modern-header">🏆 Top Performers Analysis</h2>', unsafe_allow_html=True)
-
-# Buat 3 tab untuk Top Brands, Top Products, Top Categories
-top_tab1, top_tab2, top_tab3 = st.tabs(["🏷️ Top Brands", "📦 Top Products", "📊 Top Categories"])
-
-with top_tab1:
-    if not transactions_df.empty and 'brand' in transactions_df.columns:
-        # Hitung metrics brand
-        brand_analysis = transactions_df.groupby('brand').agg({
-            'total_value': 'sum',
-            'quantity': 'sum',
-            'nama_barang': 'nunique'
-        }).reset_index()
-        brand_analysis = brand_analysis.sort_values('total_value', ascending=False)
-        brand_analysis.columns = ['Brand', 'Total Revenue', 'Total Quantity', 'Unique Products']
-        
-        # Format currency
-        brand_analysis['Revenue Formatted'] = brand_analysis['Total Revenue'].apply(format_currency)
-        brand_analysis['Revenue %'] = (brand_analysis['Total Revenue'] / brand_analysis['Total Revenue'].sum() * 100).round(2)
-        
-        # Tampilkan metrics
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            top_brand = brand_analysis.iloc[0]['Brand'] if len(brand_analysis) > 0 else "N/A"
-            top_brand_rev = brand_analysis.iloc[0]['Total Revenue'] if len(brand_analysis) > 0 else 0
-            st.metric("👑 Top Brand", top_brand, format_currency(top_brand_rev))
-        
-        with col2:
-            avg_rev_per_brand = brand_analysis['Total Revenue'].mean()
-            st.metric("📊 Avg/Brand", format_currency(avg_rev_per_brand))
-        
-        with col3:
-            top_3_share = brand_analysis.head(3)['Total Revenue'].sum() / brand_analysis['Total Revenue'].sum() * 100
-            st.metric("🎯 Top 3 Share", f"{top_3_share:.1f}%")
-        
-        # Visualisasi
-        col_viz1, col_viz2 = st.columns(2)
-        
-        with col_viz1:
-            # Bar chart top 10 brands
-            top_10_brands = brand_analysis.head(10)
-            fig_brands = px.bar(
-                top_10_brands,
-                x='Brand',
-                y='Total Revenue',
-                title='Top 10 Brands by Revenue',
-                color='Total Revenue',
-                color_continuous_scale='reds',
-                text='Revenue Formatted'
-            )
-            fig_brands.update_layout(
-                height=400,
-                xaxis_tickangle=-45,
-                yaxis_title="Revenue",
-                plot_bgcolor='white'
-            )
-            st.plotly_chart(fig_brands, use_container_width=True)
-        
-        with col_viz2:
-            # Pie chart brand distribution
-            fig_pie = px.pie(
-                brand_analysis.head(8),
-                values='Total Revenue',
-                names='Brand',
-                title='Brand Revenue Distribution',
-                hole=0.4,
-                color_discrete_sequence=px.colors.sequential.Reds
-            )
-            fig_pie.update_traces(textposition='inside', textinfo='percent+label')
-            fig_pie.update_layout(height=400)
-            st.plotly_chart(fig_pie, use_container_width=True)
-        
-        # Data table
-        st.markdown("### 📋 Brand Performance Details")
-        display_brand_df = brand_analysis[['Brand', 'Revenue Formatted', 'Revenue %', 'Total Quantity', 'Unique Products']]
-        st.dataframe(display_brand_df, use_container_width=True, height=300)
-    else:
-        st.info("No brand data available")
-
-with top_tab2:
-    if not transactions_df.empty:
-        # Hitung metrics produk
-        product_analysis = transactions_df.groupby('nama_barang').agg({
-            'total_value': 'sum',
-            'quantity': 'sum',
-            'brand': 'first',
-            'cat_norm': 'first'
-        }).reset_index()
-        product_analysis = product_analysis.sort_values('total_value', ascending=False)
-        
-        # Tambahkan metrics tambahan
-        product_analysis['Revenue Formatted'] = product_analysis['total_value'].apply(format_currency)
-        product_analysis['Avg Price'] = (product_analysis['total_value'] / product_analysis['quantity']).round(0)
-        
-        # Tampilkan metrics
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            top_product = product_analysis.iloc[0]['nama_barang'][:20] + "..." if len(product_analysis.iloc[0]['nama_barang']) > 20 else product_analysis.iloc[0]['nama_barang']
-            top_product_rev = product_analysis.iloc[0]['total_value']
-            st.metric("🥇 Top Product", top_product, format_currency(top_product_rev))
-        
-        with col2:
-            total_unique_products = len(product_analysis)
-            st.metric("📦 Unique Products", f"{total_unique_products:,}")
-        
-        with col3:
-            avg_rev_per_product = product_analysis['total_value'].mean()
-            st.metric("💰 Avg/Product", format_currency(avg_rev_per_product))
-        
-        # Filter interaktif
-        col_filter1, col_filter2 = st.columns(2)
-        with col_filter1:
-            selected_brand = st.selectbox(
-                "Filter by Brand",
-                options=["All"] + sorted(product_analysis['brand'].dropna().unique().tolist()),
-                key="product_brand_filter"
-            )
-        
-        with col_filter2:
-            min_revenue = st.number_input(
-                "Minimum Revenue (Rp)",
-                min_value=0,
-                value=1000000,
-                step=1000000,
-                format="%d"
-            )
-        
-        # Apply filters
-        filtered_products = product_analysis.copy()
-        if selected_brand != "All":
-            filtered_products = filtered_products[filtered_products['brand'] == selected_brand]
-        filtered_products = filtered_products[filtered_products['total_value'] >= min_revenue]
-        
-        # Visualisasi
-        col_viz1, col_viz2 = st.columns(2)
-        
-        with col_viz1:
-            # Top products bar chart
+    with col8:
+        # CLASS A REVENUE
+        class_a_revenue = top_products['total_value'].sum() if not top_products.empty else 0
+        st.markdown(f"""
+        <div style="background: white; padding: 1rem; border-radius: 10px; border-left: 4px solid #FF9800; box-shadow: 0 2px 6px rgba(0,0,0,0.05); height: 100%;">
+            <div style="font-size: 0.85rem; color: #666666; margin-bottom: 0.4rem;">⭐ CLASS A REVENUE</div>
+            <div style="font-size: 1.1rem; color: #111111; font-weight: 700; margin-bottom: 0.2rem;">{format_currency(class_a_revenue)}</div>
+            <div style="font-size: 0.8rem; color: #666666;">
+                {len(top_products)} products
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col9:
+        # CLASS B+C REVENUE
+        class_b_revenue = mid_products['total_value'].sum() if not mid_products.empty else 0
+        class_c_revenue = low_products['total_value'].sum() if not low_products.empty else 0
+        total_bc_revenue = class_b_revenue + class_c_revenue
+        total_bc_products = len(mid_products) + len(low_products)
+
+        st.markdown(f"""
+        <div style="background: white; padding: 1rem; border-radius: 10px; border-left: 4px solid #2196F3; box-shadow: 0 2px 6px rgba(0,0,0,0.05); height: 100%;">
+            <div style="font-size: 0.85rem; color: #666666; margin-bottom: 0.4rem;">📊 CLASS B + C REVENUE</div>
+            <div style="font-size: 1.1rem; color: #111111; font-weight: 700; margin-bottom: 0.2rem;">{format_currency(total_bc_revenue)}</div>
+            <div style="font-size: 0.8rem; color: #666666;">
+                {total_bc_products} products
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+
+
+# ==================== FRAGMENT INTERAKTIF ====================
+# Widget di dalam fragment hanya menjalankan ulang fragment itu sendiri
+@st.fragment
+@profiled_fragment(st.session_state, 'product_explorer')
+def render_product_explorer(product_analysis):
+    """Filter brand/revenue, chart dan tabel produk berhalaman"""
+    # Filter interaktif
+    col_filter1, col_filter2 = st.columns(2)
+    with col_filter1:
+        selected_brand = st.selectbox(
+            "Filter by Brand",
+            options=["All"] + sorted(product_analysis['brand'].dropna().unique().tolist()),
+            key="product_brand_filter"
+        )
+
+    with col_filter2:
+        min_revenue = st.number_input(
+            "Minimum Revenue (Rp)",
+            min_value=0,
+            value=1000000,
+            step=1000000,
+            format="%d"
+        )
+
+    # Apply filters (di tabel agregat; chart cukup 50 produk teratas)
+    brand_filter = None if selected_brand == "All" else [selected_brand]
+    filtered_products, total_filtered, _ = query_products(
+        product_analysis, brands=brand_filter, min_revenue=min_revenue, page_size=50
+    )
+
+    # Visualisasi
+    col_viz1, col_viz2 = st.columns(2)
+
+    with col_viz1:
+        # Top products bar chart
+        def build_fig_products():
             top_20_products = filtered_products.head(20).copy()
             top_20_products['Short Name'] = top_20_products['nama_barang'].apply(
                 lambda x: (x[:15] + "...") if len(x) > 15 else x
             )
-            
+
             fig_products = px.bar(
                 top_20_products,
                 x='Short Name',
@@ -824,10 +721,14 @@ with top_tab2:
                 yaxis_title="Revenue",
                 plot_bgcolor='white'
             )
-            st.plotly_chart(fig_products, use_container_width=True)
-        
-        with col_viz2:
-            # Scatter plot: Quantity vs Revenue
+            return fig_products
+
+        fig_products = cached_figure('top_products_bar', build_fig_products, selected_brand, min_revenue)
+        plotly_chart(fig_products, use_container_width=True)
+
+    with col_viz2:
+        # Scatter plot: Quantity vs Revenue
+        def build_fig_scatter():
             fig_scatter = px.scatter(
                 filtered_products.head(50),
                 x='quantity',
@@ -840,812 +741,1124 @@ with top_tab2:
                 size_max=30
             )
             fig_scatter.update_layout(height=500, plot_bgcolor='white')
-            st.plotly_chart(fig_scatter, use_container_width=True)
-        
-        # Data table dengan pagination
-        st.markdown(f"### 📋 Product Details ({len(filtered_products)} products)")
-        
-        # Pagination
-        items_per_page = 20
-        total_pages = max(1, len(filtered_products) // items_per_page + (1 if len(filtered_products) % items_per_page > 0 else 0))
-        page_number = st.number_input("Page", min_value=1, max_value=total_pages, value=1)
-        
-        start_idx = (page_number - 1) * items_per_page
-        end_idx = min(start_idx + items_per_page, len(filtered_products))
-        
-        display_product_df = filtered_products.iloc[start_idx:end_idx].copy()
-        display_product_df = display_product_df[[
-            'nama_barang', 'brand', 'cat_norm', 'Revenue Formatted', 
-            'quantity', 'Avg Price'
-        ]]
-        display_product_df.columns = ['Product', 'Brand', 'Category', 'Revenue', 'Quantity', 'Avg Price']
-        
-        st.dataframe(display_product_df, use_container_width=True, height=400)
-        
-        # Pagination info
-        st.caption(f"Showing products {start_idx+1}-{end_idx} of {len(filtered_products)}")
-        
-    else:
-        st.info("No product data available")
-
-with top_tab3:
-    if not transactions_df.empty and 'cat_norm' in transactions_df.columns:
-        # Hitung metrics kategori
-        category_analysis = transactions_df.groupby('cat_norm').agg({
-            'total_value': 'sum',
-            'quantity': 'sum',
-            'nama_barang': 'nunique',
-            'brand': 'nunique'
-        }).reset_index()
-        category_analysis = category_analysis.sort_values('total_value', ascending=False)
-        category_analysis.columns = ['Category', 'Total Revenue', 'Total Quantity', 'Unique Products', 'Unique Brands']
-        
-        # Format dan hitung persentase
-        category_analysis['Revenue Formatted'] = category_analysis['Total Revenue'].apply(format_currency)
-        category_analysis['Revenue %'] = (category_analysis['Total Revenue'] / category_analysis['Total Revenue'].sum() * 100).round(2)
-        category_analysis['Avg Price'] = (category_analysis['Total Revenue'] / category_analysis['Total Quantity']).round(0)
-        
-        # Tampilkan metrics
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            top_category = category_analysis.iloc[0]['Category']
-            top_cat_rev = category_analysis.iloc[0]['Total Revenue']
-            st.metric("🏆 Top Category", top_category, format_currency(top_cat_rev))
-        
-        with col2:
-            category_count = len(category_analysis)
-            st.metric("📂 Total Categories", f"{category_count}")
-        
-        with col3:
-            top_3_cat_share = category_analysis.head(3)['Total Revenue'].sum() / category_analysis['Total Revenue'].sum() * 100
-            st.metric("🎯 Top 3 Categories Share", f"{top_3_cat_share:.1f}%")
-        
-        # Visualisasi
-        col_viz1, col_viz2 = st.columns(2)
-        
-        with col_viz1:
-            # Bar chart kategori
-            fig_cat_bar = px.bar(
-                category_analysis,
-                x='Category',
-                y='Total Revenue',
-                title='Category Revenue Distribution',
-                color='Total Revenue',
-                color_continuous_scale='reds',
-                text='Revenue %'
-            )
-            fig_cat_bar.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
-            fig_cat_bar.update_layout(
-                height=400,
-                xaxis_tickangle=-45,
-                yaxis_title="Revenue",
-                plot_bgcolor='white'
-            )
-            st.plotly_chart(fig_cat_bar, use_container_width=True)
-        
-        with col_viz2:
-            # Treemap kategori
-            fig_treemap = px.treemap(
-                category_analysis,
-                path=['Category'],
-                values='Total Revenue',
-                title='Category Revenue Treemap',
-                color='Total Revenue',
-                color_continuous_scale='Reds',
-                hover_data=['Revenue %', 'Unique Products']
-            )
-            fig_treemap.update_layout(height=400)
-            fig_treemap.update_traces(textinfo="label+value+percent entry")
-            st.plotly_chart(fig_treemap, use_container_width=True)
-        
-        # Detail table
-        st.markdown("### 📋 Category Performance Details")
-        
-        # Sort options
-        sort_by = st.selectbox(
-            "Sort by",
-            options=['Total Revenue', 'Total Quantity', 'Unique Products', 'Avg Price'],
-            key="category_sort"
-        )
-        
-        sorted_categories = category_analysis.sort_values(sort_by, ascending=False)
-        display_cat_df = sorted_categories[[
-            'Category', 'Revenue Formatted', 'Revenue %', 
-            'Total Quantity', 'Unique Products', 'Unique Brands', 'Avg Price'
-        ]]
-        display_cat_df.columns = [
-            'Category', 'Revenue', 'Revenue %', 'Quantity', 
-            'Unique Products', 'Unique Brands', 'Avg Price'
-        ]
-        
-        st.dataframe(display_cat_df, use_container_width=True, height=300)
-        
-        # Kategori vs Brand analysis
-        st.markdown("#### 🔍 Category vs Brand Analysis")
-        if not transactions_df.empty:
-            cat_brand_analysis = transactions_df.groupby(['cat_norm', 'brand']).agg({
-                'total_value': 'sum'
-            }).reset_index()
-            
-            # Pivot table
-            pivot_table = cat_brand_analysis.pivot_table(
-                index='brand',
-                columns='cat_norm',
-                values='total_value',
-                aggfunc='sum',
-                fill_value=0
-            )
-            
-            # Heatmap
-            fig_heatmap = px.imshow(
-                pivot_table,
-                title='Brand Performance Across Categories (Heatmap)',
-                color_continuous_scale='reds',
-                aspect="auto"
-            )
-            fig_heatmap.update_layout(height=400)
-            st.plotly_chart(fig_heatmap, use_container_width=True)
-    else:
-        st.info("No category data available")
+            return fig_scatter
 
-# ==================== FORECASTING SECTION ====================
-st.markdown('<h2 class="modern-header">📈 Revenue Forecasting & Trends</h2>', unsafe_allow_html=True)
+        fig_scatter = cached_figure('top_products_scatter', build_fig_scatter, selected_brand, min_revenue)
+        plotly_chart(fig_scatter, use_container_width=True)
 
-sales_history = data.get('sales_history', pd.DataFrame())
-sales_forecast = data.get('sales_forecast', pd.DataFrame())
+    # Data table dengan pagination
+    st.markdown(f"### 📋 Product Details ({total_filtered} products)")
 
-# Forecast Summary Metrics
-if not sales_forecast.empty:
-    col_f1, col_f2, col_f3 = st.columns(3)
-    
-    with col_f1:
-        avg_forecast = sales_forecast['forecast_revenue'].mean()
-        st.markdown(f"""
-        <div class="metric-card">
-            <div style="font-size: 0.9rem; color: #666666; margin-bottom: 0.5rem;">📅 Avg Monthly Forecast</div>
-            <div style="font-size: 1.5rem; font-weight: 700; color: #111111;">{format_currency(avg_forecast)}</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col_f2:
-        forecast_months = len(sales_forecast)
-        st.markdown(f"""
-        <div class="metric-card">
-            <div style="font-size: 0.9rem; color: #666666; margin-bottom: 0.5rem;">🗓️ Forecast Period</div>
-            <div style="font-size: 1.5rem; font-weight: 700; color: #111111;">{forecast_months} Months</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col_f3:
-        if not sales_history.empty and 'revenue' in sales_history.columns:
-            last_actual = sales_history['revenue'].iloc[-1] if len(sales_history) > 0 else 0
-            first_forecast = sales_forecast['forecast_revenue'].iloc[0]
-            growth_pct = ((first_forecast - last_actual) / last_actual * 100) if last_actual > 0 else 0
-            trend = "▲" if growth_pct > 0 else "▼"
-            color = "#4CAF50" if growth_pct > 0 else "#E30613"
-            
-            st.markdown(f"""
-            <div class="metric-card">
-                <div style="font-size: 0.9rem; color: #666666; margin-bottom: 0.5rem;">📊 Projected Growth</div>
-                <div style="font-size: 1.5rem; font-weight: 700; color: {color};">{trend} {growth_pct:+.1f}%</div>
-            </div>
-            """, unsafe_allow_html=True)
+    # Pagination (server-side: hanya halaman aktif yang diurutkan, diformat dan dikirim)
+    items_per_page = 20
+    total_pages = max(1, -(-total_filtered // items_per_page))
+    page_number = st.number_input("Page", min_value=1, max_value=total_pages, value=1)
 
-# Plot Forecast Chart
-forecast_chart = create_forecast_chart(sales_history, sales_forecast)
-if forecast_chart:
-    st.plotly_chart(forecast_chart, width='stretch')
-else:
-    st.warning("Forecast chart could not be generated. Check data in sidebar.")
-    
-# ===== TIME SERIES DRILL-DOWN ANALYSIS =====
-st.markdown("---")
-st.markdown("#### 🔍 Time Series Drill-Down")
+    display_product_df, _, _ = query_products(
+        product_analysis, brands=brand_filter, min_revenue=min_revenue,
+        page=page_number, page_size=items_per_page
+    )
+    start_idx = (page_number - 1) * items_per_page
+    end_idx = start_idx + len(display_product_df)
 
-if not transactions_df.empty and 'tanggal_order' in transactions_df.columns:
-    # Konversi tanggal
-    transactions_df['tanggal_order'] = pd.to_datetime(transactions_df['tanggal_order'])
-    
-    # Pilih granularity
-    time_granularity = st.radio(
-        "Time Granularity",
-        options=["Daily", "Weekly", "Monthly"],
-        horizontal=True
+    display_product_df['Revenue Formatted'] = format_currency_series(display_product_df['total_value'])
+    display_product_df = display_product_df[[
+        'nama_barang', 'brand', 'cat_norm', 'Revenue Formatted', 
+        'quantity', 'Avg Price'
+    ]]
+    display_product_df.columns = ['Product', 'Brand', 'Category', 'Revenue', 'Quantity', 'Avg Price']
+
+    show_table('product_table', display_product_df, use_container_width=True, height=400)
+
+    # Pagination info
+    st.caption(f"Showing products {start_idx+1}-{end_idx} of {total_filtered}")
+
+
+@st.fragment
+@profiled_fragment(st.session_state, 'category_table')
+def render_category_table(category_analysis):
+    """Tabel detail kategori dengan pilihan urutan"""
+    # Sort options
+    sort_by = st.selectbox(
+        "Sort by",
+        options=['Total Revenue', 'Total Quantity', 'Unique Products', 'Avg Price'],
+        key="category_sort"
     )
-    
-    # Resample berdasarkan granularity
-    if time_granularity == "Daily":
-        transactions_df['time_period'] = transactions_df['tanggal_order'].dt.date
-        freq_label = "Day"
-    elif time_granularity == "Weekly":
-        transactions_df['time_period'] = transactions_df['tanggal_order'].dt.to_period('W').apply(lambda r: r.start_time)
-        freq_label = "Week"
-    else:  # Monthly
-        transactions_df['time_period'] = transactions_df['tanggal_order'].dt.to_period('M').apply(lambda r: r.start_time)
-        freq_label = "Month"
-    
-    # Agregasi data
-    time_series = transactions_df.groupby('time_period').agg({
-        'total_value': 'sum',
-        'quantity': 'sum',
-        'nama_barang': 'nunique'
-    }).reset_index()
-    time_series.columns = ['Period', 'Revenue', 'Quantity', 'Unique Products']
-    time_series = time_series.sort_values('Period')
-    
-    # Moving average
-    time_series['MA_7'] = time_series['Revenue'].rolling(window=min(7, len(time_series)), min_periods=1).mean()
-    
-    # Plot time series dengan dual axis
-    fig_detailed = go.Figure()
-    
-    # Revenue line
-    fig_detailed.add_trace(go.Scatter(
-        x=time_series['Period'],
-        y=time_series['Revenue'],
-        name='Revenue',
-        mode='lines+markers',
-        line=dict(color='#E30613', width=3),
-        yaxis='y'
-    ))
-    
-    # Moving average
-    fig_detailed.add_trace(go.Scatter(
-        x=time_series['Period'],
-        y=time_series['MA_7'],
-        name='7-Period MA',
-        mode='lines',
-        line=dict(color='#FF6B6B', width=2, dash='dash'),
-        yaxis='y'
-    ))
-    
-    # Quantity (secondary axis)
-    fig_detailed.add_trace(go.Bar(
-        x=time_series['Period'],
-        y=time_series['Quantity'],
-        name='Quantity',
-        marker_color='rgba(78, 205, 196, 0.6)',
-        yaxis='y2'
-    ))
-    
-    fig_detailed.update_layout(
-        title=f'{freq_label}ly Revenue & Quantity Trend',
-        height=450,
-        plot_bgcolor='white',
-        xaxis=dict(title=f'{freq_label}'),
-        yaxis=dict(
-            title="Revenue (Rp)",
-            tickformat=',.0f',
-            gridcolor='rgba(0,0,0,0.05)'
-        ),
-        yaxis2=dict(
-            title="Quantity",
-            overlaying='y',
-            side='right',
-            gridcolor='rgba(0,0,0,0)'
-        ),
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1
-        )
-    )
-    
-    st.plotly_chart(fig_detailed, use_container_width=True)
-    
-    # Metrics cards untuk time series
-    col_ts1, col_ts2, col_ts3, col_ts4 = st.columns(4)
-    
-    with col_ts1:
-        peak_revenue = time_series['Revenue'].max()
-        peak_date = time_series.loc[time_series['Revenue'].idxmax(), 'Period']
-        st.metric(
-            "📈 Peak Revenue", 
-            format_currency(peak_revenue),
-            delta=f"On {peak_date.strftime('%d %b')}" if hasattr(peak_date, 'strftime') else ""
-        )
-    
-    with col_ts2:
-        avg_daily_rev = time_series['Revenue'].mean()
-        st.metric(
-            f"💰 Avg/{freq_label}", 
-            format_currency(avg_daily_rev)
-        )
-    
-    with col_ts3:
-        growth_rate = ((time_series['Revenue'].iloc[-1] - time_series['Revenue'].iloc[0]) / 
-                      time_series['Revenue'].iloc[0] * 100) if len(time_series) > 1 and time_series['Revenue'].iloc[0] > 0 else 0
-        st.metric(
-            "📊 Total Growth", 
-            f"{growth_rate:.1f}%"
-        )
-    
-    with col_ts4:
-        avg_quantity = time_series['Quantity'].mean()
-        st.metric(
-            "📦 Avg Quantity", 
-            f"{avg_quantity:.0f}"
-        )
 
-# ==================== PRODUCT PORTFOLIO ANALYSIS ====================
-st.markdown('<h2 class="modern-header">📦 Product Portfolio Analysis</h2>', unsafe_allow_html=True)
+    sorted_categories = category_analysis.sort_values(sort_by, ascending=False)
+    display_cat_df = sorted_categories[[
+        'Category', 'Revenue Formatted', 'Revenue %', 
+        'Total Quantity', 'Unique Products', 'Unique Brands', 'Avg Price'
+    ]]
+    display_cat_df.columns = [
+        'Category', 'Revenue', 'Revenue %', 'Quantity', 
+        'Unique Products', 'Unique Brands', 'Avg Price'
+    ]
 
-# Tabs untuk product classes
-# Tabs untuk product classes - VERSI LEBIH PENDEK
-tab1, tab2, tab3 = st.tabs(["⭐ Class A", "📈 Class B", "🌱 Class C"])
+    show_table('category_table', display_cat_df, use_container_width=True, height=300)
 
-# CLASS A TAB
-with tab1:
-    if not top_products.empty:
-        col_a1, col_a2 = st.columns(2)
-        
-        with col_a1:
-            bar_chart_a = create_product_bar_chart(top_products, "Class A", "#C62828")
-            if bar_chart_a:
-                st.plotly_chart(bar_chart_a, width='stretch')
-        
-        with col_a2:
-            pie_chart_a = create_revenue_pie_chart(top_products, "Class A")
-            if pie_chart_a:
-                st.plotly_chart(pie_chart_a, width='stretch')
-        
-        # Product Table
-        st.markdown("### 📋 Class A Product Details")
-        display_df_a = top_products.copy()
-        
-        # Format columns
-        if 'nama_barang' in display_df_a.columns:
-            display_df_a['Product Name'] = display_df_a['nama_barang']
-        if 'total_value' in display_df_a.columns:
-            display_df_a['Revenue'] = display_df_a['total_value'].apply(format_currency)
-        if 'revenue_pct' in display_df_a.columns:
-            display_df_a['Revenue %'] = display_df_a['revenue_pct'].apply(lambda x: f"{x:.3f}%")
-        
-        display_columns = ['Product Name', 'Revenue', 'Revenue %']
-        if 'ABC_class' in display_df_a.columns:
-            display_columns.append('ABC_class')
-        
-        st.dataframe(display_df_a[display_columns], width='stretch', height=400)
-    else:
-        st.warning("No Class A products data available")
 
-# CLASS B TAB
-with tab2:
-    if not mid_products.empty:
-        col_b1, col_b2 = st.columns(2)
-        
-        with col_b1:
-            bar_chart_b = create_product_bar_chart(mid_products, "Class B", "#FF9800")
-            if bar_chart_b:
-                st.plotly_chart(bar_chart_b, width='stretch')
-        
-        with col_b2:
-            pie_chart_b = create_revenue_pie_chart(mid_products, "Class B")
-            if pie_chart_b:
-                st.plotly_chart(pie_chart_b, width='stretch')
-        
-        st.markdown("### 📋 Class B Product Details")
-        display_df_b = mid_products.copy()
-        
-        if 'nama_barang' in display_df_b.columns:
-            display_df_b['Product Name'] = display_df_b['nama_barang']
-        if 'total_value' in display_df_b.columns:
-            display_df_b['Revenue'] = display_df_b['total_value'].apply(format_currency)
-        if 'revenue_pct' in display_df_b.columns:
-            display_df_b['Revenue %'] = display_df_b['revenue_pct'].apply(lambda x: f"{x:.3f}%")
-        
-        display_columns = ['Product Name', 'Revenue', 'Revenue %']
-        if 'ABC_class' in display_df_b.columns:
-            display_columns.append('ABC_class')
-        
-        st.dataframe(display_df_b[display_columns], width='stretch', height=400)
-    else:
-        st.warning("No Class B products data available")
+@st.fragment
+@profiled_fragment(st.session_state, 'rule_lookup')
+def render_rule_lookup(rule_index):
+    """Rekomendasi rule untuk satu produk atau isi keranjang, lewat index rule"""
+    col_lookup1, col_lookup2 = st.columns([3, 1])
+    with col_lookup1:
+        basket = st.multiselect(
+            "Products in Basket",
+            options=indexed_products(rule_index),
+            key="rule_lookup_basket"
+        )
+    with col_lookup2:
+        rank_by = st.selectbox("Rank by", options=RANK_METRICS, key="rule_lookup_rank")
 
-# CLASS C TAB
-with tab3:
-    if not low_products.empty:
-        col_c1, col_c2 = st.columns(2)
-        
-        with col_c1:
-            bar_chart_c = create_product_bar_chart(low_products, "Class C", "#2E7D32")
-            if bar_chart_c:
-                st.plotly_chart(bar_chart_c, width='stretch')
-        
-        with col_c2:
-            pie_chart_c = create_revenue_pie_chart(low_products, "Class C")
-            if pie_chart_c:
-                st.plotly_chart(pie_chart_c, width='stretch')
-        
-        st.markdown("### 📋 Class C Product Details")
-        display_df_c = low_products.copy()
-        
-        if 'nama_barang' in display_df_c.columns:
-            display_df_c['Product Name'] = display_df_c['nama_barang']
-        if 'total_value' in display_df_c.columns:
-            display_df_c['Revenue'] = display_df_c['total_value'].apply(format_currency)
-        if 'revenue_pct' in display_df_c.columns:
-            display_df_c['Revenue %'] = display_df_c['revenue_pct'].apply(lambda x: f"{x:.3f}%")
-        
-        display_columns = ['Product Name', 'Revenue', 'Revenue %']
-        if 'ABC_class' in display_df_c.columns:
-            display_columns.append('ABC_class')
-        
-        st.dataframe(display_df_c[display_columns], width='stretch', height=400)
+    if not basket:
+        st.caption("Pilih satu produk untuk melihat semua rule yang memuatnya, atau beberapa produk untuk rule yang aktif pada keranjang tersebut.")
+        return
+
+    # Satu produk: semua rule yang memuatnya; beberapa produk: rule dengan antecedent lengkap di keranjang
+    if len(basket) == 1:
+        recommendations = rules_for_product(rule_index, basket[0], by=rank_by, top_n=10)
     else:
-        st.warning("No Class C products data available")
-        
-        
-# ==================== PRODUCT INVENTORY BY BRAND ====================
-st.markdown('<h2 class="modern-header">📋 Product Inventory by Brand</h2>', unsafe_allow_html=True)
-
-if not transactions_df.empty and 'brand' in transactions_df.columns:
-    # Pilih brand untuk analisis detail
-    all_brands = sorted(transactions_df['brand'].dropna().unique())
-    selected_brands = st.multiselect(
-        "Select Brands to Analyze",
-        options=all_brands,
-        default=all_brands[:3] if len(all_brands) >= 3 else all_brands,
-        help="Select brands to view their product portfolio"
+        recommendations = rules_for_basket(rule_index, basket, by=rank_by, top_n=10)
+
+    if recommendations.empty:
+        st.info("📋 No matching rules for this selection")
+        return
+    columns = ['antecedents', 'consequents', 'confidence', 'lift', 'business_score', 'business_strategy', 'execution_priority']
+    if 'role' in recommendations.columns:
+        columns = ['role'] + columns
+    show_table(
+        'rule_lookup_table',
+        recommendations[columns],
+        use_container_width=True,
+        hide_index=True
     )
-    
-    if selected_brands:
-        # Filter data untuk brand yang dipilih
-        filtered_by_brand = transactions_df[transactions_df['brand'].isin(selected_brands)]
-        
-        # Ringkasan metrics - WARNA FONT HITAM SEMUA
-        col_sum1, col_sum2, col_sum3, col_sum4 = st.columns(4)
-        
-        with col_sum1:
-            total_products = filtered_by_brand['nama_barang'].nunique()
-            st.markdown(f"""
-            <div style="background: white; padding: 1rem; border-radius: 10px; border-left: 4px solid #E30613; 
-                        box-shadow: 0 2px 6px rgba(0,0,0,0.05); height: 100%;">
-                <div style="font-size: 0.85rem; color: #111111; margin-bottom: 0.4rem; font-weight: 600;">📦 TOTAL PRODUCTS</div>
-                <div style="font-size: 1.4rem; color: #111111; font-weight: 800;">{total_products:,}</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col_sum2:
-            total_revenue = filtered_by_brand['total_value'].sum()
-            st.markdown(f"""
-            <div style="background: white; padding: 1rem; border-radius: 10px; border-left: 4px solid #E30613; 
-                        box-shadow: 0 2px 6px rgba(0,0,0,0.05); height: 100%;">
-                <div style="font-size: 0.85rem; color: #111111; margin-bottom: 0.4rem; font-weight: 600;">💰 TOTAL REVENUE</div>
-                <div style="font-size: 1.4rem; color: #111111; font-weight: 800;">{format_currency(total_revenue)}</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col_sum3:
-            avg_price = (filtered_by_brand['total_value'].sum() / filtered_by_brand['quantity'].sum()) if filtered_by_brand['quantity'].sum() > 0 else 0
-            st.markdown(f"""
-            <div style="background: white; padding: 1rem; border-radius: 10px; border-left: 4px solid #E30613; 
-                        box-shadow: 0 2px 6px rgba(0,0,0,0.05); height: 100%;">
-                <div style="font-size: 0.85rem; color: #111111; margin-bottom: 0.4rem; font-weight: 600;">🏷️ AVG PRICE</div>
-                <div style="font-size: 1.4rem; color: #111111; font-weight: 800;">{format_currency(avg_price)}</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col_sum4:
-            transactions_count = len(filtered_by_brand)
-            st.markdown(f"""
-            <div style="background: white; padding: 1rem; border-radius: 10px; border-left: 4px solid #E30613; 
-                        box-shadow: 0 2px 6px rgba(0,0,0,0.05); height: 100%;">
-                <div style="font-size: 0.85rem; color: #111111; margin-bottom: 0.4rem; font-weight: 600;">🧾 TRANSACTIONS</div>
-                <div style="font-size: 1.4rem; color: #111111; font-weight: 800;">{transactions_count:,}</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        # Detail produk per brand
-        for brand in selected_brands:
-            brand_data = filtered_by_brand[filtered_by_brand['brand'] == brand]
-            
-            with st.expander(f"📱 **{brand}** - Product Portfolio ({len(brand_data)} transactions)", expanded=(brand == selected_brands[0])):
-                # Brand summary
-                brand_summary = brand_data.groupby('nama_barang').agg({
-                    'total_value': 'sum',
-                    'quantity': 'sum',
-                    'cat_norm': 'first'
-                }).reset_index()
-                brand_summary = brand_summary.sort_values('total_value', ascending=False)
-                
-                col_b1, col_b2 = st.columns(2)
-                
-                with col_b1:
-                    # Top products chart - WARNA FONT HITAM
-                    top_products_brand = brand_summary.head(10).copy()
-                    top_products_brand['Short Name'] = top_products_brand['nama_barang'].apply(
-                        lambda x: (x[:20] + "...") if len(x) > 20 else x
+
+
+# ==================== TOP PERFORMERS ANALYSIS ====================
+def render_top_performers():
+    """Section Top Performers: brand, produk dan kategori teratas"""
+    st.markdown('<h2 class="modern-header">🏆 Top Performers Analysis</h2>', unsafe_allow_html=True)
+
+    # Buat 3 tab untuk Top Brands, Top Products, Top Categories
+    top_tab1, top_tab2, top_tab3 = st.tabs(["🏷️ Top Brands", "📦 Top Products", "📊 Top Categories"])
+
+    with top_tab1:
+        brand_ranking = load_brand_ranking(version, filters, engine)
+        if not brand_ranking.empty:
+            # Hitung metrics brand (sudah diagregasi di kubus)
+            brand_analysis = brand_ranking.copy()
+            brand_analysis.columns = ['Brand', 'Total Revenue', 'Total Quantity', 'Unique Products']
+
+            # Format currency
+            brand_analysis['Revenue Formatted'] = format_currency_series(brand_analysis['Total Revenue'])
+            brand_analysis['Revenue %'] = (brand_analysis['Total Revenue'] / brand_analysis['Total Revenue'].sum() * 100).round(2)
+
+            # Tampilkan metrics
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                top_brand = brand_analysis.iloc[0]['Brand'] if len(brand_analysis) > 0 else "N/A"
+                top_brand_rev = brand_analysis.iloc[0]['Total Revenue'] if len(brand_analysis) > 0 else 0
+                st.metric("👑 Top Brand", top_brand, format_currency(top_brand_rev))
+
+            with col2:
+                avg_rev_per_brand = brand_analysis['Total Revenue'].mean()
+                st.metric("📊 Avg/Brand", format_currency(avg_rev_per_brand))
+
+            with col3:
+                top_3_share = brand_analysis.head(3)['Total Revenue'].sum() / brand_analysis['Total Revenue'].sum() * 100
+                st.metric("🎯 Top 3 Share", f"{top_3_share:.1f}%")
+
+            # Visualisasi
+            col_viz1, col_viz2 = st.columns(2)
+
+            with col_viz1:
+                # Bar chart top 10 brands
+                def build_fig_brands():
+                    top_10_brands = brand_analysis.head(10)
+                    fig_brands = px.bar(
+                        top_10_brands,
+                        x='Brand',
+                        y='Total Revenue',
+                        title='Top 10 Brands by Revenue',
+                        color='Total Revenue',
+                        color_continuous_scale='reds',
+                        text='Revenue Formatted'
+                    )
+                    fig_brands.update_layout(
+                        height=400,
+                        xaxis_tickangle=-45,
+                        yaxis_title="Revenue",
+                        plot_bgcolor='white'
+                    )
+                    return fig_brands
+
+                fig_brands = cached_figure('top_brands_bar', build_fig_brands)
+                plotly_chart(fig_brands, use_container_width=True)
+
+            with col_viz2:
+                # Pie chart brand distribution
+                def build_fig_pie():
+                    fig_pie = px.pie(
+                        brand_analysis.head(8),
+                        values='Total Revenue',
+                        names='Brand',
+                        title='Brand Revenue Distribution',
+                        hole=0.4,
+                        color_discrete_sequence=px.colors.sequential.Reds
                     )
-                    
-                    fig_brand = px.bar(
-                        top_products_brand,
-                        x='Short Name',
-                        y='total_value',
-                        title=f'Top Products - {brand}',
-                        color='total_value',
+                    fig_pie.update_traces(textposition='inside', textinfo='percent+label')
+                    fig_pie.update_layout(height=400)
+                    return fig_pie
+
+                fig_pie = cached_figure('top_brands_pie', build_fig_pie)
+                plotly_chart(fig_pie, use_container_width=True)
+
+            # Data table
+            st.markdown("### 📋 Brand Performance Details")
+            display_brand_df = brand_analysis[['Brand', 'Revenue Formatted', 'Revenue %', 'Total Quantity', 'Unique Products']]
+            show_table('brand_table', display_brand_df, use_container_width=True, height=300)
+        else:
+            st.info("No brand data available")
+
+    with top_tab2:
+        if not cube.empty:
+            # Hitung metrics produk
+            # (Avg Price sudah dihitung; format Rupiah hanya untuk halaman yang tampil)
+            product_analysis = load_product_table(version, filters, engine)
+
+            # Tampilkan metrics
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                top_product = product_analysis.iloc[0]['nama_barang'][:20] + "..." if len(product_analysis.iloc[0]['nama_barang']) > 20 else product_analysis.iloc[0]['nama_barang']
+                top_product_rev = product_analysis.iloc[0]['total_value']
+                st.metric("🥇 Top Product", top_product, format_currency(top_product_rev))
+
+            with col2:
+                total_unique_products = len(product_analysis)
+                st.metric("📦 Unique Products", f"{total_unique_products:,}")
+
+            with col3:
+                avg_rev_per_product = product_analysis['total_value'].mean()
+                st.metric("💰 Avg/Product", format_currency(avg_rev_per_product))
+
+            # Filter, chart dan tabel produk dijalankan sebagai fragment terpisah
+            render_product_explorer(product_analysis)
+
+        else:
+            st.info("No product data available")
+
+    with top_tab3:
+        if not cube.empty:
+            # Hitung metrics kategori
+            category_analysis = load_category_table(version, filters, engine)
+            category_analysis.columns = ['Category', 'Total Revenue', 'Total Quantity', 'Unique Products', 'Unique Brands']
+
+            # Format dan hitung persentase
+            category_analysis['Revenue Formatted'] = format_currency_series(category_analysis['Total Revenue'])
+            category_analysis['Revenue %'] = (category_analysis['Total Revenue'] / category_analysis['Total Revenue'].sum() * 100).round(2)
+            category_analysis['Avg Price'] = (category_analysis['Total Revenue'] / category_analysis['Total Quantity']).round(0)
+
+            # Tampilkan metrics
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                top_category = category_analysis.iloc[0]['Category']
+                top_cat_rev = category_analysis.iloc[0]['Total Revenue']
+                st.metric("🏆 Top Category", top_category, format_currency(top_cat_rev))
+
+            with col2:
+                category_count = len(category_analysis)
+                st.metric("📂 Total Categories", f"{category_count}")
+
+            with col3:
+                top_3_cat_share = category_analysis.head(3)['Total Revenue'].sum() / category_analysis['Total Revenue'].sum() * 100
+                st.metric("🎯 Top 3 Categories Share", f"{top_3_cat_share:.1f}%")
+
+            # Visualisasi
+            col_viz1, col_viz2 = st.columns(2)
+
+            with col_viz1:
+                # Bar chart kategori
+                def build_fig_cat_bar():
+                    fig_cat_bar = px.bar(
+                        category_analysis,
+                        x='Category',
+                        y='Total Revenue',
+                        title='Category Revenue Distribution',
+                        color='Total Revenue',
                         color_continuous_scale='reds',
-                        text='quantity'
+                        text='Revenue %'
                     )
-                    fig_brand.update_layout(
-                        height=350,
+                    fig_cat_bar.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
+                    fig_cat_bar.update_layout(
+                        height=400,
                         xaxis_tickangle=-45,
                         yaxis_title="Revenue",
-                        plot_bgcolor='white',
-                        paper_bgcolor='white',
-                        font=dict(color='#111111', size=12),
-                        title_font=dict(color='#111111', size=16),
-                        xaxis=dict(
-                            tickfont=dict(color='#111111'),
-                            title_font=dict(color='#111111')
-                        ),
-                        yaxis=dict(
-                            tickfont=dict(color='#111111'),
-                            title_font=dict(color='#111111'),
-                            gridcolor='rgba(0,0,0,0.05)'
-                        )
+                        plot_bgcolor='white'
                     )
-                    st.plotly_chart(fig_brand, use_container_width=True)
-                
-                with col_b2:
-                    # Kategori distribution - WARNA FONT HITAM
-                    if 'cat_norm' in brand_data.columns:
-                        cat_dist = brand_data.groupby('cat_norm').agg({
-                            'total_value': 'sum',
-                            'quantity': 'sum'
-                        }).reset_index()
-                        
-                        fig_cat_pie = px.pie(
-                            cat_dist,
-                            values='total_value',
-                            names='cat_norm',
-                            title=f'Category Distribution - {brand}',
-                            hole=0.4,
-                            color_discrete_sequence=px.colors.sequential.Reds
-                        )
-                        fig_cat_pie.update_layout(
-                            height=350,
-                            plot_bgcolor='white',
-                            paper_bgcolor='white',
-                            font=dict(color='#111111', size=12),
-                            title_font=dict(color='#111111', size=16),
-                            legend=dict(font=dict(color='#111111'))
-                        )
-                        fig_cat_pie.update_traces(
-                            textfont=dict(color='#111111', size=10),
-                            textposition='inside'
-                        )
-                        st.plotly_chart(fig_cat_pie, use_container_width=True)
-                
-                # Product details table - WARNA FONT HITAM
-                st.markdown(f"#### Product Details - {brand}")
-                
-                # Format table
-                display_brand_df = brand_summary.copy()
-                display_brand_df['Revenue'] = display_brand_df['total_value'].apply(format_currency)
-                display_brand_df['Avg Price'] = (display_brand_df['total_value'] / display_brand_df['quantity']).round(0)
-                display_brand_df['Avg Price Formatted'] = display_brand_df['Avg Price'].apply(format_currency)
-                
-                display_brand_df = display_brand_df[[
-                    'nama_barang', 'cat_norm', 'quantity', 
-                    'Revenue', 'Avg Price Formatted'
-                ]]
-                display_brand_df.columns = ['Product', 'Category', 'Quantity', 'Revenue', 'Avg Price']
-                
-                # CSS untuk table dengan font hitam
-                st.markdown("""
-                <style>
-                    .inventory-table th {
-                        color: #111111 !important;
-                        font-weight: 700 !important;
-                    }
-                    .inventory-table td {
-                        color: #111111 !important;
-                    }
-                </style>
+                    return fig_cat_bar
+
+                fig_cat_bar = cached_figure('category_bar', build_fig_cat_bar)
+                plotly_chart(fig_cat_bar, use_container_width=True)
+
+            with col_viz2:
+                # Treemap kategori
+                def build_fig_treemap():
+                    fig_treemap = px.treemap(
+                        category_analysis,
+                        path=['Category'],
+                        values='Total Revenue',
+                        title='Category Revenue Treemap',
+                        color='Total Revenue',
+                        color_continuous_scale='Reds',
+                        hover_data=['Revenue %', 'Unique Products']
+                    )
+                    fig_treemap.update_layout(height=400)
+                    fig_treemap.update_traces(textinfo="label+value+percent entry")
+                    return fig_treemap
+
+                fig_treemap = cached_figure('category_treemap', build_fig_treemap)
+                plotly_chart(fig_treemap, use_container_width=True)
+
+            # Detail table
+            st.markdown("### 📋 Category Performance Details")
+
+            # Sort options (fragment: ganti sort tidak menjalankan ulang seluruh section)
+            render_category_table(category_analysis)
+
+            # Kategori vs Brand analysis
+            st.markdown("#### 🔍 Category vs Brand Analysis")
+            if not cube.empty:
+                def build_fig_heatmap():
+                    # Pivot table
+                    pivot_table = load_brand_category_pivot(version, filters, engine)
+
+                    # Heatmap
+                    fig_heatmap = px.imshow(
+                        pivot_table,
+                        title='Brand Performance Across Categories (Heatmap)',
+                        color_continuous_scale='reds',
+                        aspect="auto"
+                    )
+                    fig_heatmap.update_layout(height=400)
+                    return fig_heatmap
+
+                fig_heatmap = cached_figure('brand_category_heatmap', build_fig_heatmap)
+                plotly_chart(fig_heatmap, use_container_width=True)
+        else:
+            st.info("No category data available")
+
+
+# ==================== FORECASTING SECTION ====================
+def render_forecasting():
+    """Section forecasting revenue"""
+    st.markdown('<h2 class="modern-header">📈 Revenue Forecasting & Trends</h2>', unsafe_allow_html=True)
+    if filters:
+        st.caption("ℹ️ Forecasts are fitted on all transactions; global filters apply to the drill-down below.")
+
+    sales_history = data.get('sales_history', pd.DataFrame())
+    sales_forecast = data.get('sales_forecast', pd.DataFrame())
+
+    # Forecast in-process per segmen; file forecast offline hanya dipakai sebagai cadangan
+    segment_forecasts = load_forecasts(version)
+    series_id = 'total'
+    if not segment_forecasts['forecasts'].empty:
+        series_ids = segment_forecasts['forecasts']['series_id'].unique().tolist()
+        series_id = st.selectbox(
+            "Segment",
+            options=series_ids,
+            format_func=lambda sid: 'Total' if sid == 'total' else sid.replace(':', ': ', 1),
+            key="forecast_segment"
+        )
+        sales_history = series_history(segment_forecasts['series'], series_id)
+        sales_forecast = series_forecast(segment_forecasts['forecasts'], series_id)
+        fit_paths = segment_forecasts['fit_paths']
+        if fit_paths:
+            st.caption(f"Models: {fit_paths['reused']} cached · {fit_paths['warm_start']} warm-start · {fit_paths['refit']} refit")
+
+    # Forecast Summary Metrics
+    if not sales_forecast.empty:
+        col_f1, col_f2, col_f3 = st.columns(3)
+
+        with col_f1:
+            avg_forecast = sales_forecast['forecast_revenue'].mean()
+            st.markdown(f"""
+            <div class="metric-card">
+                <div style="font-size: 0.9rem; color: #666666; margin-bottom: 0.5rem;">📅 Avg Monthly Forecast</div>
+                <div style="font-size: 1.5rem; font-weight: 700; color: #111111;">{format_currency(avg_forecast)}</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+        with col_f2:
+            forecast_months = len(sales_forecast)
+            st.markdown(f"""
+            <div class="metric-card">
+                <div style="font-size: 0.9rem; color: #666666; margin-bottom: 0.5rem;">🗓️ Forecast Period</div>
+                <div style="font-size: 1.5rem; font-weight: 700; color: #111111;">{forecast_months} Months</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+        with col_f3:
+            if not sales_history.empty and 'revenue' in sales_history.columns:
+                last_actual = sales_history['revenue'].iloc[-1] if len(sales_history) > 0 else 0
+                first_forecast = sales_forecast['forecast_revenue'].iloc[0]
+                growth_pct = ((first_forecast - last_actual) / last_actual * 100) if last_actual > 0 else 0
+                trend = "▲" if growth_pct > 0 else "▼"
+                color = "#4CAF50" if growth_pct > 0 else "#E30613"
+
+                st.markdown(f"""
+                <div class="metric-card">
+                    <div style="font-size: 0.9rem; color: #666666; margin-bottom: 0.5rem;">📊 Projected Growth</div>
+                    <div style="font-size: 1.5rem; font-weight: 700; color: {color};">{trend} {growth_pct:+.1f}%</div>
+                </div>
                 """, unsafe_allow_html=True)
-                
-                st.dataframe(
-                    display_brand_df, 
-                    use_container_width=True, 
-                    height=250
+
+    # Plot Forecast Chart
+    forecast_chart = cached_figure('forecast', lambda: create_forecast_chart(sales_history, sales_forecast), series_id)
+    if forecast_chart:
+        plotly_chart(forecast_chart, width='stretch')
+    else:
+        st.warning("Forecast chart could not be generated. Check data in sidebar.")
+
+
+# ===== TIME SERIES DRILL-DOWN ANALYSIS =====
+@st.fragment
+@profiled_fragment(st.session_state, 'time_series_drilldown')
+def render_time_series_drilldown():
+    """Section drill-down deret waktu harian sampai tahunan"""
+    st.markdown("---")
+    st.markdown("#### 🔍 Time Series Drill-Down")
+
+    time_series_by_granularity = load_time_series(version, filters, engine)
+    if time_series_by_granularity:
+        # Pilih granularity
+        time_granularity = st.radio(
+            "Time Granularity",
+            options=list(GRANULARITY_UNITS),
+            horizontal=True
+        )
+
+        # Deret semua granularity sudah dihitung sekali, cukup lookup
+        time_series = time_series_by_granularity[time_granularity]
+        freq_label = GRANULARITY_UNITS[time_granularity]
+
+        def build_fig_detailed():
+            # Plot time series dengan dual axis
+            fig_detailed = go.Figure()
+
+            # Revenue line
+            fig_detailed.add_trace(go.Scatter(
+                x=time_series['Period'],
+                y=time_series['Revenue'],
+                name='Revenue',
+                mode='lines+markers',
+                line=dict(color='#E30613', width=3),
+                yaxis='y'
+            ))
+
+            # Moving average
+            fig_detailed.add_trace(go.Scatter(
+                x=time_series['Period'],
+                y=time_series['MA_7'],
+                name='7-Period MA',
+                mode='lines',
+                line=dict(color='#FF6B6B', width=2, dash='dash'),
+                yaxis='y'
+            ))
+
+            # Quantity (secondary axis)
+            fig_detailed.add_trace(go.Bar(
+                x=time_series['Period'],
+                y=time_series['Quantity'],
+                name='Quantity',
+                marker_color='rgba(78, 205, 196, 0.6)',
+                yaxis='y2'
+            ))
+
+            fig_detailed.update_layout(
+                title=f'{time_granularity} Revenue & Quantity Trend',
+                height=450,
+                plot_bgcolor='white',
+                xaxis=dict(title=f'{freq_label}'),
+                yaxis=dict(
+                    title="Revenue (Rp)",
+                    tickformat=',.0f',
+                    gridcolor='rgba(0,0,0,0.05)'
+                ),
+                yaxis2=dict(
+                    title="Quantity",
+                    overlaying='y',
+                    side='right',
+                    gridcolor='rgba(0,0,0,0)'
+                ),
+                legend=dict(
+                    orientation="h",
+                    yanchor="bottom",
+                    y=1.02,
+                    xanchor="right",
+                    x=1
                 )
-else:
-    st.info("No brand data available for inventory analysis")
-        
-# ==================== BUSINESS INTELLIGENCE - ELEGANT DESIGN ====================
-st.markdown('<h2 class="modern-header">🎯 Business Intelligence Dashboard</h2>', unsafe_allow_html=True)
+            )
+            return fig_detailed
 
-# Custom CSS untuk estetika
-st.markdown("""
-<style>
-    .era-card {
-        background: white;
-        border-radius: 12px;
-        padding: 1.2rem;
-        margin-bottom: 1rem;
-        border: 1px solid rgba(227, 6, 19, 0.15);
-        box-shadow: 0 3px 10px rgba(227, 6, 19, 0.05);
-        transition: all 0.2s ease;
-    }
-    .era-card:hover {
-        box-shadow: 0 5px 15px rgba(227, 6, 19, 0.1);
-        transform: translateY(-1px);
-    }
-    .era-pill {
-        background: linear-gradient(135deg, #E30613, #B71C1C);
-        color: white;
-        padding: 4px 12px;
-        border-radius: 20px;
-        font-size: 0.85rem;
-        font-weight: 600;
-        display: inline-block;
-    }
-    .era-badge {
-        background: rgba(227, 6, 19, 0.1);
-        color: #E30613;
-        padding: 2px 8px;
-        border-radius: 10px;
-        font-size: 0.75rem;
-        font-weight: 600;
-    }
-</style>
-""", unsafe_allow_html=True)
+        fig_detailed = cached_figure('drilldown_trend', build_fig_detailed, time_granularity)
+        plotly_chart(fig_detailed, use_container_width=True)
 
-bundles = data.get('bundles', pd.DataFrame())
-cross_sell = data.get('cross_sell', pd.DataFrame())
+        # Metrics cards untuk time series
+        col_ts1, col_ts2, col_ts3, col_ts4 = st.columns(4)
 
-if not bundles.empty or not cross_sell.empty:
-    # ELEGANT HEADER
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        if not bundles.empty:
-            high_conf = len(bundles[bundles['confidence'] > 0.7])
+        with col_ts1:
+            peak_revenue = time_series['Revenue'].max()
+            peak_date = time_series.loc[time_series['Revenue'].idxmax(), 'Period']
             st.metric(
-                label="🔥 Premium Bundles",
-                value=high_conf,
-                delta=f"{(high_conf/len(bundles)*100):.0f}%" if len(bundles) > 0 else None
+                "📈 Peak Revenue", 
+                format_currency(peak_revenue),
+                delta=f"On {peak_date.strftime('%d %b')}" if hasattr(peak_date, 'strftime') else ""
             )
-    
-    with col2:
-        if not cross_sell.empty:
-            avg_conf = cross_sell['confidence'].mean() * 100
+
+        with col_ts2:
+            avg_daily_rev = time_series['Revenue'].mean()
             st.metric(
-                label="📈 Avg Confidence",
-                value=f"{avg_conf:.1f}%"
+                f"💰 Avg/{freq_label}", 
+                format_currency(avg_daily_rev)
             )
-    
-    with col3:
-        if not bundles.empty:
-            top_lift = bundles['lift'].max() if 'lift' in bundles.columns else 0
+
+        with col_ts3:
+            growth_rate = ((time_series['Revenue'].iloc[-1] - time_series['Revenue'].iloc[0]) / 
+                          time_series['Revenue'].iloc[0] * 100) if len(time_series) > 1 and time_series['Revenue'].iloc[0] > 0 else 0
             st.metric(
-                label="🚀 Max Lift",
-                value=f"{top_lift:.1f}x"
+                "📊 Total Growth", 
+                f"{growth_rate:.1f}%"
             )
-    
-    # ELEGANT TABS
-    tab1, tab2 = st.tabs(["✨ **Premium Bundling Strategies**", "🔄 **Cross-Selling Opportunities**"])
-    
-    # ===== BUNDLING TAB =====
+
+        with col_ts4:
+            avg_quantity = time_series['Quantity'].mean()
+            st.metric(
+                "📦 Avg Quantity", 
+                f"{avg_quantity:.0f}"
+            )
+
+
+# ==================== PRODUCT PORTFOLIO ANALYSIS ====================
+def render_product_portfolio():
+    """Section portofolio produk kelas ABC"""
+    st.markdown('<h2 class="modern-header">📦 Product Portfolio Analysis</h2>', unsafe_allow_html=True)
+
+    # Pengaturan kelas ABC: threshold dan scope brand/bulan
+    with st.expander("⚙️ ABC Settings", expanded=False):
+        col_s1, col_s2, col_s3 = st.columns(3)
+        with col_s1:
+            thresholds = st.slider(
+                "Class A / B cutoff (cumulative revenue %)",
+                min_value=50, max_value=99,
+                value=(int(ABC_THRESHOLDS[0]), int(ABC_THRESHOLDS[1])),
+                key="abc_thresholds"
+            )
+        with col_s2:
+            scope_brands = st.multiselect(
+                "Brands (empty = all)",
+                options=load_brand_ranking(version, filters, engine)['brand'].astype(str).tolist(),
+                key="abc_brands"
+            )
+        with col_s3:
+            months = sorted(cube['month_start'].unique()) if not cube.empty else []
+            month_range = None
+            if len(months) > 1:
+                month_range = st.select_slider(
+                    "Months",
+                    options=months,
+                    value=(months[0], months[-1]),
+                    format_func=lambda month: pd.Timestamp(month).strftime('%b %Y'),
+                    key="abc_months"
+                )
+
+    thresholds = tuple(float(value) for value in thresholds)
+    brand_scope = tuple(scope_brands) if scope_brands else None
+    month_scope = None
+    if month_range is not None and (month_range[0] != months[0] or month_range[1] != months[-1]):
+        month_scope = tuple(pd.Timestamp(month) for month in month_range)
+    abc_deps = (thresholds, brand_scope, month_scope)
+    abc_classes = load_abc_classes(version, thresholds, brand_scope, month_scope, filters, engine)
+    top_products = abc_classes['A']
+    mid_products = abc_classes['B']
+    low_products = abc_classes['C']
+
+    # Tabs untuk product classes
+    # Tabs untuk product classes - VERSI LEBIH PENDEK
+    tab1, tab2, tab3 = st.tabs(["⭐ Class A", "📈 Class B", "🌱 Class C"])
+
+    # CLASS A TAB
     with tab1:
-        if not bundles.empty:
-            for idx, row in bundles.head(10).iterrows():
-                # Card container
-                st.markdown('<div class="era-card">', unsafe_allow_html=True)
-                
-                # Header row
-                col_a, col_b = st.columns([3, 1])
-                with col_a:
-                    st.markdown(f"**Strategy #{idx+1}**")
-                with col_b:
-                    conf = float(row.get('confidence', 0)) * 100
-                    lift = float(row.get('lift', 0))
-                    st.markdown(f'<span class="era-pill">{conf:.0f}% • {lift:.1f}x</span>', unsafe_allow_html=True)
-                
-                # Product pair - elegant layout
-                st.markdown("---")
-                col_left, col_plus, col_right = st.columns([5, 1, 5])
-                
-                with col_left:
-                    st.markdown("**Customer Buys**")
-                    antecedents = str(row.get('antecedents', ''))
-                    st.code(antecedents[:40] + ("..." if len(antecedents) > 40 else ""), language="")
-                
-                with col_plus:
-                    st.markdown("<br><h3 style='color:#E30613; text-align:center;'>+</h3>", unsafe_allow_html=True)
-                
-                with col_right:
-                    st.markdown("**Recommend Add**")
-                    consequents = str(row.get('consequents', ''))
-                    st.code(consequents[:40] + ("..." if len(consequents) > 40 else ""), language="")
-                
-                # Footer info
-                st.markdown("---")
-                col_f1, col_f2 = st.columns(2)
-                with col_f1:
-                    strategy = row.get('business_strategy', '')
-                    st.markdown(f"**Strategy:** `{strategy}`")
-                with col_f2:
-                    priority = row.get('execution_priority', '')
-                    st.markdown(f"**Priority:** `{priority}`")
-                
-                st.markdown('</div>', unsafe_allow_html=True)
+        if not top_products.empty:
+            col_a1, col_a2 = st.columns(2)
+
+            with col_a1:
+                bar_chart_a = cached_figure('abc_a_bar', lambda: create_product_bar_chart(top_products, "Class A", "#C62828"), *abc_deps)
+                if bar_chart_a:
+                    plotly_chart(bar_chart_a, width='stretch')
+
+            with col_a2:
+                pie_chart_a = cached_figure('abc_a_pie', lambda: create_revenue_pie_chart(top_products, "Class A"), *abc_deps)
+                if pie_chart_a:
+                    plotly_chart(pie_chart_a, width='stretch')
+
+            # Product Table
+            st.markdown("### 📋 Class A Product Details")
+            display_df_a = top_products.copy()
+
+            # Format columns
+            if 'nama_barang' in display_df_a.columns:
+                display_df_a['Product Name'] = display_df_a['nama_barang']
+            if 'total_value' in display_df_a.columns:
+                display_df_a['Revenue'] = format_currency_series(display_df_a['total_value'])
+            if 'revenue_pct' in display_df_a.columns:
+                display_df_a['Revenue %'] = display_df_a['revenue_pct'].apply(lambda x: f"{x:.3f}%")
+
+            display_columns = ['Product Name', 'Revenue', 'Revenue %']
+            if 'ABC_class' in display_df_a.columns:
+                display_columns.append('ABC_class')
+
+            show_table('abc_a_table', display_df_a[display_columns], width='stretch', height=400)
         else:
-            st.info("📋 No bundling data available")
-    
-    # ===== CROSS-SELL TAB =====
+            st.warning("No Class A products data available")
+
+    # CLASS B TAB
     with tab2:
-        if not cross_sell.empty:
-            for idx, row in cross_sell.head(10).iterrows():
-                # Card container
-                st.markdown('<div class="era-card">', unsafe_allow_html=True)
-                
-                # Header with confidence meter
-                conf = float(row.get('confidence', 0)) * 100
-                score = float(row.get('business_score', 0)) * 100
-                
-                col_h1, col_h2 = st.columns([3, 1])
-                with col_h1:
-                    st.markdown(f"**Opportunity #{idx+1}**")
-                    # Confidence progress bar
-                    st.progress(conf/100)
-                    st.caption(f"Confidence: {conf:.0f}%")
-                
-                with col_h2:
-                    st.metric("Score", f"{score:.0f}", delta=None, label_visibility="collapsed")
-                
-                # Purchase flow
-                st.markdown("---")
-                st.markdown("**Purchase Flow**")
-                
-                flow_col1, flow_arrow, flow_col2 = st.columns([5, 1, 5])
-                
-                with flow_col1:
-                    antecedents = str(row.get('antecedents', ''))
-                    st.markdown(f"*When buying:*\n`{antecedents[:45]}{'...' if len(antecedents) > 45 else ''}`")
-                
-                with flow_arrow:
-                    st.markdown("<h3 style='color:#E30613; text-align:center;'>→</h3>", unsafe_allow_html=True)
-                
-                with flow_col2:
-                    consequents = str(row.get('consequents', ''))
-                    st.markdown(f"*Recommend:*\n`{consequents[:45]}{'...' if len(consequents) > 45 else ''}`")
-                
-                # Metrics footer
-                st.markdown("---")
-                col_m1, col_m2, col_m3 = st.columns(3)
-                
-                with col_m1:
-                    lift = float(row.get('lift', 0))
-                    st.metric("Lift", f"{lift:.1f}x")
-                
-                with col_m2:
-                    support = float(row.get('support', 0))
-                    st.metric("Support", f"{support:.3f}")
-                
-                with col_m3:
-                    strategy = row.get('business_strategy', '')
-                    st.markdown(f'<span class="era-badge">{strategy}</span>', unsafe_allow_html=True)
-                
-                st.markdown('</div>', unsafe_allow_html=True)
+        if not mid_products.empty:
+            col_b1, col_b2 = st.columns(2)
+
+            with col_b1:
+                bar_chart_b = cached_figure('abc_b_bar', lambda: create_product_bar_chart(mid_products, "Class B", "#FF9800"), *abc_deps)
+                if bar_chart_b:
+                    plotly_chart(bar_chart_b, width='stretch')
+
+            with col_b2:
+                pie_chart_b = cached_figure('abc_b_pie', lambda: create_revenue_pie_chart(mid_products, "Class B"), *abc_deps)
+                if pie_chart_b:
+                    plotly_chart(pie_chart_b, width='stretch')
+
+            st.markdown("### 📋 Class B Product Details")
+            display_df_b = mid_products.copy()
+
+            if 'nama_barang' in display_df_b.columns:
+                display_df_b['Product Name'] = display_df_b['nama_barang']
+            if 'total_value' in display_df_b.columns:
+                display_df_b['Revenue'] = format_currency_series(display_df_b['total_value'])
+            if 'revenue_pct' in display_df_b.columns:
+                display_df_b['Revenue %'] = display_df_b['revenue_pct'].apply(lambda x: f"{x:.3f}%")
+
+            display_columns = ['Product Name', 'Revenue', 'Revenue %']
+            if 'ABC_class' in display_df_b.columns:
+                display_columns.append('ABC_class')
+
+            show_table('abc_b_table', display_df_b[display_columns], width='stretch', height=400)
         else:
-            st.info("📋 No cross-selling data available")
+            st.warning("No Class B products data available")
+
+    # CLASS C TAB
+    with tab3:
+        if not low_products.empty:
+            col_c1, col_c2 = st.columns(2)
+
+            with col_c1:
+                bar_chart_c = cached_figure('abc_c_bar', lambda: create_product_bar_chart(low_products, "Class C", "#2E7D32"), *abc_deps)
+                if bar_chart_c:
+                    plotly_chart(bar_chart_c, width='stretch')
+
+            with col_c2:
+                pie_chart_c = cached_figure('abc_c_pie', lambda: create_revenue_pie_chart(low_products, "Class C"), *abc_deps)
+                if pie_chart_c:
+                    plotly_chart(pie_chart_c, width='stretch')
+
+            st.markdown("### 📋 Class C Product Details")
+            display_df_c = low_products.copy()
+
+            if 'nama_barang' in display_df_c.columns:
+                display_df_c['Product Name'] = display_df_c['nama_barang']
+            if 'total_value' in display_df_c.columns:
+                display_df_c['Revenue'] = format_currency_series(display_df_c['total_value'])
+            if 'revenue_pct' in display_df_c.columns:
+                display_df_c['Revenue %'] = display_df_c['revenue_pct'].apply(lambda x: f"{x:.3f}%")
+
+            display_columns = ['Product Name', 'Revenue', 'Revenue %']
+            if 'ABC_class' in display_df_c.columns:
+                display_columns.append('ABC_class')
+
+            show_table('abc_c_table', display_df_c[display_columns], width='stretch', height=400)
+        else:
+            st.warning("No Class C products data available")
+
+
+# ==================== PRODUCT INVENTORY BY BRAND ====================
+@st.fragment
+@profiled_fragment(st.session_state, 'inventory_by_brand')
+def render_inventory_by_brand():
+    """Section inventori produk per brand"""
+    st.markdown('<h2 class="modern-header">📋 Product Inventory by Brand</h2>', unsafe_allow_html=True)
+
+    if not cube.empty:
+        # Pilih brand untuk analisis detail
+        all_brands = sorted(cube['brand'].dropna().unique())
+        selected_brands = st.multiselect(
+            "Select Brands to Analyze",
+            options=all_brands,
+            default=all_brands[:3] if len(all_brands) >= 3 else all_brands,
+            help="Select brands to view their product portfolio"
+        )
+
+        if selected_brands:
+            # Filter kubus untuk brand yang dipilih
+            filtered_by_brand = cube[cube['brand'].isin(selected_brands)]
+
+            # Ringkasan metrics - WARNA FONT HITAM SEMUA
+            col_sum1, col_sum2, col_sum3, col_sum4 = st.columns(4)
+
+            with col_sum1:
+                total_products = filtered_by_brand['nama_barang'].nunique()
+                st.markdown(f"""
+                <div style="background: white; padding: 1rem; border-radius: 10px; border-left: 4px solid #E30613; 
+                            box-shadow: 0 2px 6px rgba(0,0,0,0.05); height: 100%;">
+                    <div style="font-size: 0.85rem; color: #111111; margin-bottom: 0.4rem; font-weight: 600;">📦 TOTAL PRODUCTS</div>
+                    <div style="font-size: 1.4rem; color: #111111; font-weight: 800;">{total_products:,}</div>
+                </div>
+                """, unsafe_allow_html=True)
+
+            with col_sum2:
+                total_revenue = filtered_by_brand['total_value'].sum()
+                st.markdown(f"""
+                <div style="background: white; padding: 1rem; border-radius: 10px; border-left: 4px solid #E30613; 
+                            box-shadow: 0 2px 6px rgba(0,0,0,0.05); height: 100%;">
+                    <div style="font-size: 0.85rem; color: #111111; margin-bottom: 0.4rem; font-weight: 600;">💰 TOTAL REVENUE</div>
+                    <div style="font-size: 1.4rem; color: #111111; font-weight: 800;">{format_currency(total_revenue)}</div>
+                </div>
+                """, unsafe_allow_html=True)
+
+            with col_sum3:
+                avg_price = (filtered_by_brand['total_value'].sum() / filtered_by_brand['quantity'].sum()) if filtered_by_brand['quantity'].sum() > 0 else 0
+                st.markdown(f"""
+                <div style="background: white; padding: 1rem; border-radius: 10px; border-left: 4px solid #E30613; 
+                            box-shadow: 0 2px 6px rgba(0,0,0,0.05); height: 100%;">
+                    <div style="font-size: 0.85rem; color: #111111; margin-bottom: 0.4rem; font-weight: 600;">🏷️ AVG PRICE</div>
+                    <div style="font-size: 1.4rem; color: #111111; font-weight: 800;">{format_currency(avg_price)}</div>
+                </div>
+                """, unsafe_allow_html=True)
+
+            with col_sum4:
+                transactions_count = int(filtered_by_brand['transactions'].sum())
+                st.markdown(f"""
+                <div style="background: white; padding: 1rem; border-radius: 10px; border-left: 4px solid #E30613; 
+                            box-shadow: 0 2px 6px rgba(0,0,0,0.05); height: 100%;">
+                    <div style="font-size: 0.85rem; color: #111111; margin-bottom: 0.4rem; font-weight: 600;">🧾 TRANSACTIONS</div>
+                    <div style="font-size: 1.4rem; color: #111111; font-weight: 800;">{transactions_count:,}</div>
+                </div>
+                """, unsafe_allow_html=True)
+
+            # Detail produk per brand
+            for brand in selected_brands:
+                brand_data = filtered_by_brand[filtered_by_brand['brand'] == brand]
+                brand_tx_count = int(brand_data['transactions'].sum())
+
+                with st.expander(f"📱 **{brand}** - Product Portfolio ({brand_tx_count} transactions)", expanded=(brand == selected_brands[0])):
+                    # Brand summary (10 produk teratas untuk chart)
+                    brand_products, brand_product_count, _ = query_products(
+                        load_product_table(version, filters, engine), brands=[brand], page_size=10
+                    )
 
-else:
-    # Elegant empty state
+                    col_b1, col_b2 = st.columns(2)
+
+                    with col_b1:
+                        # Top products chart - WARNA FONT HITAM
+                        def build_fig_brand():
+                            top_products_brand = brand_products.head(10).copy()
+                            top_products_brand['Short Name'] = top_products_brand['nama_barang'].apply(
+                                lambda x: (x[:20] + "...") if len(x) > 20 else x
+                            )
+
+                            fig_brand = px.bar(
+                                top_products_brand,
+                                x='Short Name',
+                                y='total_value',
+                                title=f'Top Products - {brand}',
+                                color='total_value',
+                                color_continuous_scale='reds',
+                                text='quantity'
+                            )
+                            fig_brand.update_layout(
+                                height=350,
+                                xaxis_tickangle=-45,
+                                yaxis_title="Revenue",
+                                plot_bgcolor='white',
+                                paper_bgcolor='white',
+                                font=dict(color='#111111', size=12),
+                                title_font=dict(color='#111111', size=16),
+                                xaxis=dict(
+                                    tickfont=dict(color='#111111'),
+                                    title_font=dict(color='#111111')
+                                ),
+                                yaxis=dict(
+                                    tickfont=dict(color='#111111'),
+                                    title_font=dict(color='#111111'),
+                                    gridcolor='rgba(0,0,0,0.05)'
+                                )
+                            )
+                            return fig_brand
+
+                        fig_brand = cached_figure('inventory_brand_bar', build_fig_brand, brand)
+                        plotly_chart(fig_brand, use_container_width=True)
+
+                    with col_b2:
+                        # Kategori distribution - WARNA FONT HITAM
+                        if 'cat_norm' in brand_data.columns:
+                            def build_fig_cat_pie():
+                                cat_dist = category_summary(brand_data)[['cat_norm', 'total_value', 'quantity']]
+
+                                fig_cat_pie = px.pie(
+                                    cat_dist,
+                                    values='total_value',
+                                    names='cat_norm',
+                                    title=f'Category Distribution - {brand}',
+                                    hole=0.4,
+                                    color_discrete_sequence=px.colors.sequential.Reds
+                                )
+                                fig_cat_pie.update_layout(
+                                    height=350,
+                                    plot_bgcolor='white',
+                                    paper_bgcolor='white',
+                                    font=dict(color='#111111', size=12),
+                                    title_font=dict(color='#111111', size=16),
+                                    legend=dict(font=dict(color='#111111'))
+                                )
+                                fig_cat_pie.update_traces(
+                                    textfont=dict(color='#111111', size=10),
+                                    textposition='inside'
+                                )
+                                return fig_cat_pie
+
+                            fig_cat_pie = cached_figure('inventory_brand_pie', build_fig_cat_pie, brand)
+                            plotly_chart(fig_cat_pie, use_container_width=True)
+
+                    # Product details table - WARNA FONT HITAM
+                    st.markdown(f"#### Product Details - {brand}")
+
+                    # Format table - hanya halaman aktif yang diformat dan dikirim ke browser
+                    brand_pages = max(1, -(-brand_product_count // 20))
+                    brand_page = 1
+                    if brand_pages > 1:
+                        brand_page = st.number_input(
+                            f"Page ({brand_product_count} products)",
+                            min_value=1,
+                            max_value=brand_pages,
+                            value=1,
+                            key=f"inventory_page_{brand}"
+                        )
+                    display_brand_df, _, _ = query_products(
+                        load_product_table(version, filters, engine), brands=[brand], page=brand_page, page_size=20
+                    )
+                    display_brand_df['Revenue'] = format_currency_series(display_brand_df['total_value'])
+                    display_brand_df['Avg Price Formatted'] = format_currency_series(display_brand_df['Avg Price'])
+
+                    display_brand_df = display_brand_df[[
+                        'nama_barang', 'cat_norm', 'quantity', 
+                        'Revenue', 'Avg Price Formatted'
+                    ]]
+                    display_brand_df.columns = ['Product', 'Category', 'Quantity', 'Revenue', 'Avg Price']
+
+                    # CSS untuk table dengan font hitam
+                    st.markdown("""
+                    <style>
+                        .inventory-table th {
+                            color: #111111 !important;
+                            font-weight: 700 !important;
+                        }
+                        .inventory-table td {
+                            color: #111111 !important;
+                        }
+                    </style>
+                    """, unsafe_allow_html=True)
+
+                    show_table(
+                        'inventory_brand_table',
+                        display_brand_df, 
+                        use_container_width=True, 
+                        height=250
+                    )
+    else:
+        st.info("No brand data available for inventory analysis")
+
+
+# ==================== BUSINESS INTELLIGENCE - ELEGANT DESIGN ====================
+def render_business_intelligence():
+    """Section Business Intelligence: bundling dan cross-selling"""
+    st.markdown('<h2 class="modern-header">🎯 Business Intelligence Dashboard</h2>', unsafe_allow_html=True)
+    if filters:
+        st.caption("ℹ️ Association rules are mined from all baskets; global filters are not applied here.")
+
+    # Custom CSS untuk estetika
     st.markdown("""
-    <div style="text-align: center; padding: 3rem; background: linear-gradient(135deg, #fef2f2 0%, #ffffff 100%); 
-                border-radius: 16px; border: 2px solid #fecaca; margin: 2rem 0;">
-        <div style="font-size: 3rem; color: #E30613; margin-bottom: 1rem;">📊</div>
-        <h3 style="color: #7f1d1d; margin-bottom: 0.5rem;">Business Intelligence Dashboard</h3>
-        <p style="color: #991b1b;">No association rules data available for analysis.</p>
-    </div>
+    <style>
+        .era-card {
+            background: white;
+            border-radius: 12px;
+            padding: 1.2rem;
+            margin-bottom: 1rem;
+            border: 1px solid rgba(227, 6, 19, 0.15);
+            box-shadow: 0 3px 10px rgba(227, 6, 19, 0.05);
+            transition: all 0.2s ease;
+        }
+        .era-card:hover {
+            box-shadow: 0 5px 15px rgba(227, 6, 19, 0.1);
+            transform: translateY(-1px);
+        }
+        .era-pill {
+            background: linear-gradient(135deg, #E30613, #B71C1C);
+            color: white;
+            padding: 4px 12px;
+            border-radius: 20px;
+            font-size: 0.85rem;
+            font-weight: 600;
+            display: inline-block;
+        }
+        .era-badge {
+            background: rgba(227, 6, 19, 0.1);
+            color: #E30613;
+            padding: 2px 8px;
+            border-radius: 10px;
+            font-size: 0.75rem;
+            font-weight: 600;
+        }
+    </style>
     """, unsafe_allow_html=True)
 
-st.caption("Showing top 10 recommendations by confidence score • EraPhone BI")
+    # Rule redundan (cermin, parent lebih kuat, itemset tidak closed) sudah dipangkas
+    decision_rules = load_decision_rules(version, engine)
+    bundles = decision_rules['bundles']
+    cross_sell = decision_rules['cross_sell']
+
+    if not bundles.empty or not cross_sell.empty:
+        # ELEGANT HEADER
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            if not bundles.empty:
+                high_conf = len(bundles[bundles['confidence'] > 0.7])
+                st.metric(
+                    label="🔥 Premium Bundles",
+                    value=high_conf,
+                    delta=f"{(high_conf/len(bundles)*100):.0f}%" if len(bundles) > 0 else None
+                )
+
+        with col2:
+            if not cross_sell.empty:
+                avg_conf = cross_sell['confidence'].mean() * 100
+                st.metric(
+                    label="📈 Avg Confidence",
+                    value=f"{avg_conf:.1f}%"
+                )
+
+        with col3:
+            if not bundles.empty:
+                top_lift = bundles['lift'].max() if 'lift' in bundles.columns else 0
+                st.metric(
+                    label="🚀 Max Lift",
+                    value=f"{top_lift:.1f}x"
+                )
+
+        # ELEGANT TABS
+        tab1, tab2, tab3 = st.tabs(["✨ **Premium Bundling Strategies**", "🔄 **Cross-Selling Opportunities**", "🔎 **Product Lookup**"])
+
+        # ===== BUNDLING TAB =====
+        with tab1:
+            if not bundles.empty:
+                for idx, row in bundles.head(10).iterrows():
+                    # Card container
+                    st.markdown('<div class="era-card">', unsafe_allow_html=True)
+
+                    # Header row
+                    col_a, col_b = st.columns([3, 1])
+                    with col_a:
+                        st.markdown(f"**Strategy #{idx+1}**")
+                    with col_b:
+                        conf = float(row.get('confidence', 0)) * 100
+                        lift = float(row.get('lift', 0))
+                        st.markdown(f'<span class="era-pill">{conf:.0f}% • {lift:.1f}x</span>', unsafe_allow_html=True)
+
+                    # Product pair - elegant layout
+                    st.markdown("---")
+                    col_left, col_plus, col_right = st.columns([5, 1, 5])
+
+                    with col_left:
+                        st.markdown("**Customer Buys**")
+                        antecedents = str(row.get('antecedents', ''))
+                        st.code(antecedents[:40] + ("..." if len(antecedents) > 40 else ""), language="")
+
+                    with col_plus:
+                        st.markdown("<br><h3 style='color:#E30613; text-align:center;'>+</h3>", unsafe_allow_html=True)
+
+                    with col_right:
+                        st.markdown("**Recommend Add**")
+                        consequents = str(row.get('consequents', ''))
+                        st.code(consequents[:40] + ("..." if len(consequents) > 40 else ""), language="")
+
+                    # Footer info
+                    st.markdown("---")
+                    col_f1, col_f2 = st.columns(2)
+                    with col_f1:
+                        strategy = row.get('business_strategy', '')
+                        st.markdown(f"**Strategy:** `{strategy}`")
+                    with col_f2:
+                        priority = row.get('execution_priority', '')
+                        st.markdown(f"**Priority:** `{priority}`")
+
+                    st.markdown('</div>', unsafe_allow_html=True)
+            else:
+                st.info("📋 No bundling data available")
+
+        # ===== CROSS-SELL TAB =====
+        with tab2:
+            if not cross_sell.empty:
+                for idx, row in cross_sell.head(10).iterrows():
+                    # Card container
+                    st.markdown('<div class="era-card">', unsafe_allow_html=True)
+
+                    # Header with confidence meter
+                    conf = float(row.get('confidence', 0)) * 100
+                    score = float(row.get('business_score', 0)) * 100
+
+                    col_h1, col_h2 = st.columns([3, 1])
+                    with col_h1:
+                        st.markdown(f"**Opportunity #{idx+1}**")
+                        # Confidence progress bar
+                        st.progress(conf/100)
+                        st.caption(f"Confidence: {conf:.0f}%")
+
+                    with col_h2:
+                        st.metric("Score", f"{score:.0f}", delta=None, label_visibility="collapsed")
+
+                    # Purchase flow
+                    st.markdown("---")
+                    st.markdown("**Purchase Flow**")
+
+                    flow_col1, flow_arrow, flow_col2 = st.columns([5, 1, 5])
+
+                    with flow_col1:
+                        antecedents = str(row.get('antecedents', ''))
+                        st.markdown(f"*When buying:*\n`{antecedents[:45]}{'...' if len(antecedents) > 45 else ''}`")
+
+                    with flow_arrow:
+                        st.markdown("<h3 style='color:#E30613; text-align:center;'>→</h3>", unsafe_allow_html=True)
+
+                    with flow_col2:
+                        consequents = str(row.get('consequents', ''))
+                        st.markdown(f"*Recommend:*\n`{consequents[:45]}{'...' if len(consequents) > 45 else ''}`")
+
+                    # Metrics footer
+                    st.markdown("---")
+                    col_m1, col_m2, col_m3 = st.columns(3)
+
+                    with col_m1:
+                        lift = float(row.get('lift', 0))
+                        st.metric("Lift", f"{lift:.1f}x")
+
+                    with col_m2:
+                        support = float(row.get('support', 0))
+                        st.metric("Support", f"{support:.3f}")
+
+                    with col_m3:
+                        strategy = row.get('business_strategy', '')
+                        st.markdown(f'<span class="era-badge">{strategy}</span>', unsafe_allow_html=True)
+
+                    st.markdown('</div>', unsafe_allow_html=True)
+            else:
+                st.info("📋 No cross-selling data available")
+
+        # ===== PRODUCT LOOKUP TAB =====
+        with tab3:
+            rule_index = load_rule_index(version, engine)
+            if rule_index is not None:
+                render_rule_lookup(rule_index)
+            else:
+                st.info("📋 No rule data available")
+
+    else:
+        # Elegant empty state
+        st.markdown("""
+        <div style="text-align: center; padding: 3rem; background: linear-gradient(135deg, #fef2f2 0%, #ffffff 100%); 
+                    border-radius: 16px; border: 2px solid #fecaca; margin: 2rem 0;">
+            <div style="font-size: 3rem; color: #E30613; margin-bottom: 1rem;">📊</div>
+            <h3 style="color: #7f1d1d; margin-bottom: 0.5rem;">Business Intelligence Dashboard</h3>
+            <p style="color: #991b1b;">No association rules data available for analysis.</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.caption("Showing top 10 recommendations by confidence score • EraPhone BI")
+
+
+
+# ==================== NAVIGASI SECTION ====================
+# Hanya section yang dipilih yang dijalankan; section lain tidak menghitung
+# agregasi maupun membangun chart sama sekali
+SECTIONS = {
+    "📊 Executive Summary": render_executive_summary,
+    "🏆 Top Performers": render_top_performers,
+    "📈 Forecasting": render_forecasting,
+    "🔍 Drill-Down": render_time_series_drilldown,
+    "📦 ABC Portfolio": render_product_portfolio,
+    "📋 Inventory by Brand": render_inventory_by_brand,
+    "🎯 Business Intelligence": render_business_intelligence
+}
+
+active_section = st.radio(
+    "Section",
+    options=list(SECTIONS.keys()),
+    horizontal=True,
+    key="active_section",
+    label_visibility="collapsed"
+)
+with timed(st.session_state, active_section, 'section', rows=len(cube)):
+    SECTIONS[active_section]()
+
+# ==================== FIGURE CACHE STATUS ====================
+with st.sidebar.expander("⚡ Figure Cache", expanded=False):
+    fig_stats = cache_stats(st.session_state)
+    st.metric("Hit Rate", f"{fig_stats['hit_rate'] * 100:.1f}%")
+    st.caption(f"{fig_stats['hits']} hits • {fig_stats['misses']} misses • {fig_stats['entries']} cached figures")
+    if fig_stats['by_chart']:
+        chart_stats = pd.DataFrame([
+            {'chart': name, 'hits': v['hits'], 'misses': v['misses']}
+            for name, v in fig_stats['by_chart'].items()
+        ])
+        st.dataframe(chart_stats, use_container_width=True, hide_index=True)
+
+# ==================== PERFORMANCE (ADMIN) ====================
+profile_run = finish_run(st.session_state)
+with perf_panel:
+    with st.expander("⏱️ Performance", expanded=False):
+        st.metric("Last rerun", f"{profile_run['total_ms']:.0f} ms")
+        st.checkbox(
+            "Measure payload bytes",
+            key="profile_payload",
+            help="Serialisasi ulang chart dan tabel untuk mengukur ukurannya (menambah waktu render)"
+        )
+        st.checkbox(
+            "SQL engine (DuckDB)",
+            value=sql_backend.duckdb is not None and is_large('transactions'),
+            key="sql_engine",
+            disabled=sql_backend.duckdb is None,
+            help="Agregasi section dijalankan sebagai query DuckDB di atas .cache/dashboard.duckdb" if sql_backend.duckdb is not None
+            else "duckdb tidak terpasang; agregasi memakai kubus pandas"
+        )
+        st.caption(f"Query engine: {engine}")
+        profile = summarize(st.session_state)
+        if not profile.empty:
+            st.caption("Δ% dibandingkan median rerun sebelumnya untuk event yang sama")
+            st.dataframe(profile.round(1), use_container_width=True, hide_index=True)
+        st.download_button(
+            "⬇️ Export JSON lines",
+            data=export_jsonl(st.session_state),
+            file_name="dashboard_profile.jsonl",
+            mime="application/x-ndjson"
+        )
 
 
 st.markdown("""
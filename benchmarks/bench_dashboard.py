@@ -0,0 +1,153 @@
+"""Benchmark headless jalur komputasi setiap section dashboard pada data sintetis
+
+Transaksi sintetis berkolom sama dengan df_analysis.csv (synthetic_data.py)
+dibuat pada 10k, 100k, 1M dan 10M baris. Untuk setiap ukuran dilaporkan waktu dan memori
+puncak (tracemalloc) per tahap: kubus, agregasi brand/produk/kategori,
+bucket drill-down, split ABC, forecast + chart, dan rule card.
+
+Dengan --render, section juga dijalankan ujung ke ujung lewat AppTest Streamlit
+di direktori sementara berisi data sintetis (hanya untuk ukuran <= --render-max,
+karena app membaca CSV). Jalankan dari root repo:
+    python benchmarks/bench_dashboard.py
+    python benchmarks/bench_dashboard.py --rows 10000 100000 --render --output scaling.csv
+"""
+import argparse
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from abc_analysis import classify_products, product_revenue, split_classes  # noqa: E402
+from aggregates import (  # noqa: E402
+    brand_category_pivot, brand_summary, build_cube, build_time_series, category_summary, product_table
+)
+from charts import create_forecast_chart  # noqa: E402
+from data_loader import FILE_MAPPING, load_dataset  # noqa: E402
+from forecasting import forecast_segments, segment_series, series_forecast, series_history  # noqa: E402
+from rule_index import build_rule_index, indexed_products, rules_for_product  # noqa: E402
+from rule_mining import split_decisions  # noqa: E402
+from rule_pruning import prune_rules  # noqa: E402
+from synthetic_data import SEED, build_catalog, generate_transactions  # noqa: E402
+
+ROWS = [10_000, 100_000, 1_000_000, 10_000_000]
+RENDER_MAX_ROWS = 100_000
+
+
+# ==================== TAHAP KOMPUTASI ====================
+def measure(results, n_rows, stage, fn):
+    """Jalankan fn, catat waktu dan memori puncak tahap, kembalikan hasilnya"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    results.append({'rows': n_rows, 'stage': stage, 'time_s': elapsed, 'peak_mb': peak / 1024 ** 2})
+    return value
+
+
+def rule_cards(rules, top_n=10):
+    """Jalur data rule card section Business Intelligence: pruning, split, index dan lookup per produk
+
+    Rule dibaca dari decision_*.csv, jadi ukurannya tidak ikut jumlah transaksi.
+    """
+    decisions = split_decisions(prune_rules(rules))
+    index = build_rule_index(pd.concat([decisions['bundles'], decisions['cross_sell']], ignore_index=True))
+    cards = [rules_for_product(index, product, top_n=top_n) for product in indexed_products(index)]
+    return decisions, cards
+
+
+def run_stages(transactions, rules, results):
+    """Semua tahap komputasi section untuk satu frame transaksi"""
+    n_rows = len(transactions)
+    cube = measure(results, n_rows, 'cube', lambda: build_cube(transactions))
+    measure(results, n_rows, 'brand', lambda: brand_summary(cube))
+    measure(results, n_rows, 'product', lambda: product_table(cube))
+    measure(results, n_rows, 'category', lambda: (category_summary(cube), brand_category_pivot(cube)))
+    measure(results, n_rows, 'drilldown', lambda: build_time_series(transactions))
+    measure(results, n_rows, 'abc', lambda: split_classes(classify_products(product_revenue(cube))))
+
+    last_date = transactions['tanggal_order'].max()
+    forecasts = measure(results, n_rows, 'forecast', lambda: forecast_segments(cube, last_date))
+    measure(results, n_rows, 'forecast_chart', lambda: create_forecast_chart(
+        series_history(segment_series(cube, last_date)[0], 'total'), series_forecast(forecasts, 'total')
+    ))
+    if not rules.empty:
+        measure(results, n_rows, 'rule_cards', lambda: rule_cards(rules))
+
+
+# ==================== RENDER SECTION (APPTEST) ====================
+def render_sections(transactions, results):
+    """Jalankan setiap section app.py lewat AppTest di atas salinan data dengan transaksi sintetis"""
+    from streamlit.testing.v1 import AppTest
+
+    logging.getLogger('streamlit').setLevel(logging.ERROR)  # peringatan deprecation app tidak relevan di sini
+    n_rows = len(transactions)
+    workdir = tempfile.mkdtemp(prefix='bench_dashboard_')
+    cwd = os.getcwd()
+    try:
+        for key, filename in FILE_MAPPING.items():
+            if key != 'transactions' and os.path.exists(os.path.join(ROOT, filename)):
+                shutil.copy(os.path.join(ROOT, filename), workdir)
+        transactions.to_csv(os.path.join(workdir, FILE_MAPPING['transactions']), index=False)
+        os.chdir(workdir)
+
+        at = AppTest.from_file(os.path.join(ROOT, 'app.py'), default_timeout=600)
+        measure(results, n_rows, 'render:first_run', at.run)
+        for section in at.radio(key='active_section').options:
+            at.radio(key='active_section').set_value(section)
+            measure(results, n_rows, f'render:{section}', at.run)
+            if at.exception:
+                print(f"✗ Failed: {section} - {at.exception[0].value[:80]}")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark headless komputasi section dashboard")
+    parser.add_argument('--rows', type=int, nargs='+', default=ROWS, help="Ukuran data sintetis")
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--render', action='store_true', help="Jalankan juga section lewat AppTest")
+    parser.add_argument('--render-max', type=int, default=RENDER_MAX_ROWS, help="Ukuran terbesar untuk --render")
+    parser.add_argument('--output', help="Simpan hasil (rows, stage, time_s, peak_mb) ke CSV")
+    args = parser.parse_args()
+
+    catalog = build_catalog(seed=args.seed)
+    rules = pd.concat([load_dataset('bundles'), load_dataset('cross_sell')], ignore_index=True)
+    print(f"Katalog {len(catalog['products']):,} produk, {len(rules):,} rule, {os.cpu_count()} CPU")
+
+    results = []
+    for n_rows in args.rows:
+        transactions = measure(results, n_rows, 'generate', lambda: pd.concat(
+            generate_transactions(n_rows, seed=args.seed, catalog=catalog), ignore_index=True
+        ))
+        run_stages(transactions, rules, results)
+        if args.render and n_rows <= args.render_max:
+            render_sections(transactions, results)
+
+        print(f"\n{n_rows:,} baris ({transactions.memory_usage(deep=True).sum() / 1024 ** 2:,.0f} MB)")
+        print(f"{'stage':>36} {'time (s)':>10} {'peak MB':>10}")
+        for row in (row for row in results if row['rows'] == n_rows):
+            print(f"{row['stage']:>36} {row['time_s']:>10.4f} {row['peak_mb']:>10.1f}")
+        del transactions
+
+    results = pd.DataFrame(results)
+    scaling = results.pivot(index='stage', columns='rows', values='time_s')
+    print("\nWaktu (s) per tahap vs jumlah baris:")
+    print(scaling.reindex(index=results['stage'].unique(), columns=args.rows).to_string(float_format=lambda value: f"{value:.4f}"))
+    if args.output:
+        results.to_csv(args.output, index=False)
+        print(f"✓ Saved: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+"""Backtest rolling-origin forecast revenue bulanan: akurasi vs biaya komputasi
+
+Setiap origin t memakai bulan [0, t) sebagai data latih dan bulan [t, t + horizon)
+sebagai data uji. Untuk tiap model kandidat dilaporkan MAPE, RMSE, coverage
+interval 95%, waktu total dan memori puncak (tracemalloc), lalu dipilih model
+termurah yang memenuhi target akurasi. Jalankan dari root repo:
+    python benchmarks/bench_forecast_backtest.py
+    python benchmarks/bench_forecast_backtest.py --scope all --target-mape 0.2
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aggregates import build_cube  # noqa: E402
+from data_loader import load_dataset  # noqa: E402
+from forecasting import HORIZON, Z_95, fit_exponential_smoothing, forecast_from_fit, segment_series  # noqa: E402
+
+try:
+    from statsmodels.tsa.arima.model import ARIMA
+except ImportError:  # statsmodels opsional, tanpa itu kandidat ARIMA dilewati
+    ARIMA = None
+
+MIN_TRAIN = 3
+MA_WINDOW = 3
+ARIMA_ORDER = (1, 1, 0)
+
+
+# ==================== MODEL KANDIDAT ====================
+# Semua model menerima train (n_series x t) dan horizon, mengembalikan
+# (mean, lower, upper) berukuran n_series x horizon.
+def naive_forecast(train, horizon):
+    """Nilai bulan terakhir, interval melebar dengan akar horizon (random walk)"""
+    sigma = np.sqrt(np.nanmean(np.diff(train, axis=1) ** 2, axis=1)) if train.shape[1] > 1 else np.zeros(len(train))
+    mean = np.repeat(train[:, -1:], horizon, axis=1)
+    spread = Z_95 * sigma[:, None] * np.sqrt(np.arange(1, horizon + 1))
+    return mean, np.maximum(mean - spread, 0), mean + spread
+
+
+def moving_average_forecast(train, horizon, window=MA_WINDOW):
+    """Rata-rata window bulan terakhir (seperti kolom ma_3), interval dari error in-sample"""
+    mean = np.repeat(train[:, -window:].mean(axis=1, keepdims=True), horizon, axis=1)
+    errors = [train[:, t] - train[:, max(t - window, 0):t].mean(axis=1) for t in range(1, train.shape[1])]
+    sigma = np.sqrt(np.mean(np.square(errors), axis=0)) if errors else np.zeros(len(train))
+    spread = Z_95 * sigma[:, None]
+    return mean, np.maximum(mean - spread, 0), mean + spread
+
+
+def ets_forecast(train, horizon):
+    """Exponential smoothing dari forecasting.py (grid vektor, pilih AIC)"""
+    return forecast_from_fit(fit_exponential_smoothing(train), np.arange(1, horizon + 1))
+
+
+def arima_forecast(train, horizon, order=ARIMA_ORDER):
+    """ARIMA statsmodels per deret; deret yang gagal di-fit menghasilkan NaN"""
+    mean = np.full((len(train), horizon), np.nan)
+    lower, upper = mean.copy(), mean.copy()
+    for row, values in enumerate(train):
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                result = ARIMA(values, order=order).fit().get_forecast(horizon)
+            mean[row] = result.predicted_mean
+            lower[row], upper[row] = result.conf_int(alpha=0.05).T
+        except Exception:
+            continue
+    return np.maximum(mean, 0), np.maximum(lower, 0), upper
+
+
+CANDIDATES = {
+    'naive': naive_forecast,
+    'ma_3': moving_average_forecast,
+    'ets': ets_forecast,
+    'arima': arima_forecast
+}
+
+
+# ==================== BACKTEST ====================
+def rolling_origin(values, model, horizon=HORIZON, min_train=MIN_TRAIN):
+    """Kumpulkan (actual, mean, lower, upper) dari semua origin dan horizon yang tersedia"""
+    actual, mean, lower, upper = [], [], [], []
+    n_obs = values.shape[1]
+    for origin in range(min_train, n_obs):
+        steps = min(horizon, n_obs - origin)
+        m, lo, hi = model(values[:, :origin], steps)
+        actual.append(values[:, origin:origin + steps].ravel())
+        mean.append(m[:, :steps].ravel())
+        lower.append(lo[:, :steps].ravel())
+        upper.append(hi[:, :steps].ravel())
+    return tuple(np.concatenate(parts) for parts in (actual, mean, lower, upper))
+
+
+def score(actual, mean, lower, upper):
+    """MAPE (tanpa bulan ber-revenue 0), RMSE dan coverage interval 95%"""
+    valid = ~np.isnan(mean)
+    actual, mean, lower, upper = actual[valid], mean[valid], lower[valid], upper[valid]
+    nonzero = actual != 0
+    return {
+        'forecasts': int(valid.sum()),
+        'failed': int((~valid).sum()),
+        'mape': float(np.mean(np.abs(actual[nonzero] - mean[nonzero]) / np.abs(actual[nonzero]))) if nonzero.any() else np.nan,
+        'rmse': float(np.sqrt(np.mean((actual - mean) ** 2))) if len(actual) else np.nan,
+        'coverage': float(np.mean((actual >= lower) & (actual <= upper))) if len(actual) else np.nan
+    }
+
+
+def backtest(values, models, horizon=HORIZON, min_train=MIN_TRAIN):
+    """Jalankan backtest untuk setiap model, ukur waktu dan memori puncak"""
+    rows = []
+    for name, model in models.items():
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = rolling_origin(values, model, horizon, min_train)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rows.append({'model': name, **score(*result), 'time_s': elapsed, 'peak_mb': peak / 1024 ** 2})
+    return pd.DataFrame(rows)
+
+
+def cheapest_model(results, target_mape, min_coverage=0.0):
+    """Model tercepat yang memenuhi target MAPE dan coverage, None jika tidak ada"""
+    passing = results[(results['mape'] <= target_mape) & (results['coverage'] >= min_coverage)]
+    if passing.empty:
+        return None
+    return passing.sort_values(['time_s', 'mape']).iloc[0]['model']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest rolling-origin model forecast revenue bulanan")
+    parser.add_argument('--scope', choices=['total', 'segments', 'all'], default='total',
+                        help="Deret yang diuji: total, brand+cat_norm, atau semuanya")
+    parser.add_argument('--horizon', type=int, default=HORIZON)
+    parser.add_argument('--min-train', type=int, default=MIN_TRAIN, help="Jumlah bulan latih minimum")
+    parser.add_argument('--target-mape', type=float, default=0.15)
+    parser.add_argument('--min-coverage', type=float, default=0.0, help="Coverage interval 95%% minimum")
+    args = parser.parse_args()
+
+    transactions = load_dataset('transactions')
+    series, complete = segment_series(build_cube(transactions), transactions['tanggal_order'].max())
+    # Bulan terakhir yang belum lengkap tidak dipakai sebagai data uji
+    series = series if complete else series.iloc[:, :-1]
+    if args.scope == 'total':
+        series = series.loc[['total']]
+    elif args.scope == 'segments':
+        series = series.drop(index='total')
+
+    models = dict(CANDIDATES)
+    if ARIMA is None:
+        models.pop('arima')
+        print("- arima dilewati: statsmodels tidak terpasang")
+
+    values = series.to_numpy(dtype='float64')
+    print(f"{len(series)} deret x {values.shape[1]} bulan, origin {args.min_train}..{values.shape[1] - 1}, horizon {args.horizon}")
+    results = backtest(values, models, args.horizon, args.min_train)
+
+    print(f"{'model':>8} {'n':>6} {'MAPE':>8} {'RMSE':>16} {'coverage':>9} {'time (s)':>9} {'peak MB':>8}")
+    for row in results.itertuples():
+        print(f"{row.model:>8} {row.forecasts:>6} {row.mape:>7.1%} {row.rmse:>16,.0f} {row.coverage:>8.1%} "
+              f"{row.time_s:>9.4f} {row.peak_mb:>8.2f}")
+
+    best = cheapest_model(results, args.target_mape, args.min_coverage)
+    if best is None:
+        print(f"✗ Tidak ada model dengan MAPE <= {args.target_mape:.0%} dan coverage >= {args.min_coverage:.0%}")
+    else:
+        print(f"✓ Model termurah yang memenuhi target: {best}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""Micro-benchmark format_currency (per baris via .apply) vs format_currency_series
+
+Jalankan dari root repo:
+    python benchmarks/bench_format_currency.py
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from formatting import format_currency, format_currency_series  # noqa: E402
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+REPEAT = 3
+
+
+def sample_values(n, seed=42):
+    """Nilai Rupiah acak yang mencakup semua satuan (Rp, K, Jt, M) dan NaN"""
+    rng = np.random.default_rng(seed)
+    values = rng.lognormal(mean=14, sigma=3, size=n).round()
+    values[rng.random(n) < 0.01] = np.nan
+    return pd.Series(values)
+
+
+def best_time(fn):
+    """Waktu terbaik dari beberapa pengulangan (detik)"""
+    return min(timeit.repeat(fn, number=1, repeat=REPEAT))
+
+
+def main():
+    print(f"{'rows':>10} {'apply (s)':>12} {'vector (s)':>12} {'speedup':>9}  identical")
+    for n in SIZES:
+        values = sample_values(n)
+        scalar = values.apply(format_currency)
+        vector = format_currency_series(values)
+        identical = scalar.tolist() == vector.tolist()
+
+        t_scalar = best_time(lambda: values.apply(format_currency))
+        t_vector = best_time(lambda: format_currency_series(values))
+        print(f"{n:>10,} {t_scalar:>12.4f} {t_vector:>12.4f} {t_scalar / t_vector:>8.1f}x  {identical}")
+
+
+if __name__ == '__main__':
+    main()
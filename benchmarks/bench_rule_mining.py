@@ -0,0 +1,59 @@
+"""Scaling benchmark mining itemset: serial vs partisi paralel (1, 2, 4, 8 worker)
+
+Keranjang sintetis (popularitas item mengikuti distribusi Zipf) supaya ukuran
+bisa dinaikkan melebihi df_analysis.csv. Jalankan dari root repo:
+    python benchmarks/bench_rule_mining.py
+    python benchmarks/bench_rule_mining.py --baskets 500000 --items 20000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rule_mining import basket_matrix, frequent_itemsets, parallel_frequent_itemsets  # noqa: E402
+
+WORKERS = [1, 2, 4, 8]
+
+
+def sample_baskets(n_baskets, n_items, avg_size=4, seed=42):
+    """Transaksi sintetis: n_baskets keranjang, item populer muncul jauh lebih sering"""
+    rng = np.random.default_rng(seed)
+    sizes = rng.poisson(avg_size - 1, n_baskets) + 1
+    baskets = np.repeat(np.arange(n_baskets), sizes)
+    items = (rng.zipf(1.3, len(baskets)) - 1) % n_items
+    return pd.DataFrame({'tanggal_order': baskets, 'nama_barang': pd.Categorical(items)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling benchmark mining itemset paralel")
+    parser.add_argument('--baskets', type=int, default=200_000)
+    parser.add_argument('--items', type=int, default=5_000)
+    parser.add_argument('--min-support', type=float, default=0.0005)
+    parser.add_argument('--max-len', type=int, default=5)
+    args = parser.parse_args()
+
+    indptr, indices, items = basket_matrix(sample_baskets(args.baskets, args.items))
+    min_count = max(1, int(np.ceil(args.min_support * args.baskets)))
+    print(f"{args.baskets:,} keranjang, {len(items):,} item, min_count={min_count}, {os.cpu_count()} CPU")
+
+    start = time.perf_counter()
+    serial = frequent_itemsets(indptr, indices, len(items), min_count, args.max_len)
+    t_serial = time.perf_counter() - start
+    print(f"{'mode':>10} {'time (s)':>10} {'speedup':>9} {'itemsets':>10}  identical")
+    print(f"{'serial':>10} {t_serial:>10.3f} {1.0:>8.2f}x {len(serial):>10,}  True")
+
+    for workers in WORKERS:
+        start = time.perf_counter()
+        result = parallel_frequent_itemsets(indptr, indices, len(items), min_count, args.max_len, workers=workers)
+        elapsed = time.perf_counter() - start
+        identical = list(result.items()) == list(serial.items())
+        print(f"{f'{workers} worker':>10} {elapsed:>10.3f} {t_serial / elapsed:>8.2f}x {len(result):>10,}  {identical}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,275 @@
+"""Builder chart Plotly dashboard EraPhone (tanpa Streamlit, bisa dipakai headless)
+
+Error saat menggambar satu bagian chart dicatat ke log (print), chart tetap dikembalikan.
+"""
+import pandas as pd
+import plotly.graph_objects as go
+
+from formatting import format_currency_series
+
+
+def create_product_bar_chart(products_df, title, color):
+    """Membuat bar chart untuk produk"""
+    if products_df.empty or len(products_df) == 0:
+        return None
+    
+    # Ambil top 10 produk
+    top_products = products_df.head(10).copy()
+    
+    # Buat nama pendek untuk label
+    top_products['short_name'] = top_products['nama_barang'].apply(
+        lambda x: (x[:20] + "...") if len(x) > 20 else x
+    )
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        x=top_products['short_name'],
+        y=top_products['total_value'],
+        name='Revenue',
+        marker_color=color,
+        text=format_currency_series(top_products['total_value']),
+        textposition='outside',
+        hovertemplate='<b>%{x}</b><br>Revenue: Rp %{y:,.0f}<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        title=f'🏆 {title} - Top 10 Products',
+        height=500,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(color='#111111', size=12),
+        xaxis=dict(
+            tickangle=45,
+            tickfont=dict(color='#333333'),
+            title_font=dict(color='#333333')
+        ),
+        yaxis=dict(
+            title="Revenue (Rp)",
+            tickformat=',.0f',
+            tickfont=dict(color='#333333'),
+            title_font=dict(color='#333333'),
+            gridcolor='rgba(0,0,0,0.05)'
+        ),
+        margin=dict(t=50, b=100, l=80, r=40)
+    )
+    
+    return fig
+
+
+def create_revenue_pie_chart(products_df, title):
+    """Membuat pie chart yang lebih compact untuk dashboard"""
+    if products_df.empty or len(products_df) == 0:
+        return None
+    
+    # Ambil maksimal 5 item untuk readability
+    if len(products_df) > 5:
+        display_df = products_df.head(4).copy()
+        other_revenue = products_df.iloc[4:]['total_value'].sum()
+        other_row = pd.DataFrame({
+            'nama_barang': ['Other'],
+            'total_value': [other_revenue],
+            'revenue_pct': [100 - display_df['revenue_pct'].sum() if 'revenue_pct' in display_df.columns else 0]
+        })
+        display_df = pd.concat([display_df, other_row], ignore_index=True)
+    else:
+        display_df = products_df.copy()
+    
+    # Buat label sangat pendek
+    display_df['short_name'] = display_df['nama_barang'].apply(
+        lambda x: x[:10] + "..." if len(x) > 10 else x
+    )
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Pie(
+        labels=display_df['short_name'],
+        values=display_df['total_value'],
+        textinfo='percent',  # HANYA PERSENTASE di chart
+        textposition='inside',
+        textfont=dict(color='white', size=9, family='Arial'),
+        hovertemplate='<b>%{full_label}</b><br>Revenue: Rp %{value:,.0f}<br>Share: %{percent}<extra></extra>',
+        marker=dict(colors=['#E30613', '#FF6B6B', '#FF9800', '#4CAF50', '#2196F3'][:len(display_df)]),
+        hole=0.5,  # DONUT CHART - lebih hemat space
+        rotation=90
+    ))
+    
+    # Custom data untuk hover
+    full_labels = display_df['nama_barang'].tolist()
+    for i, trace in enumerate(fig.data):
+        trace.customdata = [[full_labels[i]] for i in range(len(full_labels))]
+        trace.hovertemplate = '<b>%{customdata[0]}</b><br>Revenue: Rp %{value:,.0f}<br>Share: %{percent}<extra></extra>'
+    
+    fig.update_layout(
+        title={
+            'text': f'{title} Revenue',
+            'font': {'size': 14, 'color': '#111111', 'family': 'Arial'},
+            'y': 0.95
+        },
+        height=350,  # LEBIH PENDEK! (dari 500)
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(color='#111111', size=9, family='Arial'),
+        margin=dict(t=40, b=10, l=10, r=10),  # MARGIN SANGAT KECIL
+        showlegend=True,
+        legend=dict(
+            font=dict(color='#333333', size=8),
+            orientation="v",
+            yanchor="middle",
+            y=0.5,
+            xanchor="left",
+            x=1.05,  # LEGEND DI LUAR
+            bgcolor='rgba(255,255,255,0.8)',
+            bordercolor='#CCCCCC',
+            borderwidth=1
+        ),
+        uniformtext=dict(
+            minsize=8,
+            mode='hide'
+        )
+    )
+    
+    return fig
+
+
+def create_forecast_chart(history_df, forecast_df):
+    """Membuat chart forecasting yang sudah DIPERBAIKI"""
+    
+    fig = go.Figure()
+    
+    # ===== 1. PLOT HISTORY DATA =====
+    if not history_df.empty and 'revenue' in history_df.columns:
+        try:
+            # Cari kolom tanggal yang benar
+            date_col_history = None
+            for col in ['date', 'tanggal_order', 'tanggal', 'ds']:
+                if col in history_df.columns:
+                    date_col_history = col
+                    break
+            
+            if date_col_history:
+                # Konversi tanggal
+                history_df[date_col_history] = pd.to_datetime(history_df[date_col_history])
+                history_df = history_df.sort_values(date_col_history)
+                
+                # Plot garis history
+                fig.add_trace(go.Scatter(
+                    x=history_df[date_col_history],
+                    y=history_df['revenue'],
+                    name='Actual Revenue',
+                    mode='lines+markers',
+                    line=dict(color='#E30613', width=4),
+                    marker=dict(size=8, color='#E30613'),
+                    hovertemplate='<b>%{x|%b %Y}</b><br>Actual: Rp %{y:,.0f}<extra></extra>'
+                ))
+                
+                # Plot moving average jika ada
+                if 'ma_3' in history_df.columns:
+                    ma_data = history_df[~history_df['ma_3'].isna()]
+                    if not ma_data.empty:
+                        fig.add_trace(go.Scatter(
+                            x=ma_data[date_col_history],
+                            y=ma_data['ma_3'],
+                            name='3-Month MA',
+                            mode='lines',
+                            line=dict(color='#FF6B6B', width=2.5, dash='dot'),
+                            opacity=0.8
+                        ))
+                        
+        except Exception as e:
+            print(f"✗ Failed: history plot - {str(e)[:50]}")
+    
+    # ===== 2. PLOT FORECAST DATA =====
+    if not forecast_df.empty and 'forecast_revenue' in forecast_df.columns:
+        try:
+            # Cari kolom tanggal yang benar
+            date_col_forecast = None
+            for col in ['date', 'tanggal', 'ds']:
+                if col in forecast_df.columns:
+                    date_col_forecast = col
+                    break
+            
+            if date_col_forecast:
+                # Konversi tanggal
+                forecast_df[date_col_forecast] = pd.to_datetime(forecast_df[date_col_forecast])
+                forecast_df = forecast_df.sort_values(date_col_forecast)
+                
+                # Plot confidence interval jika ada
+                if 'lower_ci' in forecast_df.columns and 'upper_ci' in forecast_df.columns:
+                    # Buat area confidence interval
+                    x_ci = pd.concat([forecast_df[date_col_forecast], forecast_df[date_col_forecast][::-1]])
+                    y_ci = pd.concat([forecast_df['upper_ci'], forecast_df['lower_ci'][::-1]])
+                    
+                    fig.add_trace(go.Scatter(
+                        x=x_ci,
+                        y=y_ci,
+                        fill='toself',
+                        fillcolor='rgba(78, 205, 196, 0.2)',
+                        line=dict(color='rgba(255,255,255,0)'),
+                        name='95% Confidence Interval',
+                        hoverinfo='skip',
+                        showlegend=True
+                    ))
+                
+                # Plot garis forecast
+                fig.add_trace(go.Scatter(
+                    x=forecast_df[date_col_forecast],
+                    y=forecast_df['forecast_revenue'],
+                    name='Revenue Forecast',
+                    mode='lines+markers',
+                    line=dict(color='#4ECDC4', width=4, dash='dash'),
+                    marker=dict(
+                        size=10, 
+                        color='#4ECDC4', 
+                        symbol='diamond',
+                        line=dict(width=1, color='white')
+                    ),
+                    hovertemplate='<b>%{x|%b %Y}</b><br>Forecast: Rp %{y:,.0f}<extra></extra>'
+                ))
+                
+        except Exception as e:
+            print(f"✗ Failed: forecast plot - {str(e)[:50]}")
+    
+    # ===== 3. KONFIGURASI GRAFIK =====
+    fig.update_layout(
+        title={
+            'text': '📈 Revenue Trend Analysis & Forecast',
+            'font': {'size': 24, 'color': '#111111', 'family': 'Arial, sans-serif'},
+            'y': 0.95
+        },
+        height=550,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(color='#333333', size=12, family='Segoe UI, Arial'),
+        xaxis=dict(
+            title='',
+            tickfont=dict(color='#555555', size=11),
+            gridcolor='rgba(0,0,0,0.07)',
+            showgrid=True,
+            tickformat='%b %Y',
+            tickangle=0
+        ),
+        yaxis=dict(
+            title='Revenue (Rupiah)',
+            tickformat=',.0f',
+            tickfont=dict(color='#555555', size=11),
+            title_font=dict(color='#555555', size=13),
+            gridcolor='rgba(0,0,0,0.07)',
+            zerolinecolor='rgba(0,0,0,0.1)'
+        ),
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1,
+            font=dict(color='#333333', size=11),
+            bgcolor='rgba(255,255,255,0.9)',
+            bordercolor='rgba(0,0,0,0.1)',
+            borderwidth=1
+        ),
+        hovermode='x unified',
+        margin=dict(t=80, b=80, l=80, r=40)
+    )
+    
+    return fig
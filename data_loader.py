@@ -0,0 +1,694 @@
+"""Loader data dashboard EraPhone dengan skema kolom yang dideklarasikan"""
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from functools import reduce
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow opsional, tanpa itu loader kembali ke CSV
+    pa = ds = feather = None
+
+# ==================== MAPPING FILE ====================
+FILE_MAPPING = {
+    'transactions': 'df_analysis.csv',
+    'top_products': 'produk_kelas_A.csv',
+    'mid_products': 'produk_kelas_B.csv',
+    'low_products': 'produk_kelas_C.csv',
+    'bundles': 'decision_bundling.csv',
+    'cross_sell': 'decision_cross_selling.csv',
+    'priority_actions': 'decision_priority_actions.csv',
+    'sales_history': 'time_series_revenue_actual.csv',
+    'sales_forecast': 'time_series_revenue_forecast.csv'
+}
+
+# ==================== SKEMA DATASET ====================
+# Jenis kolom:
+#   category -> dimensi berulang (brand, produk, kategori) disimpan sebagai kode integer
+#   date     -> diparse saat baca CSV
+#   bool     -> flag True/False
+#   str      -> teks bebas (itemset aturan asosiasi), dibiarkan apa adanya
+#   money    -> nilai Rupiah, tetap int64 supaya sum/cumsum tidak overflow
+#   int8/int16/int32/float32/float64 -> tipe numerik hasil downcast
+_PRODUCT_CLASS_SCHEMA = {
+    'nama_barang': 'category',
+    'total_value': 'money',
+    'revenue_pct': 'float64',
+    'cum_revenue_pct': 'float64',
+    'ABC_class': 'category'
+}
+
+_RULES_SCHEMA = {
+    'antecedents': 'str',
+    'consequents': 'str',
+    'support': 'float32',
+    'confidence': 'float32',
+    'lift': 'float32',
+    'business_score': 'float32',
+    'business_strategy': 'category',
+    'execution_priority': 'category'
+}
+
+DATASET_SCHEMAS = {
+    'transactions': {
+        'tanggal_order': 'date',
+        'brand': 'category',
+        'nama_barang': 'category',
+        'quantity': 'int32',
+        'price': 'money',
+        'cat': 'category',
+        'total_value': 'money',
+        'year': 'int16',
+        'month': 'int8',
+        'is_return': 'bool',
+        'is_shopping_bag': 'bool',
+        'cat_norm': 'category',
+        'transaction_type': 'category'
+    },
+    'top_products': _PRODUCT_CLASS_SCHEMA,
+    'mid_products': _PRODUCT_CLASS_SCHEMA,
+    'low_products': _PRODUCT_CLASS_SCHEMA,
+    'bundles': _RULES_SCHEMA,
+    'cross_sell': _RULES_SCHEMA,
+    'priority_actions': _RULES_SCHEMA,
+    'sales_history': {
+        'tanggal_order': 'date',
+        'revenue': 'money',
+        'ma_3': 'float64'
+    },
+    'sales_forecast': {
+        'tanggal': 'date',
+        'forecast_revenue': 'money',
+        'lower_ci': 'float64',
+        'upper_ci': 'float64'
+    }
+}
+
+_NUMERIC_KINDS = {'int8', 'int16', 'int32', 'float32', 'float64', 'money'}
+_BOOL_VALUES = {'true': True, 'false': False, '1': True, '0': False}
+
+
+def _coerce_numeric(series, kind):
+    """Konversi kolom numerik ke tipe yang dideklarasikan"""
+    numeric = pd.to_numeric(series, errors='coerce')
+    if kind == 'money':
+        # Nilai uang tidak di-downcast: int64 jika bulat, selain itu float64
+        if numeric.isna().any() or not (numeric % 1 == 0).all():
+            return numeric.astype('float64')
+        return numeric.astype('int64')
+    if kind.startswith('int') and numeric.isna().any():
+        # Integer dengan nilai kosong tidak bisa disimpan sebagai int biasa
+        return numeric.astype('float32')
+    return numeric.astype(kind)
+
+
+def _coerce_bool(series):
+    """Konversi flag True/False (termasuk teks) ke bool"""
+    if series.dtype == bool:
+        return series
+    mapped = series.astype(str).str.strip().str.lower().map(_BOOL_VALUES)
+    return mapped.fillna(False).astype(bool)
+
+
+def apply_schema(df, schema):
+    """Terapkan skema ke DataFrame yang sudah terbaca"""
+    for col, kind in schema.items():
+        if col not in df.columns:
+            continue
+        if kind == 'category':
+            df[col] = df[col].astype('category')
+        elif kind == 'date':
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+        elif kind == 'bool':
+            df[col] = _coerce_bool(df[col])
+        elif kind in _NUMERIC_KINDS:
+            df[col] = _coerce_numeric(df[col], kind)
+    return df
+
+
+def _read_options(schema, filename):
+    """Opsi read_csv: kolom dimensi langsung dibaca sebagai category, tanggal diparse saat load"""
+    header = pd.read_csv(filename, nrows=0).columns
+    return {
+        'dtype': {col: 'category' for col, kind in schema.items() if kind == 'category' and col in header},
+        'parse_dates': [col for col, kind in schema.items() if kind == 'date' and col in header]
+    }
+
+
+def read_dataset(key, filename=None):
+    """Baca satu dataset dari CSV sesuai skema yang dideklarasikan"""
+    filename = filename or FILE_MAPPING[key]
+    schema = DATASET_SCHEMAS.get(key, {})
+    df = pd.read_csv(filename, **_read_options(schema, filename))
+    return apply_schema(df, schema)
+
+
+# ==================== BACA PER CHUNK (OUT-OF-CORE) ====================
+# File transaksi di atas OUT_OF_CORE_BYTES tidak dibaca utuh; dashboard memakai
+# agregat yang dilipat per chunk (lihat aggregates.aggregate_chunks).
+OUT_OF_CORE_BYTES = 512 * 1024 ** 2
+CHUNK_ROWS = 1_000_000
+
+
+def is_large(key, filename=None, limit=OUT_OF_CORE_BYTES):
+    """Cek apakah file sumber terlalu besar untuk dibaca utuh ke memori"""
+    try:
+        return os.path.getsize(filename or FILE_MAPPING[key]) > limit
+    except OSError:
+        return False
+
+
+def iter_dataset(key, filename=None, chunk_rows=CHUNK_ROWS):
+    """Baca dataset per chunk berisi maksimal chunk_rows baris, masing-masing sudah sesuai skema
+
+    Kategori tiap chunk hanya berisi nilai yang muncul di chunk itu.
+    """
+    filename = filename or FILE_MAPPING[key]
+    schema = DATASET_SCHEMAS.get(key, {})
+    with pd.read_csv(filename, chunksize=chunk_rows, **_read_options(schema, filename)) as reader:
+        for chunk in reader:
+            yield apply_schema(chunk.reset_index(drop=True), schema)
+
+
+def memory_footprint(df):
+    """Hitung pemakaian memori DataFrame (MB, termasuk isi string)"""
+    if df is None or df.empty:
+        return 0.0
+    return df.memory_usage(deep=True).sum() / (1024 ** 2)
+
+
+def memory_report(data):
+    """Ringkasan baris, kolom dan memori untuk setiap dataset"""
+    rows = []
+    for key, df in data.items():
+        rows.append({
+            'dataset': key,
+            'file': FILE_MAPPING.get(key, ''),
+            'rows': len(df),
+            'columns': len(df.columns),
+            'memory_mb': round(memory_footprint(df), 3)
+        })
+    return pd.DataFrame(rows)
+
+
+# ==================== CACHE KOLOMNAR (FEATHER) ====================
+# Setiap CSV dikonversi sekali ke file Feather (Arrow IPC) tanpa kompresi,
+# sehingga load berikutnya tidak perlu parse CSV dan konversi tipe lagi. Isinya
+# tetap disalin utuh ke DataFrame pandas (tidak ada penghematan memori resident
+# dibanding CSV); yang dihemat adalah waktu parsing. Cache dianggap
+# valid selama mtime, ukuran dan hash CSV sumber (plus skemanya) tidak berubah.
+# Baris yang di-append (ingestion.py) disimpan sebagai fragment Feather terpisah
+# dan hash-nya dicatat per segmen byte, jadi append tidak menulis ulang cache
+# atau meng-hash ulang seluruh CSV.
+CACHE_DIR = '.cache'
+_HASH_CHUNK_SIZE = 8 * 1024 * 1024
+MAX_CACHE_FRAGMENTS = 16
+
+
+def file_hash(filename, start=0, size=None):
+    """Hitung SHA-256 dari isi file (atau size byte mulai dari start) secara bertahap"""
+    digest = hashlib.sha256()
+    remaining = size
+    with open(filename, 'rb') as f:
+        f.seek(start)
+        while remaining is None or remaining > 0:
+            chunk = f.read(_HASH_CHUNK_SIZE if remaining is None else min(_HASH_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            digest.update(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+    return digest.hexdigest()
+
+
+def _segments_match(filename, segments):
+    """Cek isi file terhadap hash per segmen byte yang tercatat di manifest"""
+    start = 0
+    for segment in segments:
+        if file_hash(filename, start, segment['size']) != segment['sha256']:
+            return False
+        start += segment['size']
+    return True
+
+
+def _schema_hash(key):
+    """Hash skema supaya perubahan skema ikut membatalkan cache"""
+    schema = json.dumps(DATASET_SCHEMAS.get(key, {}), sort_keys=True)
+    return hashlib.sha256(schema.encode('utf-8')).hexdigest()[:16]
+
+
+def _cache_paths(key, cache_dir):
+    """Path file Feather dan manifest untuk satu dataset"""
+    return (
+        os.path.join(cache_dir, f'{key}.feather'),
+        os.path.join(cache_dir, f'{key}.json')
+    )
+
+
+def _read_manifest(path):
+    """Baca manifest cache, None jika tidak ada atau rusak"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_atomic(path, write_fn):
+    """Tulis file lewat file sementara lalu rename, supaya tidak setengah jadi"""
+    tmp_path = f'{path}.tmp'
+    write_fn(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _dump_json(obj, path):
+    """Tulis dict ke file JSON"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, indent=2)
+
+
+def cache_is_valid(key, filename=None, cache_dir=CACHE_DIR):
+    """Cek apakah cache Feather masih sesuai dengan CSV sumber"""
+    filename = filename or FILE_MAPPING[key]
+    feather_path, manifest_path = _cache_paths(key, cache_dir)
+    manifest = _read_manifest(manifest_path)
+    if manifest is None or not os.path.exists(feather_path):
+        return False
+
+    stat = os.stat(filename)
+    if manifest.get('schema') != _schema_hash(key) or manifest.get('size') != stat.st_size:
+        return False
+    if manifest.get('mtime_ns') == stat.st_mtime_ns:
+        return True
+
+    # mtime berubah tapi ukuran sama (mis. file di-copy ulang): cek isinya
+    if not manifest.get('segments') or not _segments_match(filename, manifest['segments']):
+        return False
+    manifest['mtime_ns'] = stat.st_mtime_ns
+    _write_atomic(manifest_path, lambda p: _dump_json(manifest, p))
+    return True
+
+
+def write_cache(key, df, filename=None, cache_dir=CACHE_DIR):
+    """Simpan DataFrame ke cache Feather beserta manifest sumbernya"""
+    filename = filename or FILE_MAPPING[key]
+    os.makedirs(cache_dir, exist_ok=True)
+    feather_path, manifest_path = _cache_paths(key, cache_dir)
+    stat = os.stat(filename)
+    previous = _read_manifest(manifest_path)
+
+    _write_atomic(
+        feather_path,
+        lambda p: feather.write_feather(df.reset_index(drop=True), p, compression='uncompressed')
+    )
+    manifest = {
+        'source': filename,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'segments': [{'size': stat.st_size, 'sha256': file_hash(filename)}],
+        'fragments': [],
+        'schema': _schema_hash(key),
+        'rows': len(df)
+    }
+    _write_atomic(manifest_path, lambda p: _dump_json(manifest, p))
+    _remove_fragments(previous, cache_dir)
+
+
+def append_cache(key, batch, appended_from, filename=None, cache_dir=CACHE_DIR):
+    """Tambahkan batch ke cache Feather sebagai fragment baru, tanpa menulis ulang file lama
+
+    appended_from adalah ukuran CSV sumber sebelum batch ditambahkan; hanya byte
+    sesudahnya yang di-hash. Returns False jika cache tidak sesuai versi file lama
+    (cache lalu dibangun ulang saat load berikutnya).
+    """
+    filename = filename or FILE_MAPPING[key]
+    _, manifest_path = _cache_paths(key, cache_dir)
+    manifest = _read_manifest(manifest_path)
+    if feather is None or manifest is None or manifest.get('size') != appended_from or not manifest.get('segments'):
+        return False
+
+    fragment = f'{key}-{uuid.uuid4().hex[:12]}.feather'
+    _write_atomic(
+        os.path.join(cache_dir, fragment),
+        lambda p: feather.write_feather(batch.reset_index(drop=True), p, compression='uncompressed')
+    )
+    stat = os.stat(filename)
+    appended = stat.st_size - appended_from
+    manifest.update({
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'segments': manifest['segments'] + [{'size': appended, 'sha256': file_hash(filename, appended_from, appended)}],
+        'fragments': manifest.get('fragments', []) + [fragment],
+        'rows': manifest.get('rows', 0) + len(batch)
+    })
+    _write_atomic(manifest_path, lambda p: _dump_json(manifest, p))
+    return True
+
+
+def _remove_fragments(manifest, cache_dir, keep=()):
+    """Hapus file fragment yang tercatat di manifest lama"""
+    for fragment in (manifest or {}).get('fragments', []):
+        if fragment not in keep:
+            try:
+                os.remove(os.path.join(cache_dir, fragment))
+            except OSError:
+                pass
+
+
+def compact_cache(key, df, cache_dir=CACHE_DIR):
+    """Gabungkan fragment ke file Feather utama (hash segmen di manifest tetap dipakai)"""
+    feather_path, manifest_path = _cache_paths(key, cache_dir)
+    manifest = _read_manifest(manifest_path)
+    _write_atomic(
+        feather_path,
+        lambda p: feather.write_feather(df.reset_index(drop=True), p, compression='uncompressed')
+    )
+    fragments = manifest.get('fragments', [])
+    manifest.update({'fragments': [], 'rows': len(df)})
+    _write_atomic(manifest_path, lambda p: _dump_json(manifest, p))
+    _remove_fragments({'fragments': fragments}, cache_dir)
+
+
+def read_cache(key, cache_dir=CACHE_DIR):
+    """Baca cache Feather ke DataFrame, ditambah fragment hasil append"""
+    feather_path, manifest_path = _cache_paths(key, cache_dir)
+    df = feather.read_table(feather_path).to_pandas()
+    for fragment in (_read_manifest(manifest_path) or {}).get('fragments', []):
+        batch = feather.read_table(os.path.join(cache_dir, fragment)).to_pandas()
+        df = concat_with_schema(df, batch, key)
+    return df
+
+
+def data_version(file_mapping=None):
+    """Tanda versi data dari mtime dan ukuran semua CSV sumber"""
+    file_mapping = file_mapping or FILE_MAPPING
+    digest = hashlib.sha256()
+    for key, filename in sorted(file_mapping.items()):
+        try:
+            stat = os.stat(filename)
+            digest.update(f'{key}:{stat.st_mtime_ns}:{stat.st_size};'.encode('utf-8'))
+        except OSError:
+            digest.update(f'{key}:missing;'.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def load_dataset(key, filename=None, cache_dir=CACHE_DIR):
+    """Load dataset lewat cache Feather, kembali ke CSV jika sumber berubah"""
+    filename = filename or FILE_MAPPING[key]
+    if feather is None:
+        return read_dataset(key, filename)
+
+    try:
+        if cache_is_valid(key, filename, cache_dir):
+            df = read_cache(key, cache_dir)
+            _, manifest_path = _cache_paths(key, cache_dir)
+            if len(_read_manifest(manifest_path).get('fragments', [])) > MAX_CACHE_FRAGMENTS:
+                compact_cache(key, df, cache_dir)
+            return df
+    except Exception as e:
+        print(f"✗ Cache error: {key} - {str(e)[:50]}")
+
+    df = read_dataset(key, filename)
+    try:
+        write_cache(key, df, filename, cache_dir)
+    except Exception as e:
+        print(f"✗ Cache write failed: {key} - {str(e)[:50]}")
+    return df
+
+
+# ==================== CACHE TURUNAN (AGREGAT) ====================
+# Tabel turunan (kubus, deret bulanan, total produk) disimpan terpisah dan
+# dianggap valid selama file sumber transaksinya tidak berubah.
+def _source_signature(key):
+    """mtime dan ukuran file sumber untuk satu dataset"""
+    stat = os.stat(FILE_MAPPING[key])
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def write_derived(name, df, source_key='transactions', cache_dir=CACHE_DIR):
+    """Simpan tabel turunan dan kaitkan dengan versi file sumbernya"""
+    if feather is None:
+        return
+    os.makedirs(cache_dir, exist_ok=True)
+    feather_path, manifest_path = _cache_paths(f'derived_{name}', cache_dir)
+    _write_atomic(
+        feather_path,
+        lambda p: feather.write_feather(df.reset_index(drop=True), p, compression='uncompressed')
+    )
+    manifest = {'source_key': source_key, 'source': _source_signature(source_key), 'rows': len(df)}
+    _write_atomic(manifest_path, lambda p: _dump_json(manifest, p))
+
+
+def read_derived(name, source_key='transactions', cache_dir=CACHE_DIR):
+    """Baca tabel turunan, None jika belum ada atau sumbernya sudah berubah"""
+    if feather is None:
+        return None
+    feather_path, manifest_path = _cache_paths(f'derived_{name}', cache_dir)
+    manifest = _read_manifest(manifest_path)
+    try:
+        if manifest is None or manifest.get('source') != _source_signature(source_key):
+            return None
+        return feather.read_table(feather_path).to_pandas()
+    except (OSError, ValueError):
+        return None
+
+
+# ==================== STORE PERSISTEN ====================
+# Tabel yang harus bertahan melewati perubahan data (mis. model forecast yang
+# sudah di-fit). Validitas isinya diatur oleh pemakai, bukan oleh versi sumber.
+def write_store(name, df, cache_dir=CACHE_DIR):
+    """Simpan tabel persisten ke cache (tanpa manifest sumber)"""
+    if feather is None:
+        return
+    os.makedirs(cache_dir, exist_ok=True)
+    feather_path, _ = _cache_paths(f'store_{name}', cache_dir)
+    _write_atomic(
+        feather_path,
+        lambda p: feather.write_feather(df.reset_index(drop=True), p, compression='uncompressed')
+    )
+
+
+def read_store(name, cache_dir=CACHE_DIR):
+    """Baca tabel persisten, None jika belum ada atau rusak"""
+    if feather is None:
+        return None
+    feather_path, _ = _cache_paths(f'store_{name}', cache_dir)
+    try:
+        return feather.read_table(feather_path).to_pandas()
+    except (OSError, ValueError):
+        return None
+
+
+# ==================== PARTISI BULANAN (PUSHDOWN FILTER) ====================
+# Transaksi juga disimpan sebagai dataset Arrow IPC yang dipartisi per bulan
+# (order_month=YYYY-MM). Filter tanggal memangkas partisi yang dibuka, predikat kolom
+# lain dievaluasi Arrow saat scan, sehingga hanya baris yang cocok yang sampai
+# ke pandas.
+PARTITION_COLUMN = 'order_month'
+
+
+def _partition_paths(key, cache_dir):
+    """Direktori partisi dan manifest untuk satu dataset"""
+    return (
+        os.path.join(cache_dir, f'{key}_partitions'),
+        os.path.join(cache_dir, f'{key}_partitions.json')
+    )
+
+
+def _partition_table(df, date_column):
+    """DataFrame -> tabel Arrow dengan kolom kunci partisi"""
+    keyed = df.assign(**{PARTITION_COLUMN: df[date_column].dt.strftime('%Y-%m')})
+    table = pa.Table.from_pandas(keyed, preserve_index=False)
+    # Lebar kode category pandas (int8/int16) tergantung jumlah kategori per batch/chunk;
+    # disamakan ke int32 supaya semua file partisi punya skema yang sama
+    schema = pa.schema([
+        field.with_type(pa.dictionary(pa.int32(), field.type.value_type)) if pa.types.is_dictionary(field.type) else field
+        for field in table.schema
+    ], metadata=table.schema.metadata)
+    return table.cast(schema)
+
+
+def _write_partition_files(table, root):
+    """Tambahkan file baru ke partisi bulan yang sesuai (file lama tidak disentuh)"""
+    ds.write_dataset(
+        table, root, format='ipc',
+        partitioning=[PARTITION_COLUMN], partitioning_flavor='hive',
+        basename_template=f'part-{uuid.uuid4().hex[:12]}-{{i}}.arrow',
+        existing_data_behavior='overwrite_or_ignore'
+    )
+
+
+def write_partitions(key, df, date_column='tanggal_order', cache_dir=CACHE_DIR):
+    """Tulis ulang seluruh dataset sebagai partisi bulanan beserta manifest sumbernya
+
+    df boleh berupa DataFrame atau iterable chunk (mis. iter_dataset) untuk file besar.
+    """
+    if ds is None:
+        return
+    root, manifest_path = _partition_paths(key, cache_dir)
+    tmp_root = f'{root}.tmp'
+    shutil.rmtree(tmp_root, ignore_errors=True)
+    rows = 0
+    for chunk in [df] if isinstance(df, pd.DataFrame) else df:
+        _write_partition_files(_partition_table(chunk, date_column), tmp_root)
+        rows += len(chunk)
+    shutil.rmtree(root, ignore_errors=True)
+    os.replace(tmp_root, root)
+    manifest = {'source': _source_signature(key), 'rows': rows}
+    _write_atomic(manifest_path, lambda p: _dump_json(manifest, p))
+
+
+def append_partitions(key, batch, date_column='tanggal_order', cache_dir=CACHE_DIR):
+    """Tambahkan batch ke partisi yang sudah ada (dipanggil setelah file sumber ikut ditambah)"""
+    if ds is None or batch.empty:
+        return
+    root, manifest_path = _partition_paths(key, cache_dir)
+    manifest = _read_manifest(manifest_path)
+    if manifest is None or not os.path.isdir(root):
+        return
+    _write_partition_files(_partition_table(batch, date_column), root)
+    manifest.update({'source': _source_signature(key), 'rows': manifest.get('rows', 0) + len(batch)})
+    _write_atomic(manifest_path, lambda p: _dump_json(manifest, p))
+
+
+def partitions_valid(key, cache_dir=CACHE_DIR):
+    """Cek apakah partisi masih sesuai dengan file sumbernya"""
+    if ds is None:
+        return False
+    root, manifest_path = _partition_paths(key, cache_dir)
+    manifest = _read_manifest(manifest_path)
+    try:
+        return manifest is not None and os.path.isdir(root) and manifest.get('source') == _source_signature(key)
+    except OSError:
+        return False
+
+
+def _predicate(column, value):
+    """Ekspresi Arrow: list/tuple/set -> isin, selain itu kesamaan"""
+    if isinstance(value, (list, tuple, set)):
+        return ds.field(column).isin(list(value))
+    return ds.field(column) == value
+
+
+def _partition_filter(months=None, predicates=None, date_range=None, date_column='tanggal_order'):
+    """Filter partisi -> ekspresi Arrow (None jika tidak ada filter)"""
+    conditions = []
+    if months is not None:
+        conditions.append(ds.field(PARTITION_COLUMN).isin(list(months)))
+    for column, value in (predicates or {}).items():
+        conditions.append(_predicate(column, value))
+    if date_range is not None:
+        start, end = date_range
+        if start is not None:
+            conditions.append(ds.field(date_column) >= pa.scalar(pd.Timestamp(start).normalize().to_pydatetime()))
+        if end is not None:
+            end_exclusive = pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+            conditions.append(ds.field(date_column) < pa.scalar(end_exclusive.to_pydatetime()))
+
+    return reduce(lambda a, b: a & b, conditions) if conditions else None
+
+
+def _partition_frame(key, table):
+    """Tabel/batch Arrow hasil scan partisi -> DataFrame sesuai skema (tanpa kolom kunci partisi)"""
+    df = table.to_pandas().drop(columns=[PARTITION_COLUMN], errors='ignore')
+    return apply_schema(df, DATASET_SCHEMAS.get(key, {}))
+
+
+def read_partitions(key, months=None, predicates=None, date_range=None, date_column='tanggal_order',
+                    cache_dir=CACHE_DIR):
+    """Baca hanya partisi bulan dan baris yang cocok dengan filter
+
+    months     : daftar 'YYYY-MM' yang dibuka (None = semua bulan)
+    predicates : kolom -> nilai (list/tuple = isin, selain itu ==)
+    date_range : (start, end) inklusif per hari pada date_column, boleh None di salah satu sisi
+    """
+    root, _ = _partition_paths(key, cache_dir)
+    dataset = ds.dataset(root, format='ipc', partitioning='hive')
+    expression = _partition_filter(months, predicates, date_range, date_column)
+    return _partition_frame(key, dataset.to_table(filter=expression))
+
+
+def iter_partitions(key, months=None, predicates=None, date_range=None, date_column='tanggal_order',
+                    chunk_rows=CHUNK_ROWS, cache_dir=CACHE_DIR):
+    """Seperti read_partitions, tetapi per batch berisi maksimal chunk_rows baris
+
+    Memori puncak = satu batch, berapa pun jumlah baris yang cocok.
+    """
+    root, _ = _partition_paths(key, cache_dir)
+    dataset = ds.dataset(root, format='ipc', partitioning='hive')
+    batches = dataset.to_batches(
+        filter=_partition_filter(months, predicates, date_range, date_column), batch_size=chunk_rows
+    )
+    return (_partition_frame(key, batch) for batch in batches if batch.num_rows)
+
+
+def load_partitions(key, months=None, predicates=None, date_range=None, cache_dir=CACHE_DIR):
+    """Baca slice dataset lewat partisi bulanan, membangun partisi dulu jika belum ada/basi
+
+    Tanpa pyarrow, dataset difilter di pandas (per chunk untuk file besar).
+    """
+    large = is_large(key)
+    if ds is not None:
+        try:
+            if not partitions_valid(key, cache_dir):
+                source = iter_dataset(key) if large else load_dataset(key, cache_dir=cache_dir)
+                write_partitions(key, source, cache_dir=cache_dir)
+            return read_partitions(key, months, predicates, date_range, cache_dir=cache_dir)
+        except Exception as e:
+            print(f"✗ Partition error: {key} - {str(e)[:50]}")
+    if large:
+        parts = [filter_frame(chunk, months, predicates, date_range) for chunk in iter_dataset(key)]
+        return reduce(lambda existing, batch: concat_with_schema(existing, batch, key), parts)
+    return filter_frame(load_dataset(key, cache_dir=cache_dir), months, predicates, date_range)
+
+
+def scan_partitions(key, months=None, predicates=None, date_range=None, cache_dir=CACHE_DIR):
+    """Seperti load_partitions, tetapi mengembalikan iterator chunk yang cocok (untuk file besar)
+
+    Tanpa pyarrow, file sumber dibaca per chunk dan difilter di pandas.
+    """
+    if ds is not None:
+        try:
+            if not partitions_valid(key, cache_dir):
+                source = iter_dataset(key) if is_large(key) else load_dataset(key, cache_dir=cache_dir)
+                write_partitions(key, source, cache_dir=cache_dir)
+            return iter_partitions(key, months, predicates, date_range, cache_dir=cache_dir)
+        except Exception as e:
+            print(f"✗ Partition error: {key} - {str(e)[:50]}")
+    return (filter_frame(chunk, months, predicates, date_range) for chunk in iter_dataset(key))
+
+
+def filter_frame(df, months=None, predicates=None, date_range=None, date_column='tanggal_order'):
+    """Filter yang sama seperti read_partitions, dievaluasi di pandas"""
+    mask = pd.Series(True, index=df.index)
+    dates = df[date_column]
+    if months is not None:
+        mask &= dates.dt.strftime('%Y-%m').isin(list(months))
+    for column, value in (predicates or {}).items():
+        mask &= df[column].isin(list(value)) if isinstance(value, (list, tuple, set)) else df[column] == value
+    if date_range is not None:
+        start, end = date_range
+        if start is not None:
+            mask &= dates >= pd.Timestamp(start).normalize()
+        if end is not None:
+            mask &= dates < pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+    return df[mask].reset_index(drop=True)
+
+
+def concat_with_schema(existing, batch, key='transactions'):
+    """Gabungkan dua DataFrame berskema sama tanpa kehilangan dtype category"""
+    combined = pd.concat([existing, batch], ignore_index=True)
+    for col, kind in DATASET_SCHEMAS.get(key, {}).items():
+        if kind == 'category' and col in existing.columns and col in batch.columns:
+            combined[col] = union_categoricals(
+                [existing[col].astype('category'), batch[col].astype('category')],
+                ignore_order=True
+            )
+    return combined
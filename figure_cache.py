@@ -0,0 +1,59 @@
+"""Cache figure Plotly per sesi, dikunci dengan versi data dan input chart"""
+from collections import OrderedDict
+
+MAX_ENTRIES = 128
+_CACHE_KEY = '_figure_cache'
+_STATS_KEY = '_figure_cache_stats'
+
+
+def _freeze(value):
+    """Ubah list/dict/set menjadi bentuk hashable untuk kunci cache"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, set):
+        return tuple(sorted(_freeze(v) for v in value))
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def get_figure(state, name, builder, deps=(), max_entries=MAX_ENTRIES):
+    """Kembalikan figure dari cache, atau bangun lewat builder() jika belum ada
+
+    state  : mapping per sesi (st.session_state)
+    name   : nama chart
+    deps   : semua input yang mempengaruhi chart (versi data, filter, dst.)
+    """
+    cache = state.setdefault(_CACHE_KEY, OrderedDict())
+    stats = state.setdefault(_STATS_KEY, {'hits': 0, 'misses': 0, 'by_chart': {}})
+    chart_stats = stats['by_chart'].setdefault(name, {'hits': 0, 'misses': 0})
+
+    key = (name, _freeze(deps))
+    if key in cache:
+        cache.move_to_end(key)
+        stats['hits'] += 1
+        chart_stats['hits'] += 1
+        return cache[key]
+
+    stats['misses'] += 1
+    chart_stats['misses'] += 1
+    fig = builder()
+    if fig is not None:
+        cache[key] = fig
+        # Buang entri paling lama supaya memori sesi tetap terbatas
+        while len(cache) > max_entries:
+            cache.popitem(last=False)
+    return fig
+
+
+def cache_stats(state):
+    """Statistik hit/miss cache figure untuk sesi ini"""
+    stats = state.get(_STATS_KEY, {'hits': 0, 'misses': 0, 'by_chart': {}})
+    total = stats['hits'] + stats['misses']
+    return {
+        'hits': stats['hits'],
+        'misses': stats['misses'],
+        'hit_rate': stats['hits'] / total if total > 0 else 0.0,
+        'entries': len(state.get(_CACHE_KEY, {})),
+        'by_chart': stats['by_chart']
+    }
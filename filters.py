@@ -0,0 +1,154 @@
+"""Filter global dashboard (tanggal, transaction_type, is_return, is_shopping_bag, cat_norm)
+
+Predikat didorong ke lapisan data sebelum section apa pun menghitung:
+- bulan yang tercakup penuh oleh rentang tanggal dijawab dari kubus agregat
+  (flag dan cat_norm adalah dimensi kubus),
+- hanya bulan di batas rentang yang dibaca dari partisi transaksi bulanan,
+  dengan predikat yang sama dievaluasi saat scan.
+"""
+import pandas as pd
+
+from aggregates import build_cube
+from data_loader import CACHE_DIR, load_partitions, scan_partitions
+
+# Kolom filter -> jenis nilai (list = isin, flag = True/False)
+FILTER_COLUMNS = {
+    'transaction_type': 'list',
+    'cat_norm': 'list',
+    'is_return': 'flag',
+    'is_shopping_bag': 'flag'
+}
+
+
+def make_filters(date_range=None, bounds=None, **selections):
+    """Normalisasi pilihan filter bar menjadi dict hashable; None jika tidak ada filter aktif
+
+    bounds = (tanggal pertama, tanggal terakhir) data: sisi rentang yang mencakup
+    seluruh data dianggap tidak memfilter. Pilihan list kosong atau flag None = semua.
+    """
+    filters = {}
+    if date_range is not None:
+        start, end = (pd.Timestamp(value).normalize() if value is not None else None for value in date_range)
+        if bounds is not None:
+            start = None if start is not None and start <= pd.Timestamp(bounds[0]).normalize() else start
+            end = None if end is not None and end >= pd.Timestamp(bounds[1]).normalize() else end
+        if start is not None or end is not None:
+            filters['date_range'] = (start, end)
+
+    for column, kind in FILTER_COLUMNS.items():
+        value = selections.get(column)
+        if kind == 'list' and value:
+            filters[column] = tuple(sorted(str(v) for v in value))
+        elif kind == 'flag' and value is not None:
+            filters[column] = bool(value)
+    return filters or None
+
+
+def predicates(filters):
+    """Predikat kolom (tanpa rentang tanggal) dalam bentuk yang dipakai data_loader"""
+    return {column: filters[column] for column in FILTER_COLUMNS if column in (filters or {})}
+
+
+def month_coverage(months, date_range):
+    """Pisahkan awal bulan menjadi (tercakup penuh, tercakup sebagian) oleh rentang tanggal
+
+    Bulan di luar rentang tidak masuk keduanya.
+    """
+    months = pd.DatetimeIndex(months)
+    if date_range is None:
+        return months, months[:0]
+    start, end = date_range
+    month_end = months + pd.offsets.MonthEnd(0)
+    overlaps = pd.Series(True, index=months)
+    full = pd.Series(True, index=months)
+    if start is not None:
+        overlaps &= month_end >= start
+        full &= months >= start
+    if end is not None:
+        overlaps &= months <= end
+        full &= month_end <= end
+    return months[(overlaps & full).to_numpy()], months[(overlaps & ~full).to_numpy()]
+
+
+def filter_cube(cube, filters, cache_dir=CACHE_DIR):
+    """Kubus yang hanya berisi slice sesuai filter
+
+    Biayanya sebanding dengan slice yang cocok: bulan penuh cukup di-mask dari
+    kubus, bulan parsial dibaca dari partisinya saja lalu diagregasi ulang.
+    """
+    if filters is None or cube.empty:
+        return cube
+    column_predicates = predicates(filters)
+    full_months, partial_months = month_coverage(cube['month_start'].unique(), filters.get('date_range'))
+
+    mask = cube['month_start'].isin(full_months)
+    for column, value in column_predicates.items():
+        if column in cube.columns:
+            mask &= cube[column].isin(value) if isinstance(value, tuple) else cube[column] == value
+    parts = [cube[mask]]
+
+    if len(partial_months):
+        transactions = load_partitions(
+            'transactions',
+            months=[month.strftime('%Y-%m') for month in partial_months],
+            predicates=column_predicates,
+            date_range=filters['date_range'],
+            cache_dir=cache_dir
+        )
+        parts.append(build_cube(transactions))
+
+    filtered = pd.concat(parts, ignore_index=True)
+    # Kategori tiap bagian bisa berbeda; samakan lagi supaya groupby tetap di kode integer
+    for column in ['brand', 'cat_norm', 'nama_barang', 'transaction_type']:
+        if column in filtered.columns and not isinstance(filtered[column].dtype, pd.CategoricalDtype):
+            filtered[column] = filtered[column].astype(str).astype('category')
+    return filtered.sort_values('month_start', kind='stable').reset_index(drop=True)
+
+
+def _scan_months(filters, months):
+    """Bulan partisi ('YYYY-MM') yang perlu dibaca untuk filter; None = semua"""
+    date_range = filters.get('date_range')
+    if months is not None and date_range is not None:
+        full, partial = month_coverage(months, date_range)
+        months = full.append(partial)
+    return None if months is None else [month.strftime('%Y-%m') for month in pd.DatetimeIndex(months)]
+
+
+def filter_transactions(filters, months=None, cache_dir=CACHE_DIR):
+    """Transaksi yang cocok dengan filter, dibaca dari partisi bulanan (hanya bulan yang relevan)"""
+    filters = filters or {}
+    return load_partitions(
+        'transactions',
+        months=_scan_months(filters, months),
+        predicates=predicates(filters),
+        date_range=filters.get('date_range'),
+        cache_dir=cache_dir
+    )
+
+
+def iter_filtered_transactions(filters, months=None, cache_dir=CACHE_DIR):
+    """Seperti filter_transactions, tetapi per chunk supaya slice besar tidak dimuat utuh"""
+    filters = filters or {}
+    return scan_partitions(
+        'transactions',
+        months=_scan_months(filters, months),
+        predicates=predicates(filters),
+        date_range=filters.get('date_range'),
+        cache_dir=cache_dir
+    )
+
+
+def describe_filters(filters):
+    """Ringkasan singkat filter aktif untuk caption"""
+    if not filters:
+        return "All data"
+    parts = []
+    if 'date_range' in filters:
+        start, end = filters['date_range']
+        parts.append(f"{start.strftime('%d %b %Y') if start is not None else '…'} – "
+                     f"{end.strftime('%d %b %Y') if end is not None else '…'}")
+    for column in FILTER_COLUMNS:
+        if column in filters:
+            value = filters[column]
+            parts.append(f"{column}: {', '.join(value) if isinstance(value, tuple) else value}")
+    return " • ".join(parts)
@@ -0,0 +1,346 @@
+"""Forecast revenue bulanan untuk total, per brand dan per cat_norm dalam satu batch
+
+Model: exponential smoothing aditif (SES dan Holt dengan trend teredam). Semua
+deret di-fit sekaligus: parameter dicari lewat grid yang dievaluasi vektor untuk
+seluruh deret, lalu model terbaik per deret dipilih dengan AIC.
+
+Model yang sudah di-fit disimpan di cache (kunci: series_id + hash histori),
+sehingga setelah ingestion hanya deret yang historinya berubah yang dihitung ulang.
+
+Contoh pemakaian:
+    python forecasting.py --horizon 3
+"""
+import argparse
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from aggregates import build_cube
+from data_loader import CACHE_DIR, FILE_MAPPING, load_dataset, read_store, write_store
+
+HORIZON = 3
+Z_95 = 1.96
+SEGMENT_DIMENSIONS = ['brand', 'cat_norm']
+SEGMENT_FORECAST_FILE = 'time_series_segment_forecast.csv'
+MODEL_STORE = 'forecast_models'
+# Setelah sekian bulan baru sejak fit penuh terakhir, parameter dicari ulang dari grid
+REFIT_AFTER = 6
+FIT_FIELDS = ['alpha', 'beta', 'phi', 'level', 'trend', 'sse', 'sigma', 'aic', 'model']
+
+# Grid parameter: (alpha, beta, phi); beta = 0 dan phi = 1 berarti SES
+ALPHA_GRID = np.round(np.arange(0.05, 1.0, 0.05), 2)
+BETA_GRID = [0.05, 0.1, 0.2]
+PHI_GRID = [0.8, 0.9, 0.98]
+
+
+def _parameter_grid():
+    """Kombinasi parameter beserta jumlah parameter bebas (untuk AIC)"""
+    combos = [(alpha, 0.0, 1.0, 2) for alpha in ALPHA_GRID]
+    combos += [(alpha, beta, phi, 4) for alpha in ALPHA_GRID for beta in BETA_GRID for phi in PHI_GRID if beta <= alpha]
+    return np.array(combos, dtype='float64').T
+
+
+# ==================== DERET BULANAN ====================
+def segment_series(cube, last_date=None):
+    """Deret revenue bulanan (baris = deret, kolom = awal bulan) untuk total, brand dan cat_norm
+
+    Bulan tanpa transaksi diisi 0. Jika last_date jatuh sebelum akhir bulan
+    terakhir, bulan itu ditandai belum lengkap.
+
+    Returns (series, complete): series DataFrame dengan index series_id
+    ('total', 'brand:APPLE', 'cat_norm:DEVICE', ...), complete = bulan terakhir lengkap
+    """
+    if cube.empty:
+        return pd.DataFrame(), True
+    months = pd.date_range(cube['month_start'].min(), cube['month_start'].max(), freq='MS')
+
+    frames = [cube.groupby('month_start')['total_value'].sum().to_frame('total').T]
+    for dimension in SEGMENT_DIMENSIONS:
+        pivot = cube.pivot_table(index=dimension, columns='month_start', values='total_value',
+                                 aggfunc='sum', fill_value=0, observed=True)
+        pivot.index = [f'{dimension}:{value}' for value in pivot.index]
+        frames.append(pivot)
+    series = pd.concat(frames).reindex(columns=months, fill_value=0).fillna(0).astype('float64')
+    series.index.name = 'series_id'
+
+    complete = last_date is None or pd.Timestamp(last_date) >= months[-1] + pd.offsets.MonthEnd(0)
+    return series, complete
+
+
+def describe_series(series_id):
+    """Pisahkan series_id menjadi (segment_type, segment)"""
+    if ':' not in series_id:
+        return series_id, 'Total'
+    segment_type, segment = series_id.split(':', 1)
+    return segment_type, segment
+
+
+# ==================== FIT & FORECAST ====================
+def fit_exponential_smoothing(values):
+    """Fit semua deret (array n x T) sekaligus, pilih parameter terbaik per deret dengan AIC
+
+    State-space ETS(A,Ad,N): l_t = l_{t-1} + phi*b_{t-1} + alpha*e_t,
+    b_t = phi*b_{t-1} + beta*e_t. Level awal = observasi pertama, trend awal = 0.
+    """
+    values = np.asarray(values, dtype='float64')
+    alpha, beta, phi, n_params = _parameter_grid()
+    n_series, n_obs = values.shape
+
+    level = np.repeat(values[:, :1], len(alpha), axis=1)
+    trend = np.zeros_like(level)
+    sse = np.zeros_like(level)
+    for t in range(1, n_obs):
+        prediction = level + phi * trend
+        error = values[:, t:t + 1] - prediction
+        sse += error ** 2
+        level = prediction + alpha * error
+        trend = phi * trend + beta * error
+
+    aic = _aic(sse, n_obs, n_params)
+    best = np.argmin(aic, axis=1)
+    rows = np.arange(n_series)
+    return {
+        'alpha': alpha[best],
+        'beta': beta[best],
+        'phi': phi[best],
+        'level': level[rows, best],
+        'trend': trend[rows, best],
+        'sse': sse[rows, best],
+        'sigma': np.sqrt(sse[rows, best] / max(n_obs - 1, 1)),
+        'aic': aic[rows, best],
+        'model': np.where(beta[best] > 0, 'damped_trend', 'ses')
+    }
+
+
+def _aic(sse, n_obs, n_params):
+    """AIC dari jumlah kuadrat error one-step-ahead"""
+    fitted = np.maximum(np.asarray(n_obs) - 1, 1)
+    # Deret konstan (sse = 0) tetap butuh log yang hingga
+    return fitted * np.log(np.maximum(sse, 1e-9) / fitted) + 2 * n_params
+
+
+def extend_fit(fit, new_values, n_obs):
+    """Warm start: lanjutkan level/trend dengan parameter lama untuk observasi baru saja
+
+    new_values: array n x k berisi bulan baru tiap deret (rata kiri, NaN sebagai padding);
+    n_obs: jumlah observasi total tiap deret setelah bulan baru ditambahkan.
+    """
+    alpha, beta, phi = fit['alpha'], fit['beta'], fit['phi']
+    level, trend, sse = fit['level'].copy(), fit['trend'].copy(), fit['sse'].copy()
+    for t in range(new_values.shape[1]):
+        observed = ~np.isnan(new_values[:, t])
+        prediction = level + phi * trend
+        error = np.where(observed, new_values[:, t] - prediction, 0.0)
+        sse += error ** 2
+        level = np.where(observed, prediction + alpha * error, level)
+        trend = np.where(observed, phi * trend + beta * error, trend)
+
+    n_params = np.where(beta > 0, 4, 2)
+    return dict(fit, level=level, trend=trend, sse=sse,
+                sigma=np.sqrt(sse / np.maximum(n_obs - 1, 1)), aic=_aic(sse, n_obs, n_params))
+
+
+def forecast_from_fit(fit, steps):
+    """Forecast dan interval 95% untuk langkah ke-steps (array, 1 = bulan setelah data fit)"""
+    steps = np.asarray(steps)
+    horizon = int(steps.max())
+    phi = fit['phi'][:, None]
+    # phi_j = phi + phi^2 + ... + phi^j
+    phi_sums = np.cumsum(phi ** np.arange(1, horizon + 1), axis=1)
+
+    mean = fit['level'][:, None] + phi_sums * fit['trend'][:, None]
+    coefficients = (fit['alpha'][:, None] + fit['beta'][:, None] * phi_sums) ** 2
+    variance_factor = 1 + np.concatenate([np.zeros((len(phi), 1)), np.cumsum(coefficients[:, :-1], axis=1)], axis=1)
+    spread = Z_95 * fit['sigma'][:, None] * np.sqrt(variance_factor)
+
+    columns = steps - 1
+    mean = np.maximum(mean[:, columns], 0)
+    return mean, np.maximum(mean - spread[:, columns], 0), mean + spread[:, columns]
+
+
+def _fit_chunk(values):
+    """Worker process pool: fit satu potongan deret"""
+    return fit_exponential_smoothing(values)
+
+
+def fit_batch(values, workers=1):
+    """Fit banyak deret; workers > 1 membagi baris ke process pool"""
+    if workers <= 1 or len(values) < 2 * workers:
+        return fit_exponential_smoothing(values)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(_fit_chunk, np.array_split(np.asarray(values), workers)))
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+
+# ==================== CACHE MODEL ====================
+def _history_hash(start_month, values):
+    """Hash histori satu deret (bulan awal + nilai) sebagai kunci model"""
+    digest = hashlib.sha256(start_month.encode('utf-8'))
+    digest.update(np.ascontiguousarray(values, dtype='float64').tobytes())
+    return digest.hexdigest()[:16]
+
+
+def fit_cached(history, store=None, workers=1):
+    """Fit deret dengan memakai ulang model dari store
+
+    - histori sama persis (hash cocok)          -> model lama dipakai apa adanya
+    - histori lama utuh + bulan baru di belakang -> warm start dari state & parameter lama
+    - selain itu (deret baru, histori direvisi, atau REFIT_AFTER bulan baru
+      sejak fit penuh terakhir) -> fit penuh dari grid
+
+    Returns (fit, store baru, jumlah deret per jalur {'reused', 'warm_start', 'refit'})
+    """
+    values = history.to_numpy(dtype='float64')
+    n_series, n_obs = values.shape
+    start_month = history.columns[0].strftime('%Y-%m-%d')
+    hashes = np.array([_history_hash(start_month, row) for row in values], dtype=object)
+
+    reused = np.zeros(n_series, dtype=bool)
+    warm = np.zeros(n_series, dtype=bool)
+    refit_obs = np.full(n_series, n_obs)
+    if store is not None and not store.empty:
+        previous = store.set_index('series_id').reindex(history.index)
+        known = previous['history_hash'].notna().to_numpy() & (previous['start_month'].to_numpy() == start_month)
+        old_obs = previous['n_obs'].fillna(0).to_numpy(dtype='int64')
+        refit_obs = np.where(known, previous['refit_obs'].fillna(n_obs).to_numpy(dtype='int64'), n_obs)
+        reused = known & (previous['history_hash'].to_numpy() == hashes)
+        candidates = np.flatnonzero(known & ~reused & (old_obs >= 2) & (old_obs < n_obs) & (n_obs - refit_obs < REFIT_AFTER))
+        for row in candidates:
+            warm[row] = _history_hash(start_month, values[row, :old_obs[row]]) == previous['history_hash'].iat[row]
+
+    fit = {field: np.empty(n_series, dtype=object if field == 'model' else 'float64') for field in FIT_FIELDS}
+    kept = reused | warm
+    if kept.any():
+        for field in FIT_FIELDS:
+            fit[field][kept] = previous[field].to_numpy()[kept]
+    if warm.any():
+        rows = np.flatnonzero(warm)
+        offsets = old_obs[rows]
+        width = int((n_obs - offsets).max())
+        new_values = np.full((len(rows), width), np.nan)
+        for i, (row, offset) in enumerate(zip(rows, offsets)):
+            new_values[i, :n_obs - offset] = values[row, offset:]
+        extended = extend_fit({field: fit[field][rows] for field in FIT_FIELDS}, new_values, np.full(len(rows), n_obs))
+        for field in FIT_FIELDS:
+            fit[field][rows] = extended[field]
+
+    refit = ~kept
+    if refit.any():
+        fresh = fit_batch(values[refit], workers)
+        for field in FIT_FIELDS:
+            fit[field][refit] = fresh[field]
+        refit_obs[refit] = n_obs
+    fit['model'] = fit['model'].astype(str)
+
+    new_store = pd.DataFrame({
+        'series_id': history.index.to_numpy(),
+        'history_hash': hashes.astype(str),
+        'start_month': start_month,
+        'n_obs': n_obs,
+        'refit_obs': refit_obs,
+        **fit
+    })
+    counts = {'reused': int(reused.sum()), 'warm_start': int(warm.sum()), 'refit': int(refit.sum())}
+    return fit, new_store, counts
+
+
+# ==================== FORECAST SEGMEN ====================
+def forecast_segments(cube, last_date=None, horizon=HORIZON, workers=1, cache_dir=None):
+    """Forecast total, per brand dan per cat_norm dalam satu batch
+
+    Bulan terakhir yang belum lengkap tidak ikut di-fit; forecast tetap dimulai
+    dari bulan setelah bulan terakhir yang ada di data. Jika cache_dir diberikan,
+    model dibaca/disimpan di store sehingga hanya deret yang berubah yang di-fit
+    ulang (jumlah per jalur ada di forecasts.attrs['fit_paths']).
+
+    Returns DataFrame panjang: series_id, segment_type, segment, tanggal (akhir bulan),
+    forecast_revenue, lower_ci, upper_ci, model
+    """
+    series, complete = segment_series(cube, last_date)
+    history = series if complete else series.iloc[:, :-1]
+    if history.shape[1] < 2:
+        return pd.DataFrame(columns=['series_id', 'segment_type', 'segment', 'tanggal',
+                                     'forecast_revenue', 'lower_ci', 'upper_ci', 'model'])
+
+    if cache_dir is None:
+        fit = fit_batch(history.to_numpy(), workers)
+        counts = {'reused': 0, 'warm_start': 0, 'refit': len(history)}
+    else:
+        fit, store, counts = fit_cached(history, read_store(MODEL_STORE, cache_dir), workers)
+        try:
+            write_store(MODEL_STORE, store, cache_dir)
+        except Exception as e:
+            print(f"✗ Model cache write failed - {str(e)[:50]}")
+    offset = 0 if complete else 1
+    steps = np.arange(1, horizon + 1) + offset
+    mean, lower, upper = forecast_from_fit(fit, steps)
+
+    last_month_end = series.columns[-1] + pd.offsets.MonthEnd(0)
+    dates = [last_month_end + pd.offsets.MonthEnd(h) for h in range(1, horizon + 1)]
+    segments = [describe_series(series_id) for series_id in series.index]
+    n_series = len(series)
+    forecasts = pd.DataFrame({
+        'series_id': np.repeat(series.index.to_numpy(), horizon),
+        'segment_type': np.repeat([segment_type for segment_type, _ in segments], horizon),
+        'segment': np.repeat([segment for _, segment in segments], horizon),
+        'tanggal': np.tile(pd.DatetimeIndex(dates), n_series),
+        'forecast_revenue': mean.ravel().round(0),
+        'lower_ci': lower.ravel(),
+        'upper_ci': upper.ravel(),
+        'model': np.repeat(fit['model'], horizon)
+    })
+    forecasts.attrs['fit_paths'] = counts
+    return forecasts
+
+
+# ==================== BENTUK UNTUK CHART ====================
+def series_forecast(forecasts, series_id='total'):
+    """Forecast satu deret dengan kolom yang dipakai create_forecast_chart"""
+    selected = forecasts[forecasts['series_id'] == series_id]
+    return selected[['tanggal', 'forecast_revenue', 'lower_ci', 'upper_ci']].reset_index(drop=True)
+
+
+def series_history(series, series_id='total'):
+    """Histori satu deret dengan kolom seperti time_series_revenue_actual.csv"""
+    revenue = series.loc[series_id]
+    history = pd.DataFrame({
+        'tanggal_order': revenue.index + pd.offsets.MonthEnd(0),
+        'revenue': revenue.to_numpy()
+    })
+    history['ma_3'] = history['revenue'].rolling(window=3).mean()
+    return history
+
+
+def write_forecasts(forecasts):
+    """Tulis forecast total ke file forecast dashboard dan semua segmen ke file terpisah"""
+    total = series_forecast(forecasts, 'total')
+    total.assign(tanggal=total['tanggal'].dt.strftime('%Y-%m-%d')).to_csv(FILE_MAPPING['sales_forecast'], index=False)
+    segments = forecasts.assign(tanggal=forecasts['tanggal'].dt.strftime('%Y-%m-%d'))
+    segments.to_csv(SEGMENT_FORECAST_FILE, index=False)
+    return {'total': len(total), 'segments': forecasts['series_id'].nunique()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Forecast revenue bulanan total, per brand dan per cat_norm")
+    parser.add_argument('--horizon', type=int, default=HORIZON, help="Jumlah bulan yang diforecast")
+    parser.add_argument('--workers', type=int, default=1, help="Jumlah proses untuk fitting (1 = serial)")
+    parser.add_argument('--no-cache', action='store_true', help="Fit semua deret dari awal tanpa cache model")
+    args = parser.parse_args()
+
+    try:
+        transactions = load_dataset('transactions')
+        forecasts = forecast_segments(build_cube(transactions), transactions['tanggal_order'].max(),
+                                      args.horizon, args.workers, None if args.no_cache else CACHE_DIR)
+        counts = write_forecasts(forecasts)
+        paths = forecasts.attrs.get('fit_paths', {})
+        print(f"✓ Models: {paths.get('reused', 0)} reused, {paths.get('warm_start', 0)} warm-start, {paths.get('refit', 0)} refit")
+        print(f"✓ Written: {FILE_MAPPING['sales_forecast']} ({counts['total']} months)")
+        print(f"✓ Written: {SEGMENT_FORECAST_FILE} ({counts['segments']} series)")
+    except Exception as e:
+        print(f"✗ Failed: forecasting - {e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""Format angka Rupiah untuk tampilan dashboard EraPhone"""
+import numpy as np
+import pandas as pd
+
+# (batas bawah, pembagi, jumlah desimal, satuan) - urutan sama dengan format_currency
+_CURRENCY_TIERS = [
+    (1_000_000_000, 1_000_000_000, 2, ' M'),
+    (1_000_000, 1_000_000, 1, ' Jt'),
+    (1_000, 1_000, 0, ' K'),
+    (-np.inf, 1, 0, '')
+]
+
+
+def format_currency(value):
+    """Format nilai mata uang dengan satuan yang sesuai"""
+    if pd.isna(value):
+        return "Rp 0"
+
+    value = float(value)
+    if value >= 1_000_000_000:
+        return f"Rp {value/1_000_000_000:,.2f} M"
+    elif value >= 1_000_000:
+        return f"Rp {value/1_000_000:,.1f} Jt"
+    elif value >= 1_000:
+        return f"Rp {value/1_000:,.0f} K"
+    else:
+        return f"Rp {value:,.0f}"
+
+
+def _rounded_digits(scaled, decimals):
+    """Bulatkan |scaled| ke integer (dikali 10^decimals) seperti pembulatan f-string
+
+    Elemen yang terlalu dekat ke titik tengah pembulatan (atau tidak hingga)
+    ditandai ambigu supaya diformat lewat format_currency biasa.
+    """
+    shifted = np.abs(scaled) * (10 ** decimals)
+    finite = np.isfinite(shifted) & (shifted < 2 ** 53)
+    shifted = np.where(finite, shifted, 0.0)
+    if decimals:
+        frac = shifted - np.floor(shifted)
+        ambiguous = np.abs(frac - 0.5) <= 4 * np.spacing(shifted)
+    else:
+        # Tanpa perkalian, nilainya persis sehingga rint (half-even) sudah identik
+        ambiguous = np.zeros(len(shifted), dtype=bool)
+    return np.rint(shifted).astype(np.int64), ambiguous | ~finite
+
+
+def _codes(text):
+    """Kode karakter Unicode untuk teks konstan"""
+    return np.array([ord(c) for c in text], dtype=np.uint32)
+
+
+def _compose(rounded, negative, decimals, unit):
+    """Susun string "Rp [-]1,234.5 unit" langsung sebagai matriks kode karakter
+
+    Baris dikelompokkan menurut jumlah digit dan tanda, sehingga posisi koma,
+    titik desimal dan satuan dalam satu kelompok selalu sama.
+    """
+    out = np.empty(len(rounded), dtype=object)
+    scale = 10 ** decimals
+    int_part = rounded // scale
+    frac_part = (rounded - int_part * scale).astype(np.uint32)
+    # Digit diambil dengan aritmatika uint32 (bagian atas dan bawah 9 digit)
+    high = (int_part // 1_000_000_000).astype(np.uint32)
+    low = (int_part - high.astype(np.int64) * 1_000_000_000).astype(np.uint32)
+
+    n_digits = np.ones(len(rounded), dtype=np.int64)
+    for k in range(1, 19):
+        above = int_part >= 10 ** k
+        if not above.any():
+            break
+        n_digits += above
+
+    tail = _codes(unit)
+    for length in np.unique(n_digits):
+        for is_negative in (False, True):
+            rows = np.flatnonzero((n_digits == length) & (negative == is_negative))
+            if len(rows) == 0:
+                continue
+            head = _codes('Rp -' if is_negative else 'Rp ')
+            n_commas = (length - 1) // 3
+            width = len(head) + length + n_commas + (decimals + 1 if decimals else 0) + len(tail)
+            chars = np.empty((len(rows), width), dtype=np.uint32)
+            chars[:, :len(head)] = head
+
+            col = len(head)
+            for k in range(length - 1, -1, -1):
+                part, power = (low[rows], 10 ** k) if k < 9 else (high[rows], 10 ** (k - 9))
+                chars[:, col] = (part // np.uint32(power)) % np.uint32(10) + ord('0')
+                col += 1
+                if k and k % 3 == 0:
+                    chars[:, col] = ord(',')
+                    col += 1
+            if decimals:
+                chars[:, col] = ord('.')
+                col += 1
+                frac = frac_part[rows]
+                for k in range(decimals - 1, -1, -1):
+                    chars[:, col] = (frac // np.uint32(10 ** k)) % np.uint32(10) + ord('0')
+                    col += 1
+            chars[:, col:] = tail
+            out[rows] = chars.view(f'<U{width}').ravel()
+    return out
+
+
+def format_currency_array(values):
+    """Versi vektor format_currency: hasil identik untuk seluruh array sekaligus"""
+    values = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    result = np.full(len(values), "Rp 0", dtype=object)
+    remaining = ~np.isnan(values)
+
+    for lower, divisor, decimals, unit in _CURRENCY_TIERS:
+        mask = remaining & (values >= lower)
+        remaining &= ~mask
+        if not mask.any():
+            continue
+        positions = np.flatnonzero(mask)
+        scaled = values[positions] / divisor
+        rounded, fallback = _rounded_digits(scaled, decimals)
+
+        exact = ~fallback
+        if exact.any():
+            result[positions[exact]] = _compose(rounded[exact], np.signbit(scaled[exact]), decimals, unit)
+        for pos in positions[fallback]:
+            result[pos] = format_currency(values[pos])
+    return result
+
+
+def format_currency_series(series):
+    """Format satu kolom Rupiah, index Series asli dipertahankan"""
+    index = series.index if isinstance(series, pd.Series) else None
+    return pd.Series(format_currency_array(series), index=index, dtype=object)
@@ -0,0 +1,206 @@
+"""Ingest batch transaksi harian ke df_analysis.csv secara inkremental
+
+Contoh pemakaian (drop file harian):
+    python ingestion.py transaksi_2025-12-08.csv
+"""
+import argparse
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from abc_analysis import product_revenue, update_classes
+from aggregates import build_cube, has_cube_schema, merge_cube, monthly_revenue
+from data_loader import (
+    CACHE_DIR, DATASET_SCHEMAS, FILE_MAPPING, append_cache, append_partitions, apply_schema, cache_is_valid,
+    partitions_valid, read_derived, write_derived
+)
+
+TRANSACTION_COLUMNS = list(DATASET_SCHEMAS['transactions'].keys())
+_REQUIRED_NON_NULL = ['tanggal_order', 'brand', 'nama_barang', 'quantity', 'price', 'total_value']
+INGEST_LOG = 'ingested_batches.json'
+
+
+def validate_batch(batch_df):
+    """Cek batch baru terhadap skema transaksi dan kembalikan versi bertipe"""
+    missing = [col for col in TRANSACTION_COLUMNS if col not in batch_df.columns]
+    if missing:
+        raise ValueError(f"Batch tidak lengkap, kolom hilang: {missing}")
+
+    batch = apply_schema(batch_df[TRANSACTION_COLUMNS].copy(), DATASET_SCHEMAS['transactions'])
+
+    problems = []
+    for col in _REQUIRED_NON_NULL:
+        n_null = int(batch[col].isna().sum())
+        if n_null:
+            problems.append(f"{col}: {n_null} nilai kosong/tidak valid")
+    # year/month harus konsisten dengan tanggal_order
+    dates = batch['tanggal_order']
+    mismatch = ((dates.dt.year != batch['year']) | (dates.dt.month != batch['month'])) & dates.notna()
+    if mismatch.any():
+        problems.append(f"year/month tidak sesuai tanggal_order: {int(mismatch.sum())} baris")
+    if problems:
+        raise ValueError("Batch tidak valid - " + "; ".join(problems))
+    return batch
+
+
+def batch_hash(batch):
+    """Hash isi batch yang sudah divalidasi (nilai per baris, tidak bergantung format file asal)"""
+    rows = pd.util.hash_pandas_object(batch.reset_index(drop=True), index=False)
+    return hashlib.sha256(rows.to_numpy().tobytes()).hexdigest()
+
+
+def _read_log(cache_dir):
+    """Batch yang sudah di-ingest: hash -> ringkasan"""
+    try:
+        with open(os.path.join(cache_dir, INGEST_LOG), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def appended_ranges(cache_dir=CACHE_DIR):
+    """Append yang tercatat di log ingest: {'from': [mtime_ns, size], 'to': [mtime_ns, size]}, urut ukuran
+
+    Dipakai sql_backend untuk menyalin hanya byte baru ke DuckDB.
+    """
+    entries = [entry for entry in _read_log(cache_dir).values() if 'from' in entry and 'to' in entry]
+    return sorted(entries, key=lambda entry: entry['from'][1])
+
+
+def _signature(filename):
+    """[mtime_ns, size] file, None jika belum ada"""
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _record_batch(cache_dir, digest, summary):
+    """Catat batch yang baru diterapkan ke log ingest"""
+    log = _read_log(cache_dir)
+    log[digest] = summary
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, INGEST_LOG)
+    with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+        json.dump(log, f, indent=2)
+    os.replace(f'{path}.tmp', path)
+
+
+def _append_csv(batch, filename):
+    """Tambahkan baris batch ke akhir CSV sumber (format sama dengan file asli)"""
+    out = batch.copy()
+    out['tanggal_order'] = out['tanggal_order'].dt.strftime('%Y-%m-%d')
+
+    # Pastikan baris baru dimulai di baris sendiri
+    write_header = not os.path.exists(filename) or os.path.getsize(filename) == 0
+    needs_newline = False
+    if not write_header:
+        with open(filename, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b'\n'
+    with open(filename, 'a', encoding='utf-8', newline='') as f:
+        if needs_newline:
+            f.write('\n')
+        out.to_csv(f, header=write_header, index=False, lineterminator='\n')
+
+
+def _update_history(history_file, delta_monthly):
+    """Perbarui time_series_revenue_actual.csv dengan revenue bulanan dari batch"""
+    delta = delta_monthly.rename(columns={'total_value': 'revenue'})
+    delta['tanggal_order'] = delta['month_start'] + pd.offsets.MonthEnd(0)
+    delta = delta[['tanggal_order', 'revenue']]
+
+    if os.path.exists(history_file):
+        history = pd.read_csv(history_file, parse_dates=['tanggal_order'])[['tanggal_order', 'revenue']]
+        history = pd.concat([history, delta], ignore_index=True)
+        history = history.groupby('tanggal_order', as_index=False)['revenue'].sum()
+    else:
+        history = delta
+    history = history.sort_values('tanggal_order')
+    history['ma_3'] = history['revenue'].rolling(window=3).mean()
+    history['tanggal_order'] = history['tanggal_order'].dt.strftime('%Y-%m-%d')
+    history.to_csv(history_file, index=False)
+    return history
+
+
+def append_transactions(batch_df, cache_dir=CACHE_DIR):
+    """Validasi batch, tambahkan ke dataset dan perbarui agregat dari delta saja
+
+    Batch yang isinya sudah pernah diterapkan (hash sama di log ingest) dilewati,
+    supaya drop harian yang dijalankan ulang tidak menggandakan baris dan agregat.
+    """
+    filename = FILE_MAPPING['transactions']
+    batch = validate_batch(batch_df)
+    if batch.empty:
+        return {'rows': 0}
+    digest = batch_hash(batch)
+    if digest in _read_log(cache_dir):
+        return {'rows': 0, 'duplicate': True}
+
+    # Ambil state lama SEBELUM CSV berubah (cache terikat ke versi file lama)
+    signature_before = _signature(filename)
+    cache_current = os.path.exists(filename) and cache_is_valid('transactions', filename, cache_dir)
+    appended_from = os.path.getsize(filename) if cache_current else None
+    cube = read_derived('cube', cache_dir=cache_dir)
+    if cube is not None and not has_cube_schema(cube):
+        cube = None
+    partitions_current = partitions_valid('transactions', cache_dir)
+    abc_classes = read_derived('abc_classes', cache_dir=cache_dir)
+
+    _append_csv(batch, filename)
+
+    delta_cube = build_cube(batch)
+    history = _update_history(FILE_MAPPING['sales_history'], monthly_revenue(delta_cube))
+
+    # Batch masuk cache Feather sebagai fragment sendiri, tanpa baca/tulis ulang riwayat
+    if cache_current:
+        append_cache('transactions', batch, appended_from, filename, cache_dir)
+    # Partisi bulanan cukup ditambah file batch di bulan yang bersangkutan
+    if partitions_current:
+        append_partitions('transactions', batch, cache_dir=cache_dir)
+
+    # Agregat turunan hanya diperbarui jika versi lamanya tersedia;
+    # jika tidak, dashboard akan membangunnya ulang saat load berikutnya
+    if cube is not None:
+        write_derived('cube', merge_cube(cube, delta_cube), cache_dir=cache_dir)
+    if abc_classes is not None:
+        write_derived('abc_classes', update_classes(abc_classes, product_revenue(delta_cube)), cache_dir=cache_dir)
+
+    result = {
+        'rows': len(batch),
+        'date_from': batch['tanggal_order'].min(),
+        'date_to': batch['tanggal_order'].max(),
+        'revenue': batch['total_value'].sum(),
+        'history_months': len(history)
+    }
+    _record_batch(cache_dir, digest, {
+        'rows': len(batch),
+        'date_from': result['date_from'].strftime('%Y-%m-%d'),
+        'date_to': result['date_to'].strftime('%Y-%m-%d'),
+        'from': signature_before,
+        'to': _signature(filename)
+    })
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Append batch transaksi baru ke df_analysis.csv")
+    parser.add_argument('batch_files', nargs='+', help="CSV batch dengan kolom yang sama seperti df_analysis.csv")
+    args = parser.parse_args()
+
+    for batch_file in args.batch_files:
+        try:
+            result = append_transactions(pd.read_csv(batch_file))
+            if result.get('duplicate'):
+                print(f"✓ Skipped: {batch_file} (already ingested)")
+            else:
+                print(f"✓ Appended: {batch_file} ({result['rows']} rows)")
+        except Exception as e:
+            print(f"✗ Failed: {batch_file} - {e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+"""Representasi itemset ter-intern untuk tabel rule: nama produk -> id, itemset -> bitset
+
+Setiap nama produk disimpan sekali di vocab; antecedent/consequent tiap rule
+menjadi array id berukuran tetap (padding -1) dan bitset uint64, sehingga
+operasi subset/overlap/dedupe bisa dilakukan untuk semua rule sekaligus.
+"""
+import numpy as np
+import pandas as pd
+
+WORD_BITS = 64
+ITEM_SEPARATOR = ', '
+RULE_COLUMNS = [
+    'antecedents', 'consequents', 'support', 'confidence', 'lift',
+    'business_score', 'business_strategy', 'execution_priority'
+]
+
+
+def split_items(text, catalog=None):
+    """Pecah string 'A, B, C' dari decision_*.csv menjadi daftar item
+
+    Beberapa nama produk mengandung ', ' (mis. '... MAGSAFE, BLACK'); jika
+    catalog diberikan, potongan yang berdekatan digabung kembali menjadi nama
+    produk terpanjang yang dikenal.
+    """
+    parts = str(text).split(ITEM_SEPARATOR)
+    if not catalog:
+        return parts
+    items, i = [], 0
+    while i < len(parts):
+        for j in range(len(parts), i, -1):
+            candidate = ITEM_SEPARATOR.join(parts[i:j])
+            if candidate in catalog:
+                break
+        else:
+            j, candidate = i + 1, parts[i]
+        items.append(candidate)
+        i = j
+    return items
+
+
+def encode_itemsets(itemsets, item_ids, n_words):
+    """Daftar itemset (list nama) -> (id terurut dengan padding -1, bitset uint64)"""
+    width = max((len(items) for items in itemsets), default=0)
+    id_dtype = np.int16 if len(item_ids) < np.iinfo(np.int16).max else np.int32
+    ids = np.full((len(itemsets), max(width, 1)), -1, dtype=id_dtype)
+    for row, items in enumerate(itemsets):
+        codes = sorted(item_ids[item] for item in items)
+        ids[row, :len(codes)] = codes
+
+    bits = np.zeros((len(itemsets), n_words), dtype=np.uint64)
+    rows, cols = np.nonzero(ids >= 0)
+    codes = ids[rows, cols].astype(np.int64)
+    np.bitwise_or.at(bits, (rows, codes // WORD_BITS), np.left_shift(np.uint64(1), (codes % WORD_BITS).astype(np.uint64)))
+    return ids, bits
+
+
+def intern_rules(rules, catalog=None):
+    """Ubah tabel rule (kolom decision_*.csv) ke bentuk ter-intern
+
+    Returns dict:
+        items            : vocab nama produk (urut alfabet, id = posisi)
+        antecedent_ids   : int16/int32 (n_rule x panjang maks), padding -1
+        consequent_ids   : idem untuk consequent
+        antecedent_bits  : uint64 (n_rule x n_word)
+        consequent_bits  : idem untuk consequent
+        metrics          : kolom rule lainnya sebagai array (float / Categorical)
+    """
+    rules = rules.reset_index(drop=True)
+    catalog = set(catalog) if catalog is not None else None
+    antecedents = [split_items(text, catalog) for text in rules['antecedents']]
+    consequents = [split_items(text, catalog) for text in rules['consequents']]
+
+    items = np.array(sorted({item for itemset in antecedents + consequents for item in itemset}), dtype=object)
+    item_ids = {item: code for code, item in enumerate(items)}
+    n_words = max(1, -(-len(items) // WORD_BITS))
+    antecedent_ids, antecedent_bits = encode_itemsets(antecedents, item_ids, n_words)
+    consequent_ids, consequent_bits = encode_itemsets(consequents, item_ids, n_words)
+
+    # Kolom disimpan sebagai array biasa: ambil beberapa baris jauh lebih murah dari iloc
+    metrics = {}
+    for col in rules.columns.drop(['antecedents', 'consequents']):
+        if col in ['business_strategy', 'execution_priority']:
+            metrics[col] = pd.Categorical(rules[col])
+        else:
+            metrics[col] = rules[col].to_numpy()
+    return {
+        'items': items,
+        'item_ids': item_ids,
+        'antecedent_ids': antecedent_ids,
+        'consequent_ids': consequent_ids,
+        'antecedent_bits': antecedent_bits,
+        'consequent_bits': consequent_bits,
+        'metrics': metrics
+    }
+
+
+def decode_itemsets(items, ids):
+    """Array id (padding -1) -> string 'A, B, C' seperti di decision_*.csv"""
+    return [ITEM_SEPARATOR.join(items[row[row >= 0]]) for row in ids]
+
+
+def decode_rules(ruleset, rows=None):
+    """Bangun kembali tabel rule (kolom RULE_COLUMNS) untuk baris tertentu saja"""
+    metrics = ruleset['metrics']
+    rows = np.arange(len(ruleset['antecedent_ids'])) if rows is None else np.asarray(rows, dtype=np.int64)
+    columns = {
+        'antecedents': decode_itemsets(ruleset['items'], ruleset['antecedent_ids'][rows]),
+        'consequents': decode_itemsets(ruleset['items'], ruleset['consequent_ids'][rows])
+    }
+    for col in RULE_COLUMNS[2:]:
+        if col in metrics:
+            columns[col] = metrics[col][rows]
+    return pd.DataFrame(columns, index=rows, copy=False)
+
+
+def basket_bits(ruleset, basket):
+    """Bitset untuk sekumpulan nama produk (produk di luar vocab diabaikan)"""
+    known = [[item for item in basket if item in ruleset['item_ids']]]
+    return encode_itemsets(known, ruleset['item_ids'], ruleset['antecedent_bits'].shape[1])[1][0]
+
+
+# ==================== OPERASI HIMPUNAN (VEKTOR) ====================
+def is_subset(a_bits, b_bits):
+    """a subset dari b, per baris (mendukung broadcasting)"""
+    return ~np.any(a_bits & ~b_bits, axis=-1)
+
+
+def overlaps(a_bits, b_bits):
+    """a dan b punya minimal satu item yang sama, per baris"""
+    return np.any(a_bits & b_bits, axis=-1)
+
+
+def itemset_sizes(bits):
+    """Jumlah item per bitset"""
+    return np.unpackbits(bits.view(np.uint8), axis=-1).sum(axis=-1)
+
+
+def bitset_keys(*bit_arrays):
+    """Id integer yang sama untuk bitset yang sama, dihitung bersama untuk semua array"""
+    stacked = np.ascontiguousarray(np.concatenate(bit_arrays))
+    rows = stacked.view(np.dtype((np.void, stacked.dtype.itemsize * stacked.shape[1]))).ravel()
+    keys = np.unique(rows, return_inverse=True)[1].ravel()
+    return np.split(keys, np.cumsum([len(bits) for bits in bit_arrays])[:-1])
+
+
+def mirrored_duplicates(ruleset):
+    """Tandai rule B -> A yang cerminnya A -> B (atau duplikat persisnya) sudah muncul lebih dulu
+
+    Tabel rule urut business_score, jadi yang dipertahankan adalah versi terbaik.
+    """
+    antecedent_keys, consequent_keys = bitset_keys(ruleset['antecedent_bits'], ruleset['consequent_bits'])
+    n_keys = int(max(antecedent_keys.max(initial=-1), consequent_keys.max(initial=-1))) + 1
+    pair = np.minimum(antecedent_keys, consequent_keys).astype(np.int64) * n_keys + np.maximum(antecedent_keys, consequent_keys)
+    first = np.unique(pair, return_index=True)[1]
+    duplicate = np.ones(len(pair), dtype=bool)
+    duplicate[first] = False
+    return duplicate
+
+
+def ruleset_memory(ruleset):
+    """Perkiraan memori bentuk ter-intern (MB)"""
+    arrays = ['antecedent_ids', 'consequent_ids', 'antecedent_bits', 'consequent_bits']
+    total = sum(ruleset[key].nbytes for key in arrays)
+    total += sum(pd.Series(values).memory_usage(deep=True, index=False) for values in ruleset['metrics'].values())
+    total += pd.Series(ruleset['items']).memory_usage(deep=True)
+    return total / 1024 ** 2
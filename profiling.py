@@ -0,0 +1,158 @@
+"""Instrumentasi waktu per section, load data dan chart untuk setiap rerun (per sesi)
+
+Setiap rerun (penuh atau hanya satu fragment) menjadi satu catatan berisi event
+{name, kind, ms, rows, bytes, cached, section}. Catatan disimpan di state sesi (maksimal MAX_RUNS terakhir)
+sehingga regresi terlihat dengan membandingkan rerun terakhir dengan median
+rerun sebelumnya, dan bisa diekspor sebagai JSON lines.
+"""
+import json
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+import pandas as pd
+
+try:
+    import plotly.io as pio
+except ImportError:  # plotly opsional di sini, ukuran figure tidak diukur tanpanya
+    pio = None
+
+MAX_RUNS = 50
+_RUNS_KEY = '_profile_runs'
+_LABELS_KEY = '_profile_figure_labels'
+
+
+def start_run(state, run_kind='full', **meta):
+    """Mulai catatan rerun baru (dipanggil sekali di awal script, atau oleh profiled_fragment)"""
+    runs = state.setdefault(_RUNS_KEY, [])
+    run = {
+        'run': runs[-1]['run'] + 1 if runs else 1, 'run_kind': run_kind, 'started': time.time(),
+        'events': [], 'stack': [], **meta
+    }
+    runs.append(run)
+    del runs[:-MAX_RUNS]
+    state[_LABELS_KEY] = {}
+    return run
+
+
+def finish_run(state):
+    """Tutup rerun yang sedang berjalan dan catat total durasinya (ms)"""
+    run = current_run(state)
+    run['total_ms'] = (time.time() - run['started']) * 1000
+    return run
+
+
+def current_run(state):
+    """Catatan rerun yang sedang berjalan, dibuat jika belum ada"""
+    runs = state.get(_RUNS_KEY)
+    return runs[-1] if runs else start_run(state)
+
+
+@contextmanager
+def timed(state, name, kind='section', rows=None):
+    """Ukur durasi blok dan catat sebagai event
+
+    Event dikembalikan ke pemanggil supaya rows/bytes/cached bisa diisi di dalam
+    atau sesudah blok. Event bersarang mencatat section (atau fragment) induknya.
+    """
+    run = current_run(state)
+    event = {'name': name, 'kind': kind, 'rows': rows, 'section': run['stack'][-1] if run['stack'] else None}
+    if kind in ('section', 'fragment'):
+        run['stack'].append(name)
+    start = time.perf_counter()
+    try:
+        yield event
+    finally:
+        event['ms'] = (time.perf_counter() - start) * 1000
+        if kind in ('section', 'fragment'):
+            run['stack'].pop()
+        run['events'].append(event)
+
+
+def profiled_fragment(state, name):
+    """Decorator fragment: rerun fragment sendiri dicatat sebagai catatan rerun baru
+
+    Saat rerun penuh (catatan terakhir belum ditutup finish_run), fragment cukup
+    tercatat di dalam rerun itu. Saat hanya fragment yang dijalankan ulang, dibuka
+    catatan bertipe 'fragment' yang ditutup di akhir fungsi, supaya event-nya tidak
+    menempel ke catatan rerun penuh sebelumnya.
+    """
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if 'total_ms' not in current_run(state):
+                return fn(*args, **kwargs)
+            start_run(state, run_kind='fragment', fragment=name)
+            try:
+                with timed(state, name, 'fragment'):
+                    return fn(*args, **kwargs)
+            finally:
+                finish_run(state)
+        return wrapper
+    return decorate
+
+
+def label_figure(state, fig, name):
+    """Ingat nama chart untuk figure ini (dipakai saat figure dirender)"""
+    if fig is not None:
+        state.setdefault(_LABELS_KEY, {})[id(fig)] = name
+
+
+def figure_label(state, fig):
+    """Nama chart yang terdaftar untuk figure, atau judulnya"""
+    label = state.get(_LABELS_KEY, {}).get(id(fig))
+    if label is None:
+        title = getattr(getattr(fig, 'layout', None), 'title', None)
+        label = getattr(title, 'text', None) or 'chart'
+    return label
+
+
+def payload_bytes(obj):
+    """Perkiraan ukuran yang dikirim ke browser: JSON figure Plotly atau isi DataFrame"""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True, index=False).sum())
+    if pio is not None:
+        return len(pio.to_json(obj, validate=False))
+    return None
+
+
+# ==================== RINGKASAN & EKSPOR ====================
+def run_events(state, run_index=-1):
+    """Event satu rerun sebagai DataFrame"""
+    runs = state.get(_RUNS_KEY, [])
+    if not runs:
+        return pd.DataFrame(columns=['name', 'kind', 'section', 'ms', 'rows', 'bytes', 'cached'])
+    events = pd.DataFrame(runs[run_index]['events'])
+    for col in ['section', 'rows', 'bytes', 'cached']:
+        if col not in events.columns:
+            events[col] = None
+    return events
+
+
+def summarize(state):
+    """Event rerun terakhir dibandingkan median event yang sama di rerun sebelumnya"""
+    runs = state.get(_RUNS_KEY, [])
+    latest = run_events(state)
+    if latest.empty:
+        return latest
+    history = [
+        {'name': event['name'], 'kind': event['kind'], 'ms': event.get('ms')}
+        for run in runs[:-1] for event in run['events']
+    ]
+    if history:
+        baseline = pd.DataFrame(history).groupby(['name', 'kind'])['ms'].median().rename('median_ms')
+        latest = latest.join(baseline, on=['name', 'kind'])
+    else:
+        latest['median_ms'] = float('nan')
+    latest['change_pct'] = (latest['ms'] / latest['median_ms'] - 1) * 100
+    return latest[['name', 'kind', 'section', 'ms', 'median_ms', 'change_pct', 'rows', 'bytes', 'cached']]
+
+
+def export_jsonl(state):
+    """Semua event yang tersimpan sebagai JSON lines (satu event per baris)"""
+    lines = []
+    for run in state.get(_RUNS_KEY, []):
+        meta = {key: value for key, value in run.items() if key not in ('events', 'stack')}
+        for event in run['events']:
+            lines.append(json.dumps({**meta, **event}, default=str))
+    return '\n'.join(lines) + ('\n' if lines else '')
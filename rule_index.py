@@ -0,0 +1,95 @@
+"""Inverted index item -> rule (antecedent dan consequent) untuk rekomendasi per produk atau keranjang"""
+import numpy as np
+
+from itemsets import basket_bits, decode_rules, intern_rules, is_subset
+
+RANK_METRICS = ['lift', 'confidence', 'business_score']
+ROLES = ['antecedent', 'consequent']
+
+
+def _postings(itemset_ids):
+    """Matriks id item per rule -> dict id item -> id rule yang memuatnya"""
+    rule_ids, _ = np.nonzero(itemset_ids >= 0)
+    item_ids = itemset_ids[itemset_ids >= 0]
+    order = np.argsort(item_ids, kind='stable')
+    bounds = np.flatnonzero(np.diff(item_ids[order])) + 1
+    return {
+        int(item_ids[order][group[0]]): rule_ids[order][group]
+        for group in np.split(np.arange(len(order)), bounds) if len(group)
+    }
+
+
+def build_rule_index(rules, catalog=None):
+    """Bangun index sekali dari tabel rule (kolom decision_*.csv)
+
+    ruleset             : rule dalam bentuk ter-intern (lihat itemsets.intern_rules)
+    postings            : id item -> id rule yang antecedent-nya memuat item tersebut
+    consequent_postings : id item -> id rule yang consequent-nya memuat item tersebut
+    rank                : metrik -> (posisi tiap rule dalam urutan menurun, urutan itu),
+                          sehingga hasil query cukup diurutkan dengan np.sort
+    """
+    ruleset = intern_rules(rules, catalog)
+    postings = _postings(ruleset['antecedent_ids'])
+    consequent_postings = _postings(ruleset['consequent_ids'])
+
+    metrics = ruleset['metrics']
+    rank = {}
+    for metric in RANK_METRICS:
+        if metric in metrics:
+            order = np.argsort(-np.asarray(metrics[metric], dtype='float64'), kind='stable')
+            positions = np.empty(len(order), dtype=np.int64)
+            positions[order] = np.arange(len(order))
+            rank[metric] = (positions, order)
+
+    return {'ruleset': ruleset, 'postings': postings, 'consequent_postings': consequent_postings, 'rank': rank}
+
+
+def indexed_products(index):
+    """Semua produk yang muncul di rule, sebagai antecedent atau consequent (untuk pilihan di UI)"""
+    item_ids = sorted(set(index['postings']) | set(index['consequent_postings']))
+    return sorted(index['ruleset']['items'][item_ids])
+
+
+def _ranked(index, rule_ids, by, top_n):
+    """Urutkan id rule menurut metrik dan bangun top_n baris rule"""
+    positions, order = index['rank'][by]
+    ranked = order[np.sort(positions[rule_ids])]
+    return decode_rules(index['ruleset'], ranked[:top_n])
+
+
+def rules_for_product(index, product, by='lift', top_n=10, roles=ROLES):
+    """Rule yang memuat produk ini di sisi roles, urut metrik menurun
+
+    Kolom role menandai posisi produk di rule ('antecedent' atau 'consequent');
+    antecedent dan consequent satu rule tidak beririsan, jadi tiap rule muncul sekali.
+    """
+    item_id = index['ruleset']['item_ids'].get(product)
+    empty = np.empty(0, dtype=np.int64)
+    hits = {
+        'antecedent': index['postings'].get(item_id, empty) if 'antecedent' in roles else empty,
+        'consequent': index['consequent_postings'].get(item_id, empty) if 'consequent' in roles else empty
+    }
+    rule_ids = np.concatenate([hits['antecedent'], hits['consequent']])
+    found = _ranked(index, rule_ids, by, top_n)
+    found['role'] = np.where(found.index.isin(hits['antecedent']), 'antecedent', 'consequent')
+    return found
+
+
+def rules_for_basket(index, basket, by='lift', top_n=10):
+    """Rule yang aktif untuk keranjang: seluruh antecedent ada di keranjang
+
+    Rule yang semua consequent-nya sudah ada di keranjang tidak direkomendasikan.
+    """
+    ruleset = index['ruleset']
+    hits = [index['postings'][ruleset['item_ids'][item]] for item in set(basket)
+            if ruleset['item_ids'].get(item) in index['postings']]
+    if not hits:
+        return _ranked(index, np.empty(0, dtype=np.int64), by, top_n)
+
+    candidates = np.unique(np.concatenate(hits))
+    bits = basket_bits(ruleset, basket)
+    fired = candidates[
+        is_subset(ruleset['antecedent_bits'][candidates], bits)
+        & ~is_subset(ruleset['consequent_bits'][candidates], bits)
+    ]
+    return _ranked(index, fired, by, top_n)
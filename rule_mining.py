@@ -0,0 +1,351 @@
+"""Mining association rule (bundling & cross-selling) langsung dari df_analysis.csv
+
+Menggantikan export notebook: keranjang = transaksi per tanggal_order, itemset
+frequent dicari dengan pattern growth (gaya FP-Growth) di atas matriks sparse
+keranjang x item, lalu rule ditulis ke file decision_*.csv dengan kolom yang sama.
+
+Contoh pemakaian:
+    python rule_mining.py --min-support 0.01 --max-len 6
+    python rule_mining.py --workers 4   # mining partisi paralel
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from data_loader import FILE_MAPPING, load_dataset
+from itemsets import ITEM_SEPARATOR, RULE_COLUMNS
+from rule_pruning import PRUNE_MODES, prune_rules
+
+MIN_SUPPORT = 0.01  # ~3 keranjang harian, setara ambang export notebook
+MAX_LEN = 6
+MIN_CONFIDENCE = 0.3
+BUNDLING_CONFIDENCE = 0.5      # confidence >= ini -> Bundling Utama, selainnya Cross-Selling
+HIGH_PRIORITY_QUANTILE = 0.75  # business_score >= kuantil ini -> Prioritas Tinggi
+
+
+# ==================== MATRIKS KERANJANG ====================
+def basket_matrix(transactions_df, basket_key='tanggal_order', item_col='nama_barang'):
+    """Matriks sparse keranjang x item dalam format CSR
+
+    Returns (indptr, indices, items): item keranjang b ada di
+    indices[indptr[b]:indptr[b+1]], kode item menunjuk ke array items.
+    """
+    pairs = pd.DataFrame({
+        'basket': pd.factorize(transactions_df[basket_key], sort=True)[0],
+        'item': transactions_df[item_col].astype(str)
+    }).drop_duplicates()
+    item_codes, items = pd.factorize(pairs['item'], sort=True)
+    order = np.lexsort((item_codes, pairs['basket'].to_numpy()))
+    baskets = pairs['basket'].to_numpy()[order]
+    n_baskets = int(baskets.max()) + 1 if len(baskets) else 0
+    indptr = np.zeros(n_baskets + 1, dtype=np.int64)
+    np.cumsum(np.bincount(baskets, minlength=n_baskets), out=indptr[1:])
+    return indptr, item_codes[order].astype(np.int32), np.asarray(items, dtype=object)
+
+
+def _gather(indptr, indices, baskets):
+    """Ambil semua item dari sekumpulan keranjang beserta id keranjangnya (tanpa loop)"""
+    starts = indptr[baskets]
+    lengths = indptr[baskets + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=indices.dtype), np.empty(0, dtype=baskets.dtype)
+    # Posisi tiap elemen = start keranjangnya + offset di dalam keranjang
+    offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return indices[np.repeat(starts, lengths) + offsets], np.repeat(baskets, lengths)
+
+
+# ==================== FREQUENT ITEMSET ====================
+def frequent_itemsets(indptr, indices, n_items, min_count, max_len=MAX_LEN, roots=None):
+    """Cari semua itemset dengan support count >= min_count
+
+    Item diurutkan ulang dari yang paling sering; tiap prefix hanya diperluas
+    dengan item yang lebih jarang di dalam proyeksi keranjangnya (conditional
+    database), sehingga setiap itemset dihitung tepat sekali. roots (kode item)
+    membatasi pencarian ke subtree dengan item pertama (paling sering) tersebut.
+
+    Returns dict {tuple kode item terurut: support count}
+    """
+    counts = np.bincount(indices, minlength=n_items)
+    frequent = np.flatnonzero(counts >= min_count)
+    if len(frequent) == 0:
+        return {}
+    # rank 0 = item paling sering; item tidak frequent dibuang dari matriks
+    ranked = frequent[np.argsort(-counts[frequent], kind='stable')]
+    rank_of = np.full(n_items, -1, dtype=np.int64)
+    rank_of[ranked] = np.arange(len(ranked))
+
+    ranks = rank_of[indices]
+    keep = ranks >= 0
+    n_baskets = len(indptr) - 1
+    row_of = np.repeat(np.arange(n_baskets), np.diff(indptr))
+    row_lengths = np.bincount(row_of[keep], minlength=n_baskets)
+    r_indptr = np.zeros(len(indptr), dtype=np.int64)
+    np.cumsum(row_lengths, out=r_indptr[1:])
+    r_indices = ranks[keep]
+
+    itemsets = {}
+    stack = [((), -1, np.arange(n_baskets))]
+    while stack:
+        prefix, last_rank, baskets = stack.pop()
+        items, owners = _gather(r_indptr, r_indices, baskets)
+        later = items > last_rank
+        items, owners = items[later], owners[later]
+        if len(items) == 0:
+            continue
+        item_counts = np.bincount(items, minlength=len(ranked))
+        extensions = np.flatnonzero(item_counts >= min_count)
+        if roots is not None and not prefix:
+            extensions = extensions[np.isin(ranked[extensions], roots)]
+        if len(extensions) == 0:
+            continue
+        order = np.argsort(items, kind='stable')
+        sorted_items, sorted_owners = items[order], owners[order]
+        bounds = np.searchsorted(sorted_items, extensions)
+        for rank, start in zip(extensions, bounds):
+            itemset = prefix + (int(rank),)
+            support_count = int(item_counts[rank])
+            itemsets[itemset] = support_count
+            if len(itemset) < max_len:
+                stack.append((itemset, rank, sorted_owners[start:start + support_count]))
+
+    # Kembalikan ke kode item asli, diurutkan supaya kunci subset konsisten;
+    # urutan dict juga diurutkan agar hasil serial dan paralel identik
+    return dict(sorted((tuple(sorted(int(ranked[r]) for r in itemset)), count) for itemset, count in itemsets.items()))
+
+
+# ==================== MINING PARALEL (PARTISI) ====================
+def _partition_bounds(n_baskets, n_partitions):
+    """Batas rentang keranjang per partisi; keranjang urut tanggal jadi tiap partisi = rentang tanggal"""
+    bounds = np.linspace(0, n_baskets, max(1, n_partitions) + 1).round().astype(np.int64)
+    return [(int(lo), int(hi)) for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+
+
+def _slice_baskets(indptr, indices, lo, hi):
+    """Sub-matriks CSR untuk keranjang lo..hi-1"""
+    return indptr[lo:hi + 1] - indptr[lo], indices[indptr[lo]:indptr[hi]]
+
+
+def count_itemsets(indptr, indices, candidates):
+    """Support count tepat untuk setiap kandidat (tuple kode item terurut)
+
+    Kandidat disusun sebagai trie prefix; keranjang diproyeksikan per prefix
+    seperti di frequent_itemsets, jadi hanya cabang kandidat yang dihitung.
+    """
+    children = {}
+    for itemset in candidates:
+        for k in range(len(itemset)):
+            children.setdefault(itemset[:k], set()).add(itemset[k])
+
+    counts = {}
+    stack = [((), np.arange(len(indptr) - 1))]
+    while stack:
+        prefix, baskets = stack.pop()
+        nexts = np.array(sorted(children.get(prefix, ())), dtype=indices.dtype)
+        if len(nexts) == 0 or len(baskets) == 0:
+            continue
+        items, owners = _gather(indptr, indices, baskets)
+        hit = np.isin(items, nexts)
+        order = np.argsort(items[hit], kind='stable')
+        items, owners = items[hit][order], owners[hit][order]
+        starts = np.searchsorted(items, nexts, side='left')
+        ends = np.searchsorted(items, nexts, side='right')
+        for item, start, end in zip(nexts, starts, ends):
+            itemset = prefix + (int(item),)
+            counts[itemset] = int(end - start)
+            if end > start and itemset in children:
+                stack.append((itemset, owners[start:end]))
+    return np.array([counts.get(itemset, 0) for itemset in candidates], dtype=np.int64)
+
+
+def _mine_partition(args):
+    """Pass 1 (worker): itemset frequent lokal dari satu partisi"""
+    indptr, indices, n_items, min_count, max_len = args
+    return list(frequent_itemsets(indptr, indices, n_items, min_count, max_len))
+
+
+def _mine_subtrees(args):
+    """Worker: itemset frequent di subtree item pertama tertentu, di atas semua keranjang"""
+    indptr, indices, n_items, min_count, max_len, roots = args
+    return frequent_itemsets(indptr, indices, n_items, min_count, max_len, roots)
+
+
+def _subtree_roots(indptr, indices, n_items, min_count, n_groups):
+    """Bagi item frequent ke n_groups secara round-robin menurut frekuensi
+
+    Subtree item yang paling sering paling besar, jadi round-robin meratakan beban antar grup.
+    """
+    counts = np.bincount(indices, minlength=n_items)
+    frequent = np.flatnonzero(counts >= min_count)
+    ranked = frequent[np.argsort(-counts[frequent], kind='stable')]
+    return [ranked[start::n_groups] for start in range(n_groups) if start < len(ranked)]
+
+
+def _count_partition(args):
+    """Pass 2 (worker): support count kandidat global di satu partisi"""
+    indptr, indices, candidates = args
+    return count_itemsets(indptr, indices, candidates)
+
+
+def parallel_frequent_itemsets(indptr, indices, n_items, min_count, max_len=MAX_LEN, workers=4, n_partitions=None):
+    """Versi partisi frequent_itemsets di process pool, hasilnya identik dengan versi serial
+
+    Pass 1: tiap partisi (rentang tanggal) ditambang dengan ambang proporsional
+    ceil(min_count * n_partisi / n_keranjang). Itemset yang frequent secara global
+    pasti lolos ambang ini di minimal satu partisi, jadi gabungan hasilnya adalah
+    kandidat yang lengkap. Pass 2: support global kandidat dihitung tepat per
+    partisi lalu dijumlahkan, kandidat di bawah min_count dibuang.
+
+    Ambang lokal 1 membuat semua subset keranjang jadi kandidat, jadi jumlah
+    partisi dibatasi supaya ambang lokal minimal 2. Jika batas itu menyisakan satu
+    partisi (min_count kecil, seperti keranjang harian df_analysis.csv dengan
+    min_count ~3), yang dibagi ke worker adalah ruang pencarian: tiap worker
+    menambang subtree beberapa item pertama di atas semua keranjang.
+    """
+    n_baskets = len(indptr) - 1
+    if n_baskets == 0:
+        return {}
+    n_partitions = min(n_partitions or workers, max(1, min_count // 2))
+    if n_partitions == 1:
+        if workers <= 1:
+            return frequent_itemsets(indptr, indices, n_items, min_count, max_len)
+        groups = _subtree_roots(indptr, indices, n_items, min_count, workers * 4)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            subtrees = pool.map(_mine_subtrees, [
+                (indptr, indices, n_items, min_count, max_len, roots) for roots in groups
+            ])
+            itemsets = {itemset: count for found in subtrees for itemset, count in found.items()}
+        return dict(sorted(itemsets.items()))
+    parts = [(lo, hi, *_slice_baskets(indptr, indices, lo, hi))
+             for lo, hi in _partition_bounds(n_baskets, n_partitions)]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        local = pool.map(_mine_partition, [
+            (p_indptr, p_indices, n_items, -(-min_count * (hi - lo) // n_baskets), max_len)
+            for lo, hi, p_indptr, p_indices in parts
+        ])
+        candidates = sorted(set().union(*local))
+        if not candidates:
+            return {}
+        partial = pool.map(_count_partition, [(p_indptr, p_indices, candidates) for _, _, p_indptr, p_indices in parts])
+        totals = np.sum(list(partial), axis=0)
+    return {itemset: int(count) for itemset, count in zip(candidates, totals) if count >= min_count}
+
+
+# ==================== RULE ====================
+def generate_rules(itemsets, n_baskets, min_confidence=MIN_CONFIDENCE, min_lift=1.0):
+    """Semua rule X -> Y dari itemset frequent (ukuran >= 2)
+
+    Semua subset dari itemset frequent juga frequent, jadi support antecedent
+    dan consequent selalu tersedia di dict itemsets.
+
+    Returns DataFrame antecedent/consequent (tuple kode) + support, confidence, lift
+    """
+    rows = []
+    for itemset, count in itemsets.items():
+        if len(itemset) < 2:
+            continue
+        for size in range(1, len(itemset)):
+            for antecedent in combinations(itemset, size):
+                consequent = tuple(i for i in itemset if i not in antecedent)
+                confidence = count / itemsets[antecedent]
+                if confidence < min_confidence:
+                    continue
+                lift = confidence * n_baskets / itemsets[consequent]
+                if lift <= min_lift:
+                    continue
+                rows.append((antecedent, consequent, count / n_baskets, confidence, lift))
+    return pd.DataFrame(rows, columns=['antecedents', 'consequents', 'support', 'confidence', 'lift'])
+
+
+def score_rules(rules, bundling_confidence=BUNDLING_CONFIDENCE, high_priority_quantile=HIGH_PRIORITY_QUANTILE):
+    """Tambahkan business_score, business_strategy dan execution_priority"""
+    rules = rules.copy()
+    raw_score = rules['support'] * rules['confidence'] * rules['lift']
+    rules['business_score'] = raw_score / raw_score.max() if len(rules) else raw_score
+    rules['business_strategy'] = np.where(rules['confidence'] >= bundling_confidence, 'Bundling Utama', 'Cross-Selling')
+    threshold = rules['business_score'].quantile(high_priority_quantile) if len(rules) else 0
+    rules['execution_priority'] = np.where(rules['business_score'] >= threshold, 'Prioritas Tinggi', 'Prioritas Menengah')
+    return rules.sort_values(['business_score', 'confidence'], ascending=False, kind='stable').reset_index(drop=True)
+
+
+def _item_labels(codes, items):
+    """Gabungkan nama item (urut alfabet) menjadi satu string seperti export notebook"""
+    return codes.map(lambda itemset: ITEM_SEPARATOR.join(sorted(items[list(itemset)])))
+
+
+def mine_rules(transactions_df, min_support=MIN_SUPPORT, max_len=MAX_LEN, min_confidence=MIN_CONFIDENCE,
+               basket_key='tanggal_order', item_col='nama_barang', workers=1):
+    """Mining rule dari transaksi, hasilnya memakai kolom decision_*.csv (RULE_COLUMNS)
+
+    workers > 1 memakai mining paralel di process pool (partisi keranjang atau
+    subtree item, hasil sama persis).
+    """
+    if transactions_df.empty:
+        return pd.DataFrame(columns=RULE_COLUMNS)
+
+    indptr, indices, items = basket_matrix(transactions_df, basket_key, item_col)
+    n_baskets = len(indptr) - 1
+    min_count = max(1, int(np.ceil(min_support * n_baskets - 1e-9)))
+    if workers > 1:
+        itemsets = parallel_frequent_itemsets(indptr, indices, len(items), min_count, max_len, workers)
+    else:
+        itemsets = frequent_itemsets(indptr, indices, len(items), min_count, max_len)
+
+    rules = generate_rules(itemsets, n_baskets, min_confidence)
+    if rules.empty:
+        return pd.DataFrame(columns=RULE_COLUMNS)
+    rules = score_rules(rules)
+    rules['antecedents'] = _item_labels(rules['antecedents'], items)
+    rules['consequents'] = _item_labels(rules['consequents'], items)
+    return rules[RULE_COLUMNS]
+
+
+def split_decisions(rules):
+    """Pisahkan rule ke tabel bundling, cross-selling dan priority actions"""
+    return {
+        'bundles': rules[rules['business_strategy'] == 'Bundling Utama'].reset_index(drop=True),
+        'cross_sell': rules[rules['business_strategy'] == 'Cross-Selling'].reset_index(drop=True),
+        'priority_actions': rules[rules['execution_priority'] == 'Prioritas Tinggi'].reset_index(drop=True)
+    }
+
+
+def refresh_decision_files(min_support=MIN_SUPPORT, max_len=MAX_LEN, min_confidence=MIN_CONFIDENCE, workers=1, prune=True,
+                           prune_mode='covered'):
+    """Mining ulang dari df_analysis.csv dan tulis ulang ketiga file decision_*.csv"""
+    transactions = load_dataset('transactions')
+    rules = mine_rules(transactions, min_support, max_len, min_confidence, workers=workers)
+    if prune:
+        rules = prune_rules(rules, catalog=transactions['nama_barang'].astype(str), mode=prune_mode)
+    tables = split_decisions(rules)
+    for key, table in tables.items():
+        table.to_csv(FILE_MAPPING[key], index=False)
+    return {key: len(table) for key, table in tables.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mining ulang rule bundling/cross-selling dari df_analysis.csv")
+    parser.add_argument('--min-support', type=float, default=MIN_SUPPORT, help="Support minimum (fraksi keranjang)")
+    parser.add_argument('--max-len', type=int, default=MAX_LEN, help="Ukuran itemset maksimum")
+    parser.add_argument('--min-confidence', type=float, default=MIN_CONFIDENCE, help="Confidence minimum rule")
+    parser.add_argument('--workers', type=int, default=1, help="Jumlah proses untuk mining paralel (1 = serial); dengan support kecil "
+                        "yang dibagi adalah subtree item, bukan partisi keranjang")
+    parser.add_argument('--no-prune', action='store_true', help="Tulis semua rule tanpa pruning redundansi")
+    parser.add_argument('--prune-mode', choices=PRUNE_MODES, default='covered',
+                        help="covered = setiap rule yang dibuang terwakili; maximal = hanya itemset maksimal (lebih ringkas)")
+    args = parser.parse_args()
+
+    try:
+        counts = refresh_decision_files(args.min_support, args.max_len, args.min_confidence, args.workers, not args.no_prune,
+                                        args.prune_mode)
+        for key, n_rows in counts.items():
+            print(f"✓ Written: {FILE_MAPPING[key]} ({n_rows} rules)")
+    except Exception as e:
+        print(f"✗ Failed: rule mining - {e}")
+
+
+if __name__ == '__main__':
+    main()
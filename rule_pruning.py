@@ -0,0 +1,135 @@
+"""Pruning rule redundan sebelum ditampilkan atau ditulis ke decision_*.csv
+
+Rule X -> Y redundan jika ada rule X' -> Y' dengan X' subset X (selalu aktif
+ketika X -> Y aktif), Y' superset Y (merekomendasikan minimal item yang sama)
+dan confidence >= confidence X -> Y. Ini mencakup parent yang lebih umum dengan
+confidence sama/lebih tinggi dan rule dari itemset yang tidak closed, sehingga
+yang tersisa adalah set rule closed/maksimal. Untuk bundling, arah rule tidak
+relevan. Rule yang berbagi itemset (termasuk cermin A -> B / B -> A) dipadatkan
+menjadi satu rule dengan business_score tertinggi.
+
+Setiap rule yang dibuang tetap terwakili rule yang dipertahankan dalam strategi
+yang sama: rule tersebut mendominasinya atau berbagi itemset dengannya
+(lihat covered_rules). Jaminan ini membatasi seberapa jauh tabel bisa dipangkas.
+Mode 'maximal' lebih ketat: per strategi hanya itemset maksimal (tidak termuat
+di itemset rule lain) yang dipertahankan, satu rule per itemset, tanpa jaminan
+setiap rule yang dibuang terwakili.
+
+Contoh pemakaian:
+    pruned = prune_rules(pd.concat([bundles, cross_sell]))
+    compact = prune_rules(pd.concat([bundles, cross_sell]), mode='maximal')
+"""
+import numpy as np
+
+from itemsets import bitset_keys, intern_rules, is_subset
+
+# Toleransi perbandingan confidence (kolom disimpan float32)
+TOLERANCE = 1e-6
+CHUNK_ROWS = 256
+PRUNE_MODES = ['covered', 'maximal']
+
+
+def dominated_rules(ruleset, groups=None, dominators=None, targets=None):
+    """Tandai rule yang didominasi rule lain (antecedent lebih umum, consequent lebih luas, confidence >=)
+
+    groups (opsional) membatasi dominasi ke rule dalam grup yang sama, dominators
+    (mask, opsional) membatasi rule yang boleh mendominasi dan targets (mask,
+    opsional) rule yang diperiksa. Dikerjakan per blok baris supaya memori
+    broadcasting tetap terbatas.
+    """
+    n_rules = len(ruleset['antecedent_bits'])
+    rows = np.arange(n_rules) if targets is None else np.flatnonzero(targets)
+    cols = np.arange(n_rules) if dominators is None else np.flatnonzero(dominators)
+    antecedents = ruleset['antecedent_bits'][cols][None, :, :]
+    consequents = ruleset['consequent_bits'][cols][None, :, :]
+    confidence = np.asarray(ruleset['metrics']['confidence'], dtype='float64')
+
+    dominated = np.zeros(n_rules, dtype=bool)
+    for start in range(0, len(rows), CHUNK_ROWS):
+        block = rows[start:start + CHUNK_ROWS]
+        own_antecedent = ruleset['antecedent_bits'][block][:, None, :]
+        own_consequent = ruleset['consequent_bits'][block][:, None, :]
+        more_general = is_subset(antecedents, own_antecedent)
+        broader = is_subset(own_consequent, consequents)
+        different = np.any((antecedents != own_antecedent) | (consequents != own_consequent), axis=-1)
+        stronger = confidence[None, cols] >= confidence[block, None] - TOLERANCE
+        candidates = more_general & broader & different & stronger
+        if groups is not None:
+            candidates &= groups[block, None] == groups[None, cols]
+        dominated[block] = np.any(candidates, axis=1)
+    return dominated
+
+
+def _itemset_keys(ruleset, groups=None):
+    """Id per (grup, itemset gabungan antecedent + consequent)"""
+    (keys,) = bitset_keys(ruleset['antecedent_bits'] | ruleset['consequent_bits'])
+    if groups is None:
+        return keys.astype(np.int64)
+    group_codes = np.unique(groups, return_inverse=True)[1].ravel()
+    return group_codes.astype(np.int64) * (int(keys.max(initial=-1)) + 1) + keys
+
+
+def collapse_shared_itemsets(ruleset, keep, groups=None):
+    """Di antara rule yang tersisa (keep), sisakan satu rule per itemset gabungan (per grup)
+
+    Yang dipertahankan adalah rule dengan business_score tertinggi, tidak bergantung
+    pada urutan tabel (seri: baris yang lebih dulu).
+    """
+    keys = _itemset_keys(ruleset, groups)
+    rows = np.flatnonzero(keep)
+    if 'business_score' in ruleset['metrics']:
+        scores = np.asarray(ruleset['metrics']['business_score'], dtype='float64')
+        rows = rows[np.argsort(-scores[rows], kind='stable')]
+    collapsed = np.zeros(len(keep), dtype=bool)
+    collapsed[rows[np.unique(keys[rows], return_index=True)[1]]] = True
+    return collapsed
+
+
+def maximal_itemsets(ruleset, groups=None):
+    """Tandai rule yang itemset gabungannya tidak termuat (subset sejati) di itemset rule lain dalam grup sama"""
+    itemsets = ruleset['antecedent_bits'] | ruleset['consequent_bits']
+    maximal = np.ones(len(itemsets), dtype=bool)
+    for start in range(0, len(itemsets), CHUNK_ROWS):
+        block = slice(start, start + CHUNK_ROWS)
+        own = itemsets[block, None, :]
+        larger = is_subset(own, itemsets[None, :, :]) & np.any(own != itemsets[None, :, :], axis=-1)
+        if groups is not None:
+            larger &= groups[block, None] == groups[None, :]
+        maximal[block] = ~np.any(larger, axis=1)
+    return maximal
+
+
+def covered_rules(ruleset, keep, groups=None):
+    """Tandai rule yang terwakili rule di keep (grup sama): didominasi atau berbagi itemset"""
+    keys = _itemset_keys(ruleset, groups)
+    covered = keep | np.isin(keys, keys[keep])
+    return covered | dominated_rules(ruleset, groups, dominators=keep, targets=~covered)
+
+
+def prune_rules(rules, catalog=None, mode='covered'):
+    """Pangkas tabel rule (kolom decision_*.csv) menjadi set rule non-redundan
+
+    mode 'covered' (default) menjamin setiap rule yang dibuang terwakili;
+    'maximal' hanya menyisakan satu rule per itemset maksimal. Urutan baris asli dipertahankan.
+    """
+    if mode not in PRUNE_MODES:
+        raise ValueError(f"Mode pruning tidak dikenal: {mode}")
+    rules = rules.reset_index(drop=True)
+    if rules.empty:
+        return rules
+    ruleset = intern_rules(rules, catalog)
+    # Dominasi dan pemadatan hanya di dalam strategi yang sama supaya rule
+    # cross-selling tidak tergeser oleh rule bundling (dan sebaliknya)
+    strategies = rules['business_strategy'].astype(str).to_numpy() if 'business_strategy' in rules.columns else None
+    if mode == 'maximal':
+        return rules[collapse_shared_itemsets(ruleset, maximal_itemsets(ruleset, strategies), strategies)].reset_index(drop=True)
+    keep = collapse_shared_itemsets(ruleset, np.ones(len(rules), dtype=bool), strategies)
+    keep &= ~dominated_rules(ruleset, strategies, dominators=keep, targets=keep)
+    # Rule yang dominatornya ikut dipadatkan bisa kehilangan wakil; kembalikan yang
+    # paling kuat di antaranya sampai semua rule terwakili
+    missing = ~covered_rules(ruleset, keep, strategies)
+    while missing.any():
+        strongest = missing & ~dominated_rules(ruleset, strategies, dominators=missing, targets=missing)
+        keep |= collapse_shared_itemsets(ruleset, strongest, strategies)
+        missing = ~covered_rules(ruleset, keep, strategies)
+    return rules[keep].reset_index(drop=True)
@@ -0,0 +1,292 @@
+"""Mesin query SQL kolomnar (DuckDB, opsional) untuk agregasi dashboard
+
+Transaksi dan tabel keputusan disalin sekali ke file database DuckDB di
+.cache/ (tanpa server) dan disinkronkan ulang hanya jika CSV sumbernya
+berubah. Jika transaksi hanya bertambah lewat ingestion.py, yang disalin
+hanya byte baru tersebut. Query brand, produk, kategori, heatmap, drill-down dan ABC ditulis
+sebagai SQL berparameter yang dieksekusi DuckDB secara vektor dan
+multi-thread, langsung dari disk tanpa memuat seluruh transaksi ke pandas.
+Hasilnya berbentuk sama dengan fungsi padanannya di aggregates.py dan
+abc_analysis.py.
+"""
+import os
+
+import pandas as pd
+
+from abc_analysis import ABC_CLASSES, ABC_COLUMNS, ABC_THRESHOLDS
+from aggregates import GRANULARITY_UNITS
+from data_loader import CACHE_DIR, DATASET_SCHEMAS, FILE_MAPPING, apply_schema
+from filters import FILTER_COLUMNS
+from ingestion import appended_ranges
+
+try:
+    import duckdb
+except ImportError:  # duckdb opsional, tanpa itu dashboard memakai kubus pandas
+    duckdb = None
+
+DB_FILE = 'dashboard.duckdb'
+SQL_TABLES = ['transactions', 'bundles', 'cross_sell', 'priority_actions']
+THREADS = None  # None = semua core
+
+_SQL_TYPES = {
+    'category': 'VARCHAR',
+    'str': 'VARCHAR',
+    'date': 'DATE',
+    'bool': 'BOOLEAN',
+    'money': 'BIGINT',
+    'int8': 'TINYINT',
+    'int16': 'SMALLINT',
+    'int32': 'INTEGER',
+    'float32': 'FLOAT',
+    'float64': 'DOUBLE'
+}
+# Granularity drill-down -> unit date_trunc (minggu DuckDB dimulai Senin, sama dengan time_bucket_keys)
+_TRUNC_UNITS = {
+    'Daily': 'day',
+    'Weekly': 'week',
+    'Monthly': 'month',
+    'Quarterly': 'quarter',
+    'Yearly': 'year'
+}
+_DIMENSIONS = ['brand', 'cat_norm', 'nama_barang']
+
+
+# ==================== KONEKSI & SINKRONISASI ====================
+def connect(cache_dir=CACHE_DIR, threads=THREADS):
+    """Buka database DuckDB di cache_dir dan sinkronkan tabelnya dengan CSV sumber"""
+    os.makedirs(cache_dir, exist_ok=True)
+    con = duckdb.connect(os.path.join(cache_dir, DB_FILE))
+    if threads:
+        con.execute(f"SET threads = {int(threads)}")
+    sync_tables(con, cache_dir=cache_dir)
+    return con
+
+
+def _signature(filename):
+    """mtime dan ukuran file sumber"""
+    stat = os.stat(filename)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _types_literal(schema):
+    """Skema dataset -> argumen types read_csv (nama kolom dari DATASET_SCHEMAS, bukan input pengguna)"""
+    return '{' + ', '.join(f"'{col}': '{_SQL_TYPES[kind]}'" for col, kind in schema.items()) + '}'
+
+
+def _appended_from(name, known, signature, cache_dir):
+    """Offset byte awal data baru jika sejak sinkronisasi terakhir file hanya di-append
+    oleh ingestion.py (rantai versi di log ingest bersambung sampai versi sekarang), selain itu None
+    """
+    if name != 'transactions' or known is None:
+        return None
+    cursor = list(known)
+    for entry in appended_ranges(cache_dir):
+        if entry['from'] == cursor:
+            cursor = entry['to']
+    return known[1] if cursor == list(signature) and cursor[1] > known[1] else None
+
+
+def _append_rows(con, name, filename, offset, cache_dir):
+    """Salin baris CSV mulai byte offset ke tabel (header disalin dari baris pertama file)"""
+    tail_file = os.path.join(cache_dir, f'{name}_append.csv')
+    with open(filename, 'rb') as source, open(tail_file, 'wb') as tail:
+        tail.write(source.readline())
+        source.seek(offset)
+        for chunk in iter(lambda: source.read(8 * 1024 * 1024), b''):
+            tail.write(chunk)
+    try:
+        con.execute(
+            f"INSERT INTO {name} SELECT * FROM read_csv(?, header = true, "
+            f"types = {_types_literal(DATASET_SCHEMAS[name])})",
+            [tail_file]
+        )
+    finally:
+        os.remove(tail_file)
+
+
+def sync_tables(con, tables=SQL_TABLES, cache_dir=CACHE_DIR):
+    """Muat ulang tabel yang CSV sumbernya berubah sejak sinkronisasi terakhir
+
+    Transaksi yang hanya di-append oleh ingestion.py cukup ditambah baris barunya;
+    file yang ditulis ulang dimuat ulang utuh.
+    Returns daftar tabel yang dimuat ulang atau ditambah
+    """
+    con.execute("CREATE TABLE IF NOT EXISTS _sources (name VARCHAR PRIMARY KEY, mtime_ns BIGINT, size BIGINT)")
+    known = {name: (mtime_ns, size) for name, mtime_ns, size in con.execute("SELECT * FROM _sources").fetchall()}
+    reloaded = []
+    for name in tables:
+        filename = FILE_MAPPING[name]
+        if not os.path.exists(filename):
+            continue
+        signature = _signature(filename)
+        if known.get(name) == signature:
+            continue
+        offset = _appended_from(name, known.get(name), signature, cache_dir)
+        # Isi tabel dan tanda versinya diperbarui dalam satu transaksi
+        con.execute("BEGIN TRANSACTION")
+        try:
+            if offset is not None:
+                _append_rows(con, name, filename, offset, cache_dir)
+            else:
+                con.execute(
+                    f"CREATE OR REPLACE TABLE {name} AS "
+                    f"SELECT * FROM read_csv(?, header = true, types = {_types_literal(DATASET_SCHEMAS[name])})",
+                    [filename]
+                )
+            con.execute("INSERT OR REPLACE INTO _sources VALUES (?, ?, ?)", [name, *signature])
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+        reloaded.append(name)
+    return reloaded
+
+
+def _query(con, sql, params=None):
+    """Jalankan query di cursor sendiri (aman dipakai bersamaan oleh beberapa sesi)"""
+    with con.cursor() as cursor:
+        return cursor.execute(sql, params or []).df()
+
+
+def _as_category(df, columns=_DIMENSIONS):
+    """Kolom dimensi hasil query -> category, seperti hasil groupby di kubus"""
+    for col in columns:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+
+def _where(filters=None, brands=None, months=None):
+    """Filter global (+ scope brand/bulan) -> klausa WHERE dan parameternya"""
+    filters = filters or {}
+    clauses, params = [], []
+    start, end = filters.get('date_range', (None, None))
+    if start is not None:
+        clauses.append("tanggal_order >= ?")
+        params.append(pd.Timestamp(start).date())
+    if end is not None:
+        clauses.append("tanggal_order <= ?")
+        params.append(pd.Timestamp(end).date())
+    for column in FILTER_COLUMNS:
+        if column in filters:
+            value = filters[column]
+            clauses.append(f"list_contains(?, {column})" if isinstance(value, tuple) else f"{column} = ?")
+            params.append(list(value) if isinstance(value, tuple) else value)
+    if brands is not None:
+        clauses.append("list_contains(?, brand)")
+        params.append([str(brand) for brand in brands])
+    if months is not None:
+        first, last = (pd.Timestamp(month).to_period('M') for month in months)
+        clauses.append("tanggal_order >= ? AND tanggal_order < ?")
+        params += [first.start_time.date(), (last + 1).start_time.date()]
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+# ==================== QUERY DASHBOARD ====================
+def brand_summary(con, filters=None):
+    """Seperti aggregates.brand_summary: revenue, quantity dan produk unik per brand"""
+    where, params = _where(filters)
+    return _as_category(_query(con, f"""
+        SELECT brand, sum(total_value)::BIGINT AS total_value, sum(quantity)::BIGINT AS quantity,
+               count(DISTINCT nama_barang) AS nama_barang
+        FROM transactions{where}
+        GROUP BY brand
+        ORDER BY total_value DESC, brand
+    """, params))
+
+
+def product_table(con, filters=None):
+    """Seperti aggregates.product_table: total per produk (urut revenue) dengan harga rata-rata"""
+    where, params = _where(filters)
+    products = _query(con, f"""
+        SELECT nama_barang, sum(total_value)::BIGINT AS total_value, sum(quantity)::BIGINT AS quantity,
+               arg_min(brand, tanggal_order) AS brand, arg_min(cat_norm, tanggal_order) AS cat_norm,
+               count(*) AS transactions,
+               round(sum(total_value) / nullif(sum(quantity), 0), 0) AS "Avg Price"
+        FROM transactions{where}
+        GROUP BY nama_barang
+        ORDER BY total_value DESC, nama_barang
+    """, params)
+    return _as_category(products)
+
+
+def category_summary(con, filters=None, brands=None):
+    """Seperti aggregates.category_summary: revenue, quantity, produk dan brand unik per kategori"""
+    where, params = _where(filters, brands=brands)
+    return _as_category(_query(con, f"""
+        SELECT cat_norm, sum(total_value)::BIGINT AS total_value, sum(quantity)::BIGINT AS quantity,
+               count(DISTINCT nama_barang) AS nama_barang, count(DISTINCT brand) AS brand
+        FROM transactions{where}
+        GROUP BY cat_norm
+        ORDER BY total_value DESC, cat_norm
+    """, params))
+
+
+def brand_category_pivot(con, filters=None):
+    """Seperti aggregates.brand_category_pivot: revenue brand x kategori untuk heatmap"""
+    where, params = _where(filters)
+    cells = _query(con, f"""
+        SELECT brand, cat_norm, sum(total_value)::BIGINT AS total_value
+        FROM transactions{where}
+        GROUP BY brand, cat_norm
+    """, params)
+    if cells.empty:
+        return pd.DataFrame()
+    return cells.pivot_table(index='brand', columns='cat_norm', values='total_value', aggfunc='sum', fill_value=0)
+
+
+def time_series(con, filters=None, ma_window=7):
+    """Seperti aggregates.build_time_series: deret semua granularity dalam satu dict"""
+    where, params = _where(filters)
+    series = {}
+    for granularity in GRANULARITY_UNITS:
+        grouped = _query(con, f"""
+            SELECT CAST(date_trunc('{_TRUNC_UNITS[granularity]}', tanggal_order) AS TIMESTAMP) AS "Period",
+                   sum(total_value)::BIGINT AS "Revenue", sum(quantity)::BIGINT AS "Quantity",
+                   count(DISTINCT nama_barang) AS "Unique Products"
+            FROM transactions{where}
+            GROUP BY 1
+            ORDER BY 1
+        """, params)
+        if grouped.empty:
+            return {}
+        grouped['MA_7'] = grouped['Revenue'].rolling(window=min(ma_window, len(grouped)), min_periods=1).mean()
+        series[granularity] = grouped
+    return series
+
+
+def abc_classes(con, thresholds=ABC_THRESHOLDS, brands=None, months=None, filters=None):
+    """Seperti classify_products(product_revenue(...)): kelas ABC dengan satu sort + window sum
+
+    Revenue sama diurutkan menurut nama produk supaya kelas di batas threshold stabil.
+    """
+    where, params = _where(filters, brands, months)
+    classes = _query(con, f"""
+        WITH totals AS (
+            SELECT nama_barang, sum(total_value)::BIGINT AS total_value,
+                   arg_min(brand, tanggal_order) AS brand, arg_min(cat_norm, tanggal_order) AS cat_norm
+            FROM transactions{where}
+            GROUP BY nama_barang
+        ), ranked AS (
+            SELECT *, coalesce(total_value / nullif(sum(total_value) OVER (), 0) * 100, 0) AS revenue_pct
+            FROM totals
+        ), cumulative AS (
+            SELECT *, sum(revenue_pct) OVER (ORDER BY total_value DESC, nama_barang
+                                             ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW) AS cum_revenue_pct
+            FROM ranked
+        )
+        SELECT nama_barang, total_value, revenue_pct, cum_revenue_pct,
+               CASE WHEN cum_revenue_pct <= ? THEN 'A' WHEN cum_revenue_pct <= ? THEN 'B' ELSE 'C' END AS "ABC_class",
+               brand, cat_norm
+        FROM cumulative
+        ORDER BY total_value DESC, nama_barang
+    """, params + [float(thresholds[0]), float(thresholds[1])])
+    classes['ABC_class'] = pd.Categorical(classes['ABC_class'], ABC_CLASSES)
+    return _as_category(classes)[ABC_COLUMNS + ['brand', 'cat_norm']]
+
+
+def read_table(con, name):
+    """Tabel keputusan (bundles, cross_sell, priority_actions) dengan dtype skema data_loader"""
+    if name not in SQL_TABLES:
+        raise ValueError(f"Tabel tidak dikenal: {name}")
+    return apply_schema(_query(con, f"SELECT * FROM {name}"), DATASET_SCHEMAS[name])
@@ -0,0 +1,260 @@
+"""Generator transaksi sintetis berskema df_analysis.csv untuk uji skala dashboard
+
+Data dibuat per keranjang dan dialirkan per chunk (DataFrame dengan 13 kolom
+df_analysis.csv), jadi dataset 100 juta baris bisa ditulis tanpa ditampung di
+memori. Bentuk data mengikuti df_analysis.csv:
+- 7 kategori dengan porsi produk, jumlah brand dan harga median yang sama,
+  total 42 brand dan ~850 produk (jumlah produk bisa dinaikkan),
+- popularitas produk Zipf sehingga revenue per produk berbentuk Pareto
+  (sekitar 20% produk menyumbang 80% revenue),
+- keranjang = produk utama + produk pasangan (device -> aksesori/proteksi)
+  dengan peluang tetap, sehingga rule_mining menemukan rule bundling.
+
+Hasil hanya ditentukan oleh seed dan parameter, bukan ukuran chunk.
+
+Contoh pemakaian:
+    python synthetic_data.py --rows 1000000 --output synthetic_1m.csv
+    python synthetic_data.py --rows 100000000 --days 1095 --output synthetic_100m.csv --basket-column order_id
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from data_loader import DATASET_SCHEMAS
+
+SEED = 42
+N_PRODUCTS = 850
+CHUNK_ROWS = 1_000_000
+BLOCK_BASKETS = 65_536  # keranjang per blok acak; chunk dipotong dari aliran blok
+START_DATE = '2025-04-01'
+DAYS = 275  # April - Desember 2025, sama dengan df_analysis.csv
+
+# (cat, cat_norm, porsi produk, brand pertama, jumlah brand, harga median) dari df_analysis.csv
+CATEGORIES = [
+    ('Device', 'DEVICE', 0.507, 0, 20, 2_999_000),
+    ('ACCESSORIES + IOT', 'ACCESSORIES + IOT', 0.407, 17, 25, 299_000),
+    ('Boltech', 'BOLTECH', 0.054, 20, 1, 399_000),
+    ('Operator', 'OPERATOR', 0.017, 38, 3, 600_000),
+    ('PO', 'PO', 0.007, 0, 2, 25_749_000),
+    ('Demo', 'DEMO', 0.006, 0, 1, 899_000),
+    ('E-Voucher', 'E-VOUCHER', 0.002, 41, 1, 10_100)
+]
+N_BRANDS = 42
+PRICE_SIGMA = 0.6
+POPULARITY_EXPONENT = 0.9
+
+# Produk pasangan per kategori utama: (kategori pasangan, jumlah pasangan)
+COMPANIONS = {
+    'DEVICE': [('ACCESSORIES + IOT', 2), ('BOLTECH', 1)],
+    'ACCESSORIES + IOT': [('ACCESSORIES + IOT', 1)]
+}
+COMPANION_PROBS = np.array([0.35, 0.2, 0.25])  # peluang tiap slot pasangan ikut dibeli
+NOISE_ITEMS = 0.15          # rata-rata item acak tambahan per keranjang
+EXTRA_QUANTITY = 0.005      # rata-rata unit tambahan per baris
+RETURN_RATE = 0.01          # porsi keranjang yang diretur (quantity & total_value negatif)
+SHOPPING_BAG_RATE = 0.05    # porsi keranjang dengan baris shopping bag
+SHOPPING_BAG = ('SHOPPING BAG', 'ACCESSORIES + IOT', 5_000)
+WEEKDAY_WEIGHTS = np.array([0.9, 0.9, 0.95, 1.0, 1.1, 1.3, 1.2])  # Senin..Minggu
+TRANSACTION_TYPES = ['CORE_RETAIL_TX', 'RETURN_TX']
+
+
+# ==================== KATALOG ====================
+def build_catalog(n_products=N_PRODUCTS, seed=SEED):
+    """Katalog produk sintetis + popularitas dan produk pasangan
+
+    products   : nama_barang, brand, cat, cat_norm, price (baris terakhir = shopping bag)
+    cdf        : distribusi kumulatif popularitas (untuk sampling produk utama)
+    companions : id produk pasangan per produk (n_products x slot, -1 = tidak ada)
+    """
+    rng = np.random.default_rng([seed, 0])
+    shares = np.array([category[2] for category in CATEGORIES])
+    counts = np.maximum(1, np.round(shares / shares.sum() * n_products).astype(int))
+    counts[0] += n_products - counts.sum()
+
+    brands = np.array([f'BRAND {i + 1:02d}' for i in range(N_BRANDS)])
+    frames = []
+    for (cat, cat_norm, _, first_brand, n_brands, median_price), count in zip(CATEGORIES, counts):
+        brand_ids = (first_brand + rng.integers(0, n_brands, count)) % N_BRANDS
+        prices = np.round(median_price * np.exp(rng.normal(0, PRICE_SIGMA, count)), -3).astype('int64')
+        frames.append(pd.DataFrame({
+            'nama_barang': [f'{brands[b]} {cat_norm} {i + 1:05d}' for i, b in enumerate(brand_ids)],
+            'brand': brands[brand_ids],
+            'cat': cat,
+            'cat_norm': cat_norm,
+            'price': np.maximum(prices, 1_000)
+        }))
+    bag_name, bag_category, bag_price = SHOPPING_BAG
+    bag = next(category for category in CATEGORIES if category[1] == bag_category)
+    frames.append(pd.DataFrame({'nama_barang': [bag_name], 'brand': [brands[bag[3]]], 'cat': [bag[0]],
+                                'cat_norm': [bag_category], 'price': [bag_price]}))
+    products = pd.concat(frames, ignore_index=True)
+
+    # Popularitas Zipf atas urutan acak produk (shopping bag tidak pernah jadi produk utama)
+    weights = np.zeros(len(products))
+    weights[rng.permutation(n_products)] = np.arange(1, n_products + 1, dtype='float64') ** -POPULARITY_EXPONENT
+    cdf = np.cumsum(weights) / weights.sum()
+
+    slots = max(sum(n for _, n in pairs) for pairs in COMPANIONS.values())
+    companions = np.full((len(products), slots), -1, dtype=np.int64)
+    cat_norm = products['cat_norm'].to_numpy()
+    candidates = {name: np.flatnonzero(cat_norm[:n_products] == name) for _, name, *_ in CATEGORIES}
+    for anchor_category, pairs in COMPANIONS.items():
+        anchors = candidates[anchor_category]
+        slot = 0
+        for companion_category, n_pairs in pairs:
+            pool = candidates[companion_category]
+            if len(pool):
+                companions[anchors, slot:slot + n_pairs] = rng.choice(pool, (len(anchors), n_pairs))
+            slot += n_pairs
+    return {'products': products, 'cdf': cdf, 'companions': companions}
+
+
+def _categories(catalog):
+    """Dtype kategori tetap untuk setiap chunk (supaya chunk bisa digabung tanpa re-encode)"""
+    products = catalog['products']
+    return {
+        column: pd.CategoricalDtype(pd.unique(products[column].astype(str)))
+        for column in ['nama_barang', 'brand', 'cat', 'cat_norm']
+    }
+
+
+# ==================== KERANJANG ====================
+def _basket_block(catalog, n_baskets, rng):
+    """Satu blok keranjang -> (id keranjang lokal, id produk, flag retur per keranjang), urut keranjang"""
+    cdf = catalog['cdf']
+    anchors = np.minimum(np.searchsorted(cdf, rng.random(n_baskets), side='right'), len(cdf) - 1)
+    companions = catalog['companions'][anchors]
+    probs = COMPANION_PROBS[:companions.shape[1]]
+    take = (companions >= 0) & (rng.random(companions.shape) < probs)
+    noise_counts = rng.poisson(NOISE_ITEMS, n_baskets)
+    noise = np.minimum(np.searchsorted(cdf, rng.random(noise_counts.sum()), side='right'), len(cdf) - 1)
+    bags = np.flatnonzero(rng.random(n_baskets) < SHOPPING_BAG_RATE)
+
+    basket_ids = np.concatenate([
+        np.arange(n_baskets), np.nonzero(take)[0], np.repeat(np.arange(n_baskets), noise_counts), bags
+    ])
+    items = np.concatenate([anchors, companions[take], noise, np.full(len(bags), len(cdf) - 1)])
+    order = np.argsort(basket_ids, kind='stable')
+    return basket_ids[order], items[order], rng.random(n_baskets) < RETURN_RATE
+
+
+def _day_cdf(start, days):
+    """Porsi kumulatif baris per hari (pola mingguan), dipakai memetakan posisi baris ke tanggal"""
+    weekdays = (np.arange(days) + pd.Timestamp(start).dayofweek) % 7
+    weights = WEEKDAY_WEIGHTS[weekdays]
+    return np.cumsum(weights) / weights.sum()
+
+
+def _chunk_frame(catalog, dtypes, items, days_offset, start, quantity, is_return, bag_id):
+    """Susun baris chunk menjadi DataFrame berkolom dan berurutan sama dengan df_analysis.csv"""
+    products = catalog['products']
+    dates = pd.Timestamp(start) + pd.to_timedelta(days_offset, unit='D')
+    price = products['price'].to_numpy()[items]
+    frame = {
+        'tanggal_order': dates,
+        'brand': pd.Categorical.from_codes(dtypes['brand'].categories.get_indexer(products['brand'])[items], dtype=dtypes['brand']),
+        'nama_barang': pd.Categorical.from_codes(items, dtype=dtypes['nama_barang']),
+        'quantity': quantity.astype('int32'),
+        'price': price,
+        'cat': pd.Categorical.from_codes(dtypes['cat'].categories.get_indexer(products['cat'])[items], dtype=dtypes['cat']),
+        'total_value': price * quantity,
+        'year': dates.year.astype('int16'),
+        'month': dates.month.astype('int8'),
+        'is_return': is_return,
+        'is_shopping_bag': items == bag_id,
+        'cat_norm': pd.Categorical.from_codes(dtypes['cat_norm'].categories.get_indexer(products['cat_norm'])[items], dtype=dtypes['cat_norm']),
+        'transaction_type': pd.Categorical.from_codes(is_return.astype('int8'), TRANSACTION_TYPES)
+    }
+    return pd.DataFrame(frame)[list(DATASET_SCHEMAS['transactions'])]
+
+
+def generate_transactions(n_rows, chunk_rows=CHUNK_ROWS, seed=SEED, catalog=None, start=START_DATE, days=DAYS,
+                          basket_column=None):
+    """Alirkan n_rows transaksi sintetis sebagai chunk DataFrame (masing-masing <= chunk_rows baris)
+
+    Tanggal naik sepanjang aliran (semua baris satu keranjang bertanggal sama).
+    basket_column memberi kolom id keranjang tambahan untuk rule_mining
+    (mis. basket_key='order_id'); tanpa itu kolomnya tepat 13 kolom df_analysis.csv.
+    """
+    if catalog is None:
+        catalog = build_catalog(seed=seed)
+    dtypes = _categories(catalog)
+    bag_id = len(catalog['products']) - 1
+    day_cdf = _day_cdf(start, days)
+
+    pending = []  # blok yang belum habis dikirim: dict array per baris
+    pending_rows = 0
+    generated_rows = 0  # baris yang sudah dibuat (untuk posisi -> tanggal)
+    basket_offset = 0
+    block = 0
+    emitted = 0
+    while emitted < n_rows:
+        size = min(chunk_rows, n_rows - emitted)
+        while pending_rows < size:
+            rng = np.random.default_rng([seed, 1, block])
+            basket_ids, items, returned = _basket_block(catalog, BLOCK_BASKETS, rng)
+            # Posisi baris pertama tiap keranjang menentukan hari keranjang itu
+            first_row = np.searchsorted(basket_ids, np.arange(BLOCK_BASKETS))
+            basket_days = np.minimum(np.searchsorted(day_cdf, (generated_rows + first_row) / n_rows, side='right'), days - 1)
+            quantity = (rng.poisson(EXTRA_QUANTITY, len(items)) + 1) * np.where(returned[basket_ids], -1, 1)
+            pending.append({
+                'items': items,
+                'days': basket_days[basket_ids],
+                'quantity': quantity,
+                'is_return': returned[basket_ids],
+                'basket': basket_offset + basket_ids
+            })
+            pending_rows += len(items)
+            generated_rows += len(items)
+            basket_offset += BLOCK_BASKETS
+            block += 1
+
+        rows = {key: np.concatenate([part[key] for part in pending]) for key in pending[0]}
+        chunk = _chunk_frame(catalog, dtypes, rows['items'][:size], rows['days'][:size], start,
+                             rows['quantity'][:size], rows['is_return'][:size], bag_id)
+        if basket_column:
+            chunk[basket_column] = rows['basket'][:size]
+        pending = [{key: values[size:] for key, values in rows.items()}]
+        pending_rows -= size
+        emitted += size
+        yield chunk
+
+
+def write_transactions(path, n_rows, chunk_rows=CHUNK_ROWS, **kwargs):
+    """Tulis transaksi sintetis ke CSV chunk demi chunk (format tanggal sama dengan df_analysis.csv)"""
+    written = 0
+    for i, chunk in enumerate(generate_transactions(n_rows, chunk_rows, **kwargs)):
+        chunk.assign(tanggal_order=chunk['tanggal_order'].dt.strftime('%Y-%m-%d')).to_csv(
+            path, mode='w' if i == 0 else 'a', header=i == 0, index=False
+        )
+        written += len(chunk)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate transaksi sintetis berskema df_analysis.csv")
+    parser.add_argument('--rows', type=int, required=True, help="Jumlah baris transaksi")
+    parser.add_argument('--output', required=True, help="File CSV tujuan")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help="Baris per chunk yang ditulis")
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--products', type=int, default=N_PRODUCTS, help="Jumlah produk di katalog")
+    parser.add_argument('--start', default=START_DATE, help="Tanggal transaksi pertama")
+    parser.add_argument('--days', type=int, default=DAYS, help="Rentang hari transaksi")
+    parser.add_argument('--basket-column', help="Tambahkan kolom id keranjang (untuk mining per keranjang)")
+    args = parser.parse_args()
+
+    try:
+        written = write_transactions(
+            args.output, args.rows, args.chunk_rows, seed=args.seed,
+            catalog=build_catalog(args.products, args.seed), start=args.start, days=args.days,
+            basket_column=args.basket_column
+        )
+        print(f"✓ Written: {args.output} ({written:,} rows, {os.path.getsize(args.output) / 1024 ** 2:,.1f} MB)")
+    except Exception as e:
+        print(f"✗ Failed: synthetic data - {e}")
+
+
+if __name__ == '__main__':
+    main()
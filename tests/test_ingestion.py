@@ -0,0 +1,51 @@
+"""Ingestion batch harian: batch yang sama tidak boleh diterapkan dua kali"""
+import os
+import shutil
+import sys
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from aggregates import build_cube  # noqa: E402
+from data_loader import FILE_MAPPING, load_dataset, read_derived, write_derived  # noqa: E402
+from ingestion import append_transactions  # noqa: E402
+
+
+def daily_batch(transactions, day='2026-01-05', rows=20):
+    """Batch sintetis dari baris transaksi yang ada, dipindah ke satu hari baru"""
+    batch = transactions.sample(rows, random_state=0).copy()
+    date = pd.Timestamp(day)
+    batch['tanggal_order'] = date.strftime('%Y-%m-%d')
+    batch['year'], batch['month'] = date.year, date.month
+    return batch
+
+
+def test_same_batch_is_applied_once(tmp_path, monkeypatch):
+    for key in ['transactions', 'sales_history']:
+        shutil.copy(os.path.join(ROOT, FILE_MAPPING[key]), tmp_path)
+    monkeypatch.chdir(tmp_path)
+    cache_dir = str(tmp_path / '.cache')
+
+    # Cache dan kubus versi lama ada, supaya jalur inkremental ikut diuji
+    transactions = load_dataset('transactions', cache_dir=cache_dir)
+    write_derived('cube', build_cube(transactions), cache_dir=cache_dir)
+    batch = daily_batch(transactions)
+
+    first = append_transactions(batch, cache_dir=cache_dir)
+    csv_size = os.path.getsize(FILE_MAPPING['transactions'])
+    history = pd.read_csv(FILE_MAPPING['sales_history'])
+    cube = read_derived('cube', cache_dir=cache_dir)
+
+    again = append_transactions(batch.copy(), cache_dir=cache_dir)
+
+    assert first['rows'] == len(batch) and cube is not None
+    assert again == {'rows': 0, 'duplicate': True}
+    assert os.path.getsize(FILE_MAPPING['transactions']) == csv_size
+    pd.testing.assert_frame_equal(pd.read_csv(FILE_MAPPING['sales_history']), history)
+    pd.testing.assert_frame_equal(read_derived('cube', cache_dir=cache_dir), cube)
+    assert len(load_dataset('transactions', cache_dir=cache_dir)) == len(transactions) + len(batch)
+
+    # Batch lain (hari berbeda) tetap diterapkan
+    assert append_transactions(daily_batch(transactions, day='2026-01-06'), cache_dir=cache_dir)['rows'] == 20
@@ -0,0 +1,71 @@
+"""Pruning rule: setiap rule yang dibuang tetap terwakili rule yang dipertahankan"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from data_loader import FILE_MAPPING, read_dataset  # noqa: E402
+from itemsets import intern_rules  # noqa: E402
+from rule_pruning import covered_rules, prune_rules  # noqa: E402
+
+
+def decision_rules():
+    """Rule bundling + cross-selling dari decision_*.csv (tidak terurut business_score)"""
+    return pd.concat([
+        read_dataset('bundles', os.path.join(ROOT, FILE_MAPPING['bundles'])),
+        read_dataset('cross_sell', os.path.join(ROOT, FILE_MAPPING['cross_sell']))
+    ], ignore_index=True)
+
+
+def rule(antecedents, consequents, confidence, score, strategy='Cross-Selling'):
+    """Satu baris rule minimal untuk pruning"""
+    return {
+        'antecedents': antecedents, 'consequents': consequents, 'confidence': confidence,
+        'lift': 2.0, 'business_score': score, 'business_strategy': strategy
+    }
+
+
+def test_every_dropped_rule_is_covered_by_a_kept_rule():
+    rules = decision_rules()
+    kept = prune_rules(rules)
+    assert 0 < len(kept) < len(rules)
+
+    # Rule asli dan hasil pruning di-intern bersama supaya bitset-nya sebanding
+    combined = pd.concat([kept, rules], ignore_index=True)
+    ruleset = intern_rules(combined)
+    keep = np.arange(len(combined)) < len(kept)
+    strategies = combined['business_strategy'].astype(str).to_numpy()
+    assert covered_rules(ruleset, keep, strategies).all()
+
+
+def test_collapse_keeps_highest_score_regardless_of_order():
+    rules = pd.DataFrame([
+        rule('A', 'B', 0.4, 0.1),
+        rule('B', 'A', 0.4, 0.9),
+    ])
+    for ordered in (rules, rules.iloc[::-1]):
+        kept = prune_rules(ordered)
+        assert kept[['antecedents', 'consequents']].values.tolist() == [['B', 'A']]
+
+
+def test_strategies_are_not_collapsed_together():
+    rules = pd.DataFrame([
+        rule('A', 'B', 0.6, 0.9, 'Bundling Utama'),
+        rule('B', 'A', 0.4, 0.1, 'Cross-Selling'),
+    ])
+    assert len(prune_rules(rules)) == 2
+
+
+def test_maximal_mode_keeps_one_rule_per_maximal_itemset():
+    rules = pd.DataFrame([
+        rule('A', 'B', 0.6, 0.5),
+        rule('A', 'B, C', 0.5, 0.4),
+        rule('B, C', 'A', 0.7, 0.9),
+        rule('D', 'E', 0.4, 0.3),
+    ])
+    kept = prune_rules(rules, mode='maximal')
+    assert kept[['antecedents', 'consequents']].values.tolist() == [['B, C', 'A'], ['D', 'E']]
@@ -0,0 +1,50 @@
+"""Sinkronisasi DuckDB: append lewat ingestion.py hanya menyalin baris baru"""
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import sql_backend  # noqa: E402
+from data_loader import FILE_MAPPING, read_dataset  # noqa: E402
+from ingestion import append_transactions  # noqa: E402
+
+pytestmark = pytest.mark.skipif(sql_backend.duckdb is None, reason="duckdb tidak terpasang")
+
+
+def test_appended_batch_is_inserted_without_full_reload(tmp_path, monkeypatch):
+    for key in ['transactions', 'sales_history']:
+        shutil.copy(os.path.join(ROOT, FILE_MAPPING[key]), tmp_path)
+    monkeypatch.chdir(tmp_path)
+    cache_dir = str(tmp_path / '.cache')
+    sql_backend.connect(cache_dir).close()
+
+    transactions = read_dataset('transactions')
+    batch = transactions.tail(5).copy()
+    batch['tanggal_order'] = '2026-01-05'
+    batch['year'], batch['month'] = 2026, 1
+    append_transactions(batch, cache_dir=cache_dir)
+
+    offsets = []
+    append_rows = sql_backend._append_rows
+    monkeypatch.setattr(sql_backend, '_append_rows', lambda *args: (offsets.append(args[3]), append_rows(*args)))
+    con = sql_backend.connect(cache_dir)
+    count, revenue = con.execute("SELECT count(*), sum(total_value)::BIGINT FROM transactions").fetchone()
+    con.close()
+
+    assert len(offsets) == 1
+    assert count == len(transactions) + len(batch)
+    assert revenue == read_dataset('transactions')['total_value'].sum()
+
+    # File yang ditulis ulang (bukan append) dimuat ulang utuh
+    transactions.head(10).assign(tanggal_order=lambda df: df['tanggal_order'].dt.strftime('%Y-%m-%d')).to_csv(
+        FILE_MAPPING['transactions'], index=False
+    )
+    offsets.clear()
+    con = sql_backend.connect(cache_dir)
+    assert con.execute("SELECT count(*) FROM transactions").fetchone()[0] == 10
+    con.close()
+    assert offsets == []